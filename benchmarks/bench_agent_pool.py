@@ -0,0 +1,100 @@
+"""Per-turn agent cost: a new Agent per turn vs. checking a ready agent out of the pool.
+
+Each turn is timed from the start until the first text of a real ``run()``.
+That covers building the agent, agno's tool processing (turning every
+toolkit into function schemas) and sending the request. The model is
+benchmarks/fake_openrouter.py, answering at once with a one-token reply, so
+almost all of the time is spent on our side. The "new Agent per turn" path
+does what the code used to do: it builds fresh toolkits and an OpenRouter
+model with its own HTTP client each turn. The pooled path reuses an agent
+whose tools are already processed, over the shared keep-alive client.
+"""
+import importlib
+import os
+import statistics
+import time
+
+from benchmarks.fake_openrouter import FakeOpenRouter, Script
+
+TURNS = 50
+
+
+def _first_text(agent) -> None:
+    events = agent.run(message="hi", stream=True)
+    for event in events:
+        if getattr(event, "event", None) == "RunResponseContent" and getattr(event, "content", None):
+            break
+    for _ in events:  # finish the run off the clock
+        pass
+
+
+def main():
+    server = FakeOpenRouter().start()
+    server.reset(Script(ttft=0.0, tokens_per_s=0, steps=[{"text": 1}]))
+    # Must be set before pages.agent reads its config
+    os.environ["OPENROUTER_BASE_URL"] = server.base_url
+    os.environ.setdefault("OPENROUTER_API_KEY", "sk-fake")
+
+    from agno.agent import Agent
+    from agno.models.openrouter import OpenRouter
+
+    from pages import agent as agent_module
+    from pages.agent import MODEL_ID, PERSONA_INSTRUCTIONS, TOOLKIT_SPECS, AgentPool, _build_agent
+    from eccb.router import ALL_TOOLSETS
+    from eccb.tool_cache import cache_toolkit
+
+    variants = [(persona, ALL_TOOLSETS) for persona in PERSONA_INSTRUCTIONS]
+
+    def fresh_agent(key):
+        persona, toolsets = key
+        tools = []
+        for name in toolsets:
+            for module, cls, kwargs, remote in TOOLKIT_SPECS[name]:
+                toolkit = getattr(importlib.import_module(module), cls)(**kwargs)
+                tools.append(cache_toolkit(toolkit) if remote else toolkit)
+        return Agent(
+            name="💼 Financial AI Agent",
+            model=OpenRouter(id=MODEL_ID, api_key=agent_module.api_key, base_url=agent_module.OPENROUTER_BASE_URL,
+                             max_tokens=8000),
+            tools=tools,
+            tool_choice="auto",
+            instructions=PERSONA_INSTRUCTIONS[persona],
+            add_history_to_messages=True,
+        )
+
+    def fresh_turn(key):
+        _first_text(fresh_agent(key))
+
+    pool = AgentPool(_build_agent)
+
+    def pooled_turn(key):
+        pooled = pool.acquire(key)
+        try:
+            _first_text(pooled)
+        finally:
+            pool.release(key, pooled)
+
+    for key in variants:  # imports, and one warm agent per persona
+        fresh_turn(key)
+        pooled_turn(key)
+
+    def timed(turn) -> list[float]:
+        samples = []
+        for i in range(TURNS):
+            start = time.perf_counter()
+            turn(variants[i % len(variants)])
+            samples.append((time.perf_counter() - start) * 1000)
+        return samples
+
+    fresh = timed(fresh_turn)
+    reused = timed(pooled_turn)
+    server.stop()
+
+    print(f"time to first text over {TURNS} turns, fake model answering at once")
+    print(f"new Agent per turn: median {statistics.median(fresh):7.2f} ms  p95 {sorted(fresh)[int(TURNS * .95)]:7.2f} ms")
+    print(f"pooled agent:       median {statistics.median(reused):7.2f} ms  p95 {sorted(reused)[int(TURNS * .95)]:7.2f} ms")
+    print(f"pool stats: {pool.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Budget projection latency: 1000 what-if scenarios over 60 months.
+
+Times the vectorized projection (all scenarios in one array) against the
+same projection done one scenario and one month at a time in plain Python,
+then the full markdown report the tool returns for a typical request.
+"""
+import random
+import time
+
+from eccb.budget import Adjustment, Scenario, budget_report, preset_scenarios, project, summarize
+
+INCOME = {"job": 2400.0, "market sales": 350.0, "carnival gigs": 150.0}
+EXPENSES = {"rent": 900.0, "food": 650.0, "transport": 220.0, "phone": 90.0, "utilities": 180.0, "fun": 200.0}
+MONTHS = 60
+
+
+def random_scenarios(n: int, rng: random.Random) -> list[Scenario]:
+    categories = list(INCOME) + list(EXPENSES) + ["income", "expenses"]
+    scenarios = []
+    for i in range(n):
+        adjustments = [
+            Adjustment(
+                rng.choice(categories),
+                percent=rng.uniform(-40, 40),
+                amount=rng.choice([0.0, rng.uniform(0, 300)]),
+                months=rng.choice([None, rng.sample(range(1, 13), rng.randint(1, 4))]),
+            )
+            for _ in range(rng.randint(1, 3))
+        ]
+        scenarios.append(Scenario(f"scenario {i}", adjustments))
+    return scenarios
+
+
+def project_loop(scenarios: list[Scenario], months: int, start_month: int = 1) -> list[list[float]]:
+    """Reference: scenario by scenario, month by month, category by category."""
+    balances = []
+    for scenario in [Scenario("base")] + scenarios:
+        balance, row = 0.0, []
+        for m in range(months):
+            cal = (start_month - 1 + m) % 12 + 1
+            net = 0.0
+            for sign, group, name_set in ((1, INCOME, "income"), (-1, EXPENSES, "expenses")):
+                for name, value in group.items():
+                    scale, extra = 1.0, 0.0
+                    for adj in scenario.adjustments:
+                        if adj.category.lower() in (name, name_set) and (adj.months is None or cal in adj.months):
+                            scale += adj.percent / 100
+                            extra += adj.amount
+                    net += sign * (value * scale + extra)
+            balance += net
+            row.append(balance)
+        balances.append(row)
+    return balances
+
+
+def timed(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    scenarios = random_scenarios(1000, random.Random(0))
+    result = project(INCOME, EXPENSES, scenarios, MONTHS)
+    reference = project_loop(scenarios, MONTHS)
+    drift = max(abs(a - b) for row, ref in zip(result["balance"], reference) for a, b in zip(row, ref))
+    print(f"1000 scenarios x {MONTHS} months, {len(INCOME) + len(EXPENSES)} categories (max drift vs loop {drift:.2e})")
+
+    vector = timed(lambda: summarize(project(INCOME, EXPENSES, scenarios, MONTHS), savings_goal=5000))
+    loop = timed(lambda: project_loop(scenarios, MONTHS), repeat=1)
+    print(f"  numpy projection + summary {vector * 1000:8.1f} ms")
+    print(f"  python loop projection     {loop * 1000:8.1f} ms  ({loop / vector:.0f}x)")
+
+    presets = list(preset_scenarios("Grenada").values())
+    report = timed(lambda: budget_report(INCOME, EXPENSES, 12, 500, 3000, presets, start_month=1), repeat=20)
+    print(f"  tool report, 4 presets     {report * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
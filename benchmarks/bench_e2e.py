@@ -0,0 +1,310 @@
+"""End-to-end chat latency, offline: the real page, agent and tools against local fakes.
+
+Each scenario submits one prompt to pages/app.py through streamlit's
+AppTest. The app runs its real path: routing, agent pool, agno's streaming
+and tool loop, the run worker and the ReplyRenderer loop. The model is
+benchmarks/fake_openrouter.py, with a scripted time to first token, token
+rate and tool calls. yfinance, DuckDuckGo, Google and the exchange-rate API
+are replaced by stubs with fixed latencies. Caches are cleared between runs,
+so every run pays the full cost.
+
+Per scenario (median of --runs) it reports:
+
+- TTFT: submit to first reply text, as the run yields it ("model") and
+  as it reaches the page ("render").
+- Total latency and the bytes of deltas sent to the browser.
+- Time spent inside tools.
+- Model calls and request bytes.
+- Peak Python allocations during the turn, from one extra traced run.
+
+Results are written as JSON (--out, default bench_e2e.json). --compare OLD.json
+prints the change against an earlier run.
+
+$ python -m benchmarks.bench_e2e --runs 5 --compare bench_e2e.before.json
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from benchmarks.fake_openrouter import FakeOpenRouter, Script
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pages", "app.py")
+QUOTE_LATENCY = 0.4  # seconds per (batched) yfinance download
+SEARCH_LATENCY = 0.6  # seconds per web search
+LOCATION = {"country": "Saint Lucia", "region": None, "city": "Castries", "latitude": 14.01, "longitude": -60.99,
+            "is_eccu": True, "ip": "198.51.100.7"}
+
+SCENARIOS = {
+    "chat": ("hey, what can you help me with?", Script(ttft=0.3, tokens_per_s=80, steps=[{"text": 60}])),
+    "long_answer": ("explain compound interest with an example", Script(ttft=0.3, tokens_per_s=80, steps=[{"text": 400}])),
+    "stock_quote": ("what's the price of AAPL and MSFT today", Script(ttft=0.3, tokens_per_s=80, steps=[
+        {"tool_calls": [("get_current_stock_prices", {"symbols": "AAPL,MSFT"})]},
+        {"text": 80},
+    ])),
+    "web_search": ("latest news on interest rates in the Caribbean", Script(ttft=0.3, tokens_per_s=80, steps=[
+        {"tool_calls": [("duckduckgo_search", {"query": "Caribbean interest rates news"})]},
+        {"text": 120},
+    ])),
+    "parallel_tools": ("should I buy Tesla stock, what's the price of TSLA and the news", Script(ttft=0.3, tokens_per_s=80, steps=[
+        {"tool_calls": [("get_current_stock_prices", {"symbols": "TSLA"}),
+                        ("duckduckgo_news", {"query": "Tesla"}),
+                        ("google_search", {"query": "Tesla stock outlook"})]},
+        {"text": 150},
+    ])),
+    "local_conversion": ("convert 100 USD to XCD", Script(steps=[{"text": 10}])),  # answered without the model
+}
+
+
+# 🧪 Stub tool backends
+
+def _fake_quotes(symbols, *params):
+    time.sleep(QUOTE_LATENCY)
+    return {s: {"price": 101.25, "previous_close": 99.8, "as_of": "2026-01-02"} for s in symbols}
+
+
+def _fake_history(symbols, *params):
+    time.sleep(QUOTE_LATENCY)
+    return {s: [{"date": f"2026-01-0{d}", "close": 100.0 + d} for d in range(1, 6)] for s in symbols}
+
+
+class _FakeDDGS:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def text(self, query, max_results=5, **kwargs):
+        time.sleep(SEARCH_LATENCY)
+        return [{"title": f"{query} result {i}", "href": f"https://example.com/{i}", "body": "Snippet " * 20}
+                for i in range(max_results)]
+
+    news = text
+
+
+def _fake_google(query, num_results=5, **kwargs):
+    time.sleep(SEARCH_LATENCY)
+    return [SimpleNamespace(title=f"{query} {i}", url=f"https://example.com/g{i}", description="Snippet " * 20)
+            for i in range(num_results)]
+
+
+def install_stubs() -> None:
+    import agno.tools.duckduckgo
+    import agno.tools.googlesearch
+
+    import eccb.quotes
+
+    eccb.quotes._QUOTE_BATCHER._fetch_many = _fake_quotes
+    eccb.quotes._HISTORY_BATCHER._fetch_many = _fake_history
+    agno.tools.duckduckgo.DDGS = _FakeDDGS
+    agno.tools.googlesearch.search = _fake_google
+
+
+# 📏 Instrumentation
+
+class _Marks:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.first_content = None
+        self.first_render = None
+        self.tools = {}  # tool_call_id -> [started, completed]
+        self.delta_bytes = 0
+        self.deltas = 0
+
+
+MARKS = _Marks()
+
+
+class _TappedStream:
+    """Passes the agent's events through, noting when text and tool events come out of the run."""
+
+    def __init__(self, stream):
+        self._stream = iter(stream)
+        self._source = stream
+        self.needs_run_slot = getattr(stream, "needs_run_slot", True)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        event = next(self._stream)
+        now, kind = time.perf_counter(), getattr(event, "event", None)
+        with MARKS.lock:
+            if kind == "RunResponseContent" and getattr(event, "content", None) and MARKS.first_content is None:
+                MARKS.first_content = now
+            elif kind in ("ToolCallStarted", "ToolCallCompleted"):
+                tool_id = getattr(event.tool, "tool_call_id", None) or id(event.tool)
+                MARKS.tools.setdefault(tool_id, [None, None])[kind == "ToolCallCompleted"] = now
+        return event
+
+    def close(self):
+        close = getattr(self._source, "close", None)
+        if close:
+            close()
+
+
+def install_taps() -> None:
+    import pages.agent
+    from streamlit.delta_generator import DeltaGenerator
+
+    shared_agent = pages.agent.shared_agent
+    pages.agent.shared_agent = lambda *args, **kwargs: _TappedStream(shared_agent(*args, **kwargs))
+
+    enqueue = DeltaGenerator._enqueue
+
+    def counting_enqueue(self, delta_type, element_proto, *args, **kwargs):
+        now = time.perf_counter()
+        with MARKS.lock:
+            MARKS.deltas += 1
+            MARKS.delta_bytes += element_proto.ByteSize()
+            if delta_type == "markdown" and MARKS.first_content is not None and MARKS.first_render is None:
+                MARKS.first_render = now
+        return enqueue(self, delta_type, element_proto, *args, **kwargs)
+
+    DeltaGenerator._enqueue = counting_enqueue
+
+
+def clear_caches() -> None:
+    import pages.agent
+    import eccb.tool_cache
+    from eccb.response_cache import ResponseCache
+
+    eccb.tool_cache._RESULTS.clear()
+    pages.agent._RESPONSE_CACHE = ResponseCache()
+
+
+# 🏃 Runs
+
+def run_once(server: FakeOpenRouter, prompt: str, script: Script, trace: bool = False) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    clear_caches()
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.session_state["user_location"] = dict(LOCATION)
+    at.run()
+    server.reset(script)
+    MARKS.reset()
+
+    at.chat_input[0].set_value(prompt)
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    at.run()
+    end = time.perf_counter()
+    peak = 0
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    if at.exception:
+        raise RuntimeError(f"{prompt!r}: {at.exception[0].value}")
+
+    tool_seconds = sum(done - began for began, done in MARKS.tools.values() if began and done)
+    offered = sorted({name for call in server.calls for name in call.tools})
+    scripted = {name for step in script.steps for name, _ in step.get("tool_calls", [])}
+    return {
+        "ttft_model_ms": ((MARKS.first_content or end) - start) * 1000,
+        "ttft_render_ms": ((MARKS.first_render or end) - start) * 1000,
+        "total_ms": (end - start) * 1000,
+        "rendered_bytes": MARKS.delta_bytes,
+        "deltas": MARKS.deltas,
+        "tool_ms": tool_seconds * 1000,
+        "tool_calls": len(MARKS.tools),
+        "model_calls": len(server.calls),
+        "request_bytes": sum(call.prompt_bytes for call in server.calls),
+        "missing_tools": sorted(scripted - set(offered)) if server.calls else [],
+        "peak_alloc_mb": peak / 1e6,
+    }
+
+
+def run_scenario(server: FakeOpenRouter, prompt: str, script: Script, runs: int) -> dict:
+    samples = [run_once(server, prompt, script) for _ in range(runs)]
+    result = {key: statistics.median(s[key] for s in samples) for key in samples[0] if key != "missing_tools"}
+    result["missing_tools"] = samples[-1]["missing_tools"]
+    # Tracing slows Python down, so memory comes from a separate run
+    result["peak_alloc_mb"] = run_once(server, prompt, script, trace=True)["peak_alloc_mb"]
+    return result
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, path: str) -> None:
+    with open(path, encoding="utf-8") as f:
+        before = json.load(f)["scenarios"]
+    print(f"\nchange vs {path}:")
+    for name, now in results.items():
+        old = before.get(name)
+        if not old:
+            continue
+        parts = []
+        for key in ("ttft_render_ms", "total_ms", "rendered_bytes", "request_bytes", "peak_alloc_mb"):
+            if old.get(key):
+                parts.append(f"{key} {(now[key] - old[key]) / old[key]:+.0%}")
+        print(f"  {name:17} " + "  ".join(parts))
+
+
+def main():
+    args = sys.argv[1:]
+    runs = int(args[args.index("--runs") + 1]) if "--runs" in args else 3
+    out = args[args.index("--out") + 1] if "--out" in args else "bench_e2e.json"
+    only = args[args.index("--scenario") + 1].split(",") if "--scenario" in args else list(SCENARIOS)
+
+    server = FakeOpenRouter().start()
+    # Must be set before pages.agent / eccb.currency read their config
+    os.environ["OPENROUTER_BASE_URL"] = server.base_url
+    os.environ["RATES_URL"] = server.rates_url
+    os.environ.setdefault("OPENROUTER_API_KEY", "sk-fake")
+    install_stubs()
+    install_taps()
+
+    import logging
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith(("streamlit", "agno")):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+    run_once(server, "hello", Script(ttft=0.0, steps=[{"text": 5}]))  # imports, router training, first agent
+
+    results = {}
+    print(f"{'scenario':17} {'ttft model':>10} {'ttft render':>11} {'total':>8} {'rendered':>9} {'tools':>8} "
+          f"{'calls':>5} {'request':>8} {'peak mem':>8}")
+    for name in only:
+        prompt, script = SCENARIOS[name]
+        r = results[name] = run_scenario(server, prompt, script, runs)
+        print(f"{name:17} {r['ttft_model_ms']:8.0f}ms {r['ttft_render_ms']:9.0f}ms {r['total_ms']:6.0f}ms "
+              f"{r['rendered_bytes'] / 1e3:7.1f}kB {r['tool_ms']:6.0f}ms {r['model_calls']:5.0f} "
+              f"{r['request_bytes'] / 1e3:6.1f}kB {r['peak_alloc_mb']:6.1f}MB"
+              + (f"  (tools not offered: {', '.join(r['missing_tools'])})" if r["missing_tools"] else ""))
+    server.stop()
+
+    report = {
+        "meta": {"commit": _git_commit(), "python": platform.python_version(), "machine": platform.machine(),
+                 "cpus": os.cpu_count(), "runs": runs, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                 "quote_latency": QUOTE_LATENCY, "search_latency": SEARCH_LATENCY},
+        "scenarios": results,
+    }
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nwrote {out}")
+    if "--compare" in args:
+        compare(results, args[args.index("--compare") + 1])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Time sequential vs concurrent geolocation against local stub providers.
+
+Four stub HTTP servers model the provider mix we see in production: one slow
+but correct, one failing with HTTP 500, one returning malformed JSON and one
+fast and correct. The concurrent resolver should answer in roughly the time
+of the fastest good provider, regardless of the slow one.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pages.agent import (
+    _parse_ipapi,
+    _parse_ipapi_alt,
+    _parse_ipinfo,
+    _parse_ipwhois,
+    _query_provider,
+    resolve_location_concurrently,
+)
+
+
+def _stub(status: int, body: str, delay: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            try:
+                self.wfile.write(body.encode())
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _url(server: ThreadingHTTPServer) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def main():
+    slow = _stub(200, json.dumps({"country_name": "Grenada", "city": "St. George's"}), delay=3.0)
+    failing = _stub(500, "{}", delay=0.1)
+    malformed = _stub(200, "{not json", delay=0.05)
+    fast = _stub(200, json.dumps({"status": "success", "countryCode": "LC", "city": "Castries"}), delay=0.2)
+    providers = [
+        ("slow", _url(slow), _parse_ipapi),
+        ("failing", _url(failing), _parse_ipwhois),
+        ("malformed", _url(malformed), _parse_ipinfo),
+        ("fast", _url(fast), _parse_ipapi_alt),
+    ]
+
+    start = time.perf_counter()
+    sequential = None
+    for name, url, parser in providers:
+        try:
+            sequential = _query_provider(name, url, parser, 8, threading.Event())
+        except Exception:
+            continue
+        if sequential:
+            break
+    seq_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    concurrent = resolve_location_concurrently(providers, deadline=4)
+    conc_time = time.perf_counter() - start
+
+    print(f"sequential: {seq_time * 1000:8.1f} ms  -> {sequential}")
+    print(f"concurrent: {conc_time * 1000:8.1f} ms  -> {concurrent}")
+
+    start = time.perf_counter()
+    timed_out = resolve_location_concurrently(providers[:3], deadline=1)
+    print(f"no good provider, 1s deadline: {(time.perf_counter() - start) * 1000:8.1f} ms  -> {timed_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Image uploads: bytes sent to the model and preparation latency, before vs. after.
+
+Before, the first image went out at full resolution: it was written to a
+temp file, then agno read it back and base64-encoded it. After, every image
+(up to IMAGE_MAX_COUNT) is downscaled and re-encoded in memory, in a thread
+pool. The uploads are synthetic 12 MP phone-style JPEGs plus one PNG
+screenshot. Upload time assumes a 10 Mbit/s uplink. Vision tokens are an
+estimate at 258 tokens per 768 px tile.
+"""
+import base64
+import io
+import math
+import os
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+from eccb.images import IMAGE_MAX_COUNT, prepare_image, prepare_images
+
+UPLINK_BYTES_PER_S = 10e6 / 8
+ROUNDS = 5
+
+
+class Upload(io.BytesIO):
+    def __init__(self, data: bytes, name: str):
+        super().__init__(data)
+        self.name = name
+
+
+def photo(seed: int, size=(4032, 3024)) -> bytes:
+    rng = np.random.default_rng(seed)
+    w, h = size
+    y, x = np.mgrid[0:h, 0:w].astype(np.float32)
+    base = np.stack([x / w * 200, y / h * 180, (x + y) / (w + h) * 220], axis=-1)
+    pixels = np.clip(base + rng.normal(0, 12, (h, w, 3)), 0, 255).astype(np.uint8)
+    out = io.BytesIO()
+    Image.fromarray(pixels).save(out, "JPEG", quality=92)
+    return out.getvalue()
+
+
+def screenshot(size=(1170, 2532)) -> bytes:
+    pixels = np.full((size[1], size[0], 3), 245, np.uint8)
+    pixels[::40, :, :] = 30  # text-like rows
+    out = io.BytesIO()
+    Image.fromarray(pixels).save(out, "PNG")
+    return out.getvalue()
+
+
+def tokens(width: int, height: int) -> int:
+    return math.ceil(width / 768) * math.ceil(height / 768) * 258
+
+
+def before(uploads) -> tuple[int, int]:
+    # The old path: first image only, via a temp file, base64 of the original
+    first = uploads[0]
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as tmp:
+        tmp.write(first.getvalue())
+    with open(tmp.name, "rb") as f:
+        payload = base64.b64encode(f.read())
+    os.unlink(tmp.name)
+    with Image.open(first) as img:
+        return len(payload), tokens(*img.size)
+
+
+def after(uploads, workers=None) -> tuple[int, int]:
+    prepared = prepare_images(uploads, workers=workers)
+    return sum(len(base64.b64encode(p.content)) for p in prepared), sum(tokens(*p.size) for p in prepared)
+
+
+def originals(uploads) -> tuple[int, int]:
+    # Sending every image untouched, for comparison with the same image count
+    payload, vision_tokens = 0, 0
+    for upload in uploads:
+        payload += len(base64.b64encode(upload.getvalue()))
+        with Image.open(upload) as img:
+            vision_tokens += tokens(*img.size)
+    return payload, vision_tokens
+
+
+def timed(fn, *args, **kwargs):
+    best, result = float("inf"), None
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    files = [(photo(i), f"IMG_{i:04}.jpg") for i in range(IMAGE_MAX_COUNT - 1)] + [(screenshot(), "screen.png")]
+    print(f"{len(files)} uploads, {sum(len(d) for d, _ in files) / 1e6:.1f} MB total "
+          f"(photos {len(files[0][0]) / 1e6:.1f} MB each, screenshot {len(files[-1][0]) / 1e3:.0f} kB)")
+
+    fresh = lambda: [Upload(data, name) for data, name in files]  # noqa: E731
+    rows = [
+        ("before: first image, original", *timed(lambda: before(fresh())), 1),
+        ("originals, every image", *timed(lambda: originals(fresh())), len(files)),
+        ("after, serial", *timed(lambda: after(fresh(), workers=1)), len(files)),
+        ("after, thread pool", *timed(lambda: after(fresh())), len(files)),
+    ]
+    for name, seconds, (payload, vision_tokens), count in rows:
+        upload = payload / UPLINK_BYTES_PER_S
+        print(f"  {name:32} {count} image(s)  payload {payload / 1e6:6.2f} MB  ~{vision_tokens:5} tokens  "
+              f"prepare {seconds * 1000:6.0f} ms  upload {upload * 1000:6.0f} ms  total {(seconds + upload) * 1000:6.0f} ms")
+
+    single = prepare_image(files[0][0], files[0][1])
+    print(f"\none photo: {single.original_bytes / 1e6:.2f} MB {Image.open(io.BytesIO(files[0][0])).size} -> "
+          f"{len(single.content) / 1e3:.0f} kB {single.size} {single.format}")
+
+
+if __name__ == "__main__":
+    main()
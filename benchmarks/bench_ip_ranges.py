@@ -0,0 +1,63 @@
+"""Loader and lookup benchmark for the offline IP-range index.
+
+Generates a synthetic RIR delegated export (default 250k IPv4 + 50k IPv6
+records spread over ~240 country codes, a few of them ECCU) and times:
+
+* loading it in full and restricted to ECCU codes
+* random lookups against the loaded index
+"""
+import ipaddress
+import os
+import random
+import sys
+import tempfile
+import time
+
+from eccb.ip_ranges import load_ip_ranges
+
+ECCU_CODES = ["AG", "DM", "GD", "KN", "LC", "VC", "AI", "MS"]
+
+
+def _write_delegated(path: str, n_v4: int, n_v6: int, rng: random.Random) -> None:
+    codes = ECCU_CODES + [f"{a}{b}" for a in "BCEFHJNPRTUWZ" for b in "ABEFGHIKLMNOPRSTU"][:232]
+    with open(path, "w") as f:
+        f.write("2|lacnic|20260101|300000|19700101|20260101|-0000\n")
+        f.write("lacnic|*|ipv4|*|250000|summary\n")
+        addr = _start = int(ipaddress.IPv4Address("1.0.0.0"))
+        for _ in range(n_v4):
+            count = rng.choice((256, 512, 1024, 4096))
+            f.write(f"lacnic|{rng.choice(codes)}|ipv4|{ipaddress.IPv4Address(addr)}|{count}|20100101|allocated\n")
+            addr += count * rng.randint(1, 3)
+        base = int(ipaddress.IPv6Address("2800::"))
+        for i in range(n_v6):
+            f.write(f"lacnic|{rng.choice(codes)}|ipv6|{ipaddress.IPv6Address(base + (i << 96))}|32|20100101|allocated\n")
+
+
+def main(n_v4: int = 250_000, n_v6: int = 50_000, n_lookups: int = 200_000):
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "delegated.txt")
+        _write_delegated(path, n_v4, n_v6, rng)
+        size_mb = os.path.getsize(path) / 1e6
+
+        start = time.perf_counter()
+        full = load_ip_ranges(path)
+        full_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        eccu = load_ip_ranges(path, countries=ECCU_CODES)
+        eccu_s = time.perf_counter() - start
+
+    print(f"file: {size_mb:.1f} MB, {n_v4 + n_v6} records")
+    print(f"load all countries: {full_s * 1000:8.1f} ms  ({len(full)} merged ranges)")
+    print(f"load ECCU only:     {eccu_s * 1000:8.1f} ms  ({len(eccu)} merged ranges)")
+
+    ips = [str(ipaddress.IPv4Address(rng.randint(0x01000000, 0x7FFFFFFF))) for _ in range(n_lookups)]
+    start = time.perf_counter()
+    hits = sum(1 for ip in ips if eccu.lookup(ip))
+    per_lookup = (time.perf_counter() - start) / n_lookups
+    print(f"lookup: {per_lookup * 1e6:6.2f} µs/lookup ({hits} ECCU hits in {n_lookups})")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,58 @@
+"""Per-rerun cost of the ECCU map: rebuilding the pydeck Deck vs. the memoized Deck.
+
+Every Streamlit rerun (so every chat message) renders the map. Before, each
+rerun built the pins, Layer and Deck. Now the Deck is cached per (country,
+center, token) and shared across sessions; st.pydeck_chart still serializes
+it each time. Both paths go through st.pydeck_chart (bare mode, no browser).
+"""
+import logging
+import random
+import time
+
+import streamlit as st
+
+from pages.eccb_map import ECCU_PINS, eccu_deck, render_eccu_map
+
+RERUNS = 2000
+
+
+def rebuilt(user_country, center):
+    # What every rerun paid before: a fresh Deck that st.pydeck_chart serializes
+    st.pydeck_chart(eccu_deck.__wrapped__(user_country, center, None))
+
+
+def per_rerun(render, users) -> list[float]:
+    timings = []
+    for country, center in users:
+        start = time.perf_counter()
+        render(country, center)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings
+
+
+def main():
+    rng = random.Random(0)
+    # Reruns from a few hundred users spread over the islands
+    users = []
+    for _ in range(300):
+        pin = rng.choice(ECCU_PINS)
+        users.append((pin["name"], (pin["lat"] + rng.uniform(-0.3, 0.3), pin["lon"] + rng.uniform(-0.3, 0.3))))
+    reruns = [rng.choice(users) for _ in range(RERUNS)]
+
+    render_eccu_map(*reruns[0])  # first render imports pydeck (and pandas inside streamlit)
+    rebuilt(*reruns[0])
+    eccu_deck.cache_clear()
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)  # "missing ScriptRunContext" in bare mode
+
+    for name, render in (("rebuild every rerun", rebuilt), ("memoized Deck", render_eccu_map)):
+        timings = per_rerun(render, reruns)
+        print(f"{name:20} p50 {timings[len(timings) // 2] * 1e6:7.0f} us   p95 {timings[int(len(timings) * 0.95)] * 1e6:7.0f} us")
+    info = eccu_deck.cache_info()
+    print(f"cache: {info.currsize} decks for {len(users)} users, hit rate {info.hits / (info.hits + info.misses):.0%}")
+
+
+if __name__ == "__main__":
+    main()
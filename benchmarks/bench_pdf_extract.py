@@ -0,0 +1,60 @@
+"""Serial vs. process-pool PDF text extraction on synthetic 10/100/1000-page PDFs.
+
+Also checks that both paths return exactly the same text. The extracted-text
+cache is bypassed, so every run parses the PDF.
+"""
+import io
+import sys
+import time
+
+from eccb.uploads import extract_pdf_text
+
+
+def synthetic_pdf(pages: int, lines_per_page: int = 40) -> bytes:
+    """Minimal hand-written PDF with Helvetica text on every page."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for p in range(pages):
+        lines = [f"Statement page {p + 1} line {i}: deposit 1{i:02d}.50 XCD, fee 2.70, balance {p * 100 + i}" for i in range(lines_per_page)]
+        ops = ["BT /F1 9 Tf 40 800 Td 11 TL"] + [f"({line}) '" for line in lines] + ["ET"]
+        stream = "\n".join(ops).encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % k for k in kids), pages)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def _timed(data: bytes, **kwargs) -> tuple[float, str]:
+    start = time.perf_counter()
+    text = extract_pdf_text(io.BytesIO(data), use_cache=False, **kwargs)
+    return time.perf_counter() - start, text
+
+
+def main(sizes=(10, 100, 1000)):
+    print(f"{'pages':>6} {'serial s':>9} {'pool s':>9} {'first 5k chars s':>17} {'same':>5}")
+    for pages in sizes:
+        data = synthetic_pdf(pages)
+        serial_s, serial = _timed(data, workers=1)
+        pool_s, pooled = _timed(data)
+        capped_s, _ = _timed(data, max_chars=5000)
+        print(f"{pages:>6} {serial_s:>9.2f} {pool_s:>9.2f} {capped_s:>17.3f} {str(serial == pooled):>5}")
+
+
+if __name__ == "__main__":
+    main(tuple(map(int, sys.argv[1:])) or (10, 100, 1000))
@@ -0,0 +1,124 @@
+"""Prompt-prefix reuse of the system prompt: old single template vs. the split layout.
+
+Offline, simulates a stream of users from different places and measures how
+much of each system prompt is a byte-identical prefix of one already sent,
+which is what a provider-side prompt cache can reuse, plus the time to build
+the prompt per turn.
+
+With --live and OPENROUTER_API_KEY set, it also sends pairs of requests for
+two users of the same persona in different cities and reports the cached
+tokens the provider bills and the time to first token for each layout.
+"""
+import bisect
+import json
+import os
+import random
+import sys
+import time
+from os.path import commonprefix
+
+from pages.agent import COUNTRY_TONE, INSTRUCTION_PREFIX, MODEL_ID, build_instructions, build_persona_guidelines
+
+TURNS = 2000
+CHARS_PER_TOKEN = 4
+
+# The layout before the split: location in the middle, persona after it
+_LEGACY_HEAD, _LEGACY_TAIL = INSTRUCTION_PREFIX.split("Examples to mirror when applicable:")
+LEGACY_TEMPLATE = (
+    _LEGACY_HEAD
+    + "Location context (from app):\n- country: {country}\n- region: {region}\n- city: {city}\n"
+    "- latitude: {latitude}\n- longitude: {longitude}\n- is_eccu: {is_eccu}\n\n"
+    "Persona guidelines:\n{persona_guidelines}\n\nExamples to mirror when applicable:"
+    + _LEGACY_TAIL
+)
+
+
+def legacy_instructions(location: dict) -> str:
+    return LEGACY_TEMPLATE.format(persona_guidelines=build_persona_guidelines(location), **{
+        k: location.get(k) for k in ("country", "region", "city", "latitude", "longitude", "is_eccu")
+    })
+
+
+def random_location(rng: random.Random) -> dict:
+    if rng.random() < 0.8:
+        country = rng.choice(list(COUNTRY_TONE))
+        return {"country": country, "region": None, "city": f"Town {rng.randint(1, 40)}",
+                "latitude": round(rng.uniform(11.9, 18.3), 4), "longitude": round(rng.uniform(-63.2, -60.8), 4),
+                "is_eccu": True}
+    return {"country": rng.choice(["United States", "Canada", "United Kingdom", "Trinidad and Tobago"]),
+            "region": None, "city": f"City {rng.randint(1, 200)}", "latitude": round(rng.uniform(-40, 60), 4),
+            "longitude": round(rng.uniform(-120, 30), 4), "is_eccu": False}
+
+
+def prefix_reuse(build, locations) -> tuple[float, float]:
+    """Average reusable prefix (tokens) and its share of the prompt."""
+    seen, reused, total = [], 0, 0  # sorted, so the longest shared prefix is with a neighbour
+    for location in locations:
+        prompt = build(location)
+        at = bisect.bisect_left(seen, prompt)
+        neighbours = seen[max(at - 1, 0):at + 1]
+        reused += max((len(commonprefix([prompt, earlier])) for earlier in neighbours), default=0)
+        total += len(prompt)
+        if at == len(seen) or seen[at] != prompt:
+            seen.insert(at, prompt)
+    return reused / len(locations) / CHARS_PER_TOKEN, reused / total
+
+
+def build_time(build, locations) -> float:
+    start = time.perf_counter()
+    for location in locations:
+        build(location)
+    return (time.perf_counter() - start) / len(locations) * 1e6
+
+
+def live(locations) -> None:
+    import requests
+
+    key = os.getenv("OPENROUTER_API_KEY")
+    if not key:
+        print("\n--live needs OPENROUTER_API_KEY")
+        return
+
+    def ask(system: str) -> tuple[float, int]:
+        start = time.perf_counter()
+        ttft, cached = None, 0
+        with requests.post(
+            "https://openrouter.ai/api/v1/chat/completions",
+            headers={"Authorization": f"Bearer {key}"},
+            json={"model": MODEL_ID, "stream": True, "max_tokens": 16, "usage": {"include": True},
+                  "messages": [{"role": "system", "content": system}, {"role": "user", "content": "hi"}]},
+            stream=True,
+            timeout=60,
+        ) as resp:
+            for line in resp.iter_lines():
+                if not line.startswith(b"data: ") or line == b"data: [DONE]":
+                    continue
+                chunk = json.loads(line[6:])
+                if ttft is None and chunk.get("choices") and chunk["choices"][0]["delta"].get("content"):
+                    ttft = time.perf_counter() - start
+                usage = chunk.get("usage") or {}
+                cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", cached) or cached
+        return (ttft or time.perf_counter() - start) * 1000, cached
+
+    a, b = locations[0], {**locations[0], "city": "Another town", "latitude": 0.0, "longitude": 0.0}
+    print("\nlive (second user, same persona, different city):")
+    for name, build in (("legacy", legacy_instructions), ("split", build_instructions)):
+        ask(build(a))  # warm the provider cache with the first user
+        ttft, cached = ask(build(b))
+        print(f"  {name:7} ttft {ttft:7.0f} ms  cached tokens {cached}")
+
+
+def main():
+    rng = random.Random(0)
+    locations = [random_location(rng) for _ in range(TURNS)]
+    print(f"{TURNS} turns, {len(set(json.dumps(l, sort_keys=True) for l in locations))} distinct locations")
+    for name, build in (("legacy", legacy_instructions), ("split", build_instructions)):
+        tokens, share = prefix_reuse(build, locations)
+        print(f"  {name:7} reusable prefix {tokens:6.0f} tokens/turn ({share:.0%} of the system prompt), "
+              f"build {build_time(build, locations):5.1f} us/turn")
+    if "--live" in sys.argv:
+        live(locations)
+
+
+if __name__ == "__main__":
+    main()
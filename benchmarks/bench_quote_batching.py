@@ -0,0 +1,69 @@
+"""Round trips to a local fake quote service: one request per ticker vs. QuoteBatcher.
+
+Models two cases from the chat: the model asking for five tickers as five
+parallel tool calls, and several sessions asking for overlapping tickers at
+the same time.
+"""
+import json
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from eccb.quotes import QuoteBatcher
+
+LATENCY = 0.12  # seconds per request to the fake service
+requests_served = 0
+_counter_lock = threading.Lock()
+
+
+class FakeQuoteService(BaseHTTPRequestHandler):
+    def do_GET(self):
+        global requests_served
+        with _counter_lock:
+            requests_served += 1
+        symbols = parse_qs(urlparse(self.path).query)["symbols"][0].split(",")
+        time.sleep(LATENCY)
+        body = json.dumps({s: {"price": 100 + len(s)} for s in symbols}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeQuoteService)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/quote?symbols="
+
+    def fetch_many(symbols):
+        with urllib.request.urlopen(base + ",".join(symbols)) as resp:
+            return json.load(resp)
+
+    sessions = [["AAPL", "MSFT", "GOOG", "AMZN", "NVDA"], ["AAPL", "TSLA"], ["MSFT", "NVDA", "META"], ["GOOG"]]
+    global requests_served
+
+    for label, get in (
+        ("per-ticker", lambda symbols: {s: fetch_many([s])[s] for s in symbols}),
+        ("batched", QuoteBatcher(fetch_many).get_many),
+    ):
+        requests_served = 0
+        start = time.perf_counter()
+        with ThreadPoolExecutor(32) as pool:
+            # each ticker of each session as its own parallel tool call
+            results = list(pool.map(lambda s: get([s]), [s for session in sessions for s in session]))
+        elapsed = time.perf_counter() - start
+        assert all(r for r in results)
+        print(f"{label:>10}: {requests_served:3d} round trips, {elapsed * 1000:7.1f} ms for {len(results)} ticker requests")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Rendered bytes and CPU time for a long streamed reply: per-chunk redraw vs. ReplyRenderer.
+
+Replays an ~8000-token reply as one-token chunks arriving at 150 tokens/s
+(simulated clock). The fake placeholder UTF-8 encodes each markdown payload,
+a stand-in for the protobuf/websocket serialization Streamlit does.
+"""
+import random
+import time
+
+from eccb.streaming import ReplyRenderer
+
+TOKENS = 8000
+TOKENS_PER_SECOND = 150
+
+
+class FakePlaceholder:
+    def __init__(self):
+        self.calls = 0
+        self.bytes = 0
+
+    def markdown(self, text: str) -> None:
+        self.calls += 1
+        self.bytes += len(text.encode("utf-8"))
+
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _chunks(rng: random.Random) -> list[str]:
+    words = "save budget income XCD market carnival loan interest scam tip plan goal".split()
+    return [rng.choice(words) + (" " if rng.random() > 0.1 else ".\n\n") for _ in range(TOKENS)]
+
+
+def _run(chunks, use_renderer: bool) -> tuple[FakePlaceholder, float]:
+    placeholder, clock = FakePlaceholder(), SimulatedClock()
+    renderer = ReplyRenderer(placeholder, clock=clock)
+    full_response = ""
+    start = time.process_time()
+    for chunk in chunks:
+        clock.now += 1 / TOKENS_PER_SECOND
+        full_response += chunk
+        if use_renderer:
+            renderer.update(full_response)
+        else:
+            placeholder.markdown(full_response + "● ")
+    if use_renderer:
+        renderer.finish(full_response)
+    else:
+        placeholder.markdown(full_response)
+    return placeholder, time.process_time() - start
+
+
+def main():
+    chunks = _chunks(random.Random(0))
+    for label, use_renderer in (("per chunk", False), ("renderer", True)):
+        placeholder, cpu = _run(chunks, use_renderer)
+        print(f"{label:>10}: {placeholder.calls:6d} redraws, {placeholder.bytes / 1e6:9.2f} MB rendered, {cpu * 1000:8.1f} ms CPU")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Match quality, hit rate and lookup latency of the near-duplicate answer cache.
+
+CORPUS groups paraphrases of common financial-literacy questions; questions
+in different groups must never be served each other's answers. The first
+question of each group is stored; every other question is looked up.
+"""
+import sys
+import time
+
+from eccb.response_cache import ResponseCache
+
+CORPUS = [
+    ["What is a budget?", "whats a budget", "What is a budget exactly?", "can you tell me what a budget is", "budget, what is it"],
+    ["How do I avoid scams?", "how can I avoid scams", "How do I avoid online scams?", "how to avoid scams please", "tips to avoid scams"],
+    ["What is compound interest?", "explain compound interest", "what does compound interest mean", "compound interest?"],
+    ["How do I start saving money?", "how can i start saving money", "how to start saving money", "ways to start saving money"],
+    ["What is a credit score?", "whats a credit score", "explain credit score to me", "what does credit score mean"],
+    ["What is an emergency fund?", "what's an emergency fund", "explain emergency fund", "why do I need an emergency fund"],
+    ["What is a bond?", "whats a bond", "explain bonds"],
+    ["How do I make money as a student?", "how can a student make money", "ways for students to make money"],
+    ["What is inflation?", "explain inflation", "what does inflation mean"],
+    ["What is the ECCB?", "what is the eastern caribbean central bank", "what does the ECCB do"],
+]
+
+
+def evaluate(threshold: float) -> dict:
+    cache = ResponseCache(threshold=threshold)
+    for group_id, group in enumerate(CORPUS):
+        cache.store(group[0], "global", f"answer-{group_id}")
+    correct = wrong = missed = 0
+    for group_id, group in enumerate(CORPUS):
+        for question in group[1:]:
+            answer = cache.lookup(question, "global")
+            if answer is None:
+                missed += 1
+            elif answer == f"answer-{group_id}":
+                correct += 1
+            else:
+                wrong += 1
+    return {"correct": correct, "wrong": wrong, "missed": missed, **cache.stats()}
+
+
+def main(thresholds=(0.4, 0.5, 0.6, 0.7, 0.8)):
+    print(f"{'threshold':>9} {'correct':>8} {'wrong':>6} {'missed':>7} {'hit rate':>9}")
+    for threshold in thresholds:
+        r = evaluate(threshold)
+        print(f"{threshold:>9.2f} {r['correct']:>8} {r['wrong']:>6} {r['missed']:>7} {r['hit_rate']:>9.0%}")
+
+    cache = ResponseCache()
+    for i in range(2000):
+        cache.store(f"question number {i} about topic {i % 97} and savings plan {i % 13}", "global", "x")
+    start = time.perf_counter()
+    for i in range(2000):
+        cache.lookup(f"question {i} about topic {i % 89}", "global")
+    print(f"lookup with 2000 cached entries: {(time.perf_counter() - start) / 2000 * 1e6:.0f} µs")
+
+
+if __name__ == "__main__":
+    main(tuple(map(float, sys.argv[1:])) or (0.4, 0.5, 0.6, 0.7, 0.8))
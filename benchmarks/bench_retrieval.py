@@ -0,0 +1,50 @@
+"""Index build and query latency of the upload retrieval index vs. document size."""
+import random
+import time
+
+from eccb.retrieval import DocumentIndex
+
+WORDS = (
+    "account balance deposit withdrawal interest loan payment statement branch fee "
+    "transfer savings budget income expense rent groceries transport school insurance "
+    "credit debit card pin scam policy premium claim remittance xcd usd tourism market"
+).split()
+QUERIES = [
+    "what fees did the bank charge on my account",
+    "how much interest is on the loan",
+    "insurance claim policy premium",
+    "remittance transfer to usd",
+]
+
+
+def synthetic_document(chars: int, rng: random.Random) -> str:
+    lines, size = [], 0
+    while size < chars:
+        line = " ".join(rng.choice(WORDS) for _ in range(12)) + f" {rng.randint(1, 9999)}.{rng.randint(0, 99):02d}"
+        lines.append(line)
+        size += len(line) + 1
+        if rng.random() < 0.1:
+            lines.append("")
+    return "\n".join(lines)
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'doc chars':>12} {'chunks':>8} {'build ms':>10} {'query ms':>10}")
+    for chars in (10_000, 100_000, 1_000_000, 5_000_000):
+        text = synthetic_document(chars, rng)
+        index = DocumentIndex()
+        start = time.perf_counter()
+        index.add_document("statement.pdf", text)
+        build = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for _ in range(5):
+            for q in QUERIES:
+                index.context_for(q)
+        query = (time.perf_counter() - start) * 1000 / (5 * len(QUERIES))
+        print(f"{chars:>12,} {len(index):>8} {build:>10.1f} {query:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
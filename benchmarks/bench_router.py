@@ -0,0 +1,161 @@
+"""Intent router accuracy, latency, tool-schema savings and time to first token on a labelled prompt set.
+
+The prompts below are held out from data/intent_examples.json. For each one
+we record the routed intent, whether it was answered locally, and how many
+tool functions the model would have been sent. Schema sizes come from agno
+when it is installed, otherwise from a per-function estimate.
+
+Time to first token is measured through the real agent against
+benchmarks/fake_openrouter.py: every prompt that goes to the model is run
+once with its routed toolkits and once with every toolkit. The fake model
+waits a fixed TTFT plus prompt prefill at PREFILL_TOKENS_PER_S, so bigger
+tool schemas cost what they would upstream; our own tool processing and
+request building are included.
+
+$ python -m benchmarks.bench_router [--no-ttft]
+"""
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+
+from benchmarks.fake_openrouter import FakeOpenRouter, Script
+
+BASE_TTFT = 0.1  # seconds the fake model waits before any prompt processing
+PREFILL_TOKENS_PER_S = 4000  # assumed upstream prefill rate
+
+LABELLED = [
+    ("quiz", "can you give me a quiz on money"), ("quiz", "B"), ("quiz", "I want to test what I know about credit"),
+    ("quiz", "let's do a savings quiz"), ("quiz", "ask me a question about scams"), ("quiz", "one more quiz"),
+    ("quiz", "trivia about the eastern caribbean dollar"), ("quiz", "was my answer right"),
+    ("budget", "I get paid 1800 a month, help me split it"), ("budget", "how can I save 2000 by Christmas"),
+    ("budget", "make a spending plan for my family"), ("budget", "my bills are too high, help me budget"),
+    ("budget", "what if carnival costs me an extra 500"), ("budget", "how many months to save for a phone"),
+    ("budget", "plan my income from seasonal tourism work"), ("budget", "I want a savings plan"),
+    ("side_hustle", "ideas to make money after school"), ("side_hustle", "I'm good at braiding hair, can I earn from it"),
+    ("side_hustle", "what business can I start with 200 EC"), ("side_hustle", "how do I earn money during Spicemas"),
+    ("side_hustle", "ways to make cash from my boat"), ("side_hustle", "suggest some hustles for me"),
+    ("side_hustle", "I want to start a small business"), ("side_hustle", "money making ideas in Dominica"),
+    ("currency", "convert 60 usd to ec"), ("currency", "how much is EC$500 in euros"),
+    ("currency", "what's 1 pound in EC dollars"), ("currency", "exchange rate for TTD to XCD"),
+    ("currency", "200 canadian dollars in US"), ("currency", "change 1,250 EC into US dollars"),
+    ("currency", "what's the EC to USD rate"), ("currency", "how much US money is 90 EC"),
+    ("scam", "I won a prize but must pay a clearance fee first, is that normal"),
+    ("scam", "someone messaged asking me to verify my DCash wallet PIN"), ("scam", "is tinyurl.com/xyz safe to click"),
+    ("scam", "this guy says join our blessing loom and recruit 8 friends"), ("scam", "how can I tell if an offer is a scam"),
+    ("scam", "they said my account will be suspended unless I send my password"),
+    ("scam", "an investment promising guaranteed returns, legit?"), ("scam", "got a weird text from my bank"),
+    ("markets", "what's Apple trading at"), ("markets", "price of MSFT"), ("markets", "should I buy index funds"),
+    ("markets", "how did Amazon stock do this year"), ("markets", "show me Tesla's history for 3 months"),
+    ("markets", "is gold a good investment right now"), ("markets", "what are dividends"), ("markets", "how do stocks work"),
+    ("news", "any news about the ECCB today"), ("news", "latest hacker news stories"), ("news", "what's happening in tech"),
+    ("news", "news on interest rates this week"), ("news", "recent headlines about Grenada"),
+    ("news", "latest updates on DCash"), ("news", "what's new in fintech"), ("news", "current news on inflation in the Caribbean"),
+    ("knowledge", "what is a savings account"), ("knowledge", "explain what credit means"),
+    ("knowledge", "how does interest work"), ("knowledge", "what is the Eastern Caribbean Central Bank"),
+    ("knowledge", "what does inflation mean for me"), ("knowledge", "what is a loan"),
+    ("knowledge", "define net income"), ("knowledge", "what is a credit union"),
+    ("chat", "hello!"), ("chat", "thanks a lot"), ("chat", "what can you help me with"), ("chat", "good afternoon"),
+    ("chat", "ok thanks bye"), ("chat", "who made you"), ("chat", "hey"), ("chat", "cheers"),
+]
+
+# Functions per toolkit, used when agno isn't installed to size the schemas
+FUNCTIONS = {"web": 3, "quotes": 2, "news": 2, "wikipedia": 1, "budget": 1, "currency": 2, "quiz": 2, "scams": 1, "side_hustles": 1}
+TOKENS_PER_FUNCTION = 150
+
+
+def schema_tokens(toolsets) -> int:
+    try:
+        from pages.agent import _toolkits
+        import json
+        total = 0
+        for name in toolsets:
+            for toolkit in _toolkits(name):
+                for function in toolkit.functions.values():
+                    total += len(json.dumps(function.to_dict())) // 4
+        return total
+    except ImportError:
+        return sum(FUNCTIONS[name] for name in toolsets) * TOKENS_PER_FUNCTION
+
+
+def _first_text_ms(stream) -> float:
+    start = time.perf_counter()
+    elapsed = None
+    for event in stream:
+        if elapsed is None and getattr(event, "event", None) == "RunResponseContent" and getattr(event, "content", None):
+            elapsed = (time.perf_counter() - start) * 1000
+    return elapsed if elapsed is not None else (time.perf_counter() - start) * 1000
+
+
+def measure_ttft(server: FakeOpenRouter, turns: list[tuple[str, tuple]]) -> None:
+    from pages.agent import agent
+    from eccb.router import ALL_TOOLSETS
+
+    def run(prompt, toolsets):
+        server.reset(server.script)
+        ms = _first_text_ms(agent([{"role": "user", "content": prompt}], toolsets=toolsets))
+        return ms, sum(call.prompt_bytes for call in server.calls)
+
+    for toolsets in {toolsets for _, toolsets in turns} | {ALL_TOOLSETS}:  # build and warm each agent variant
+        run("hello", toolsets)
+
+    print(f"\ntime to first token, {len(turns)} model turns (fake model: {BASE_TTFT * 1000:.0f} ms + prefill at "
+          f"{PREFILL_TOKENS_PER_S} tokens/s)")
+    for label, pick in (("routed", lambda toolsets: toolsets), ("every toolkit", lambda toolsets: ALL_TOOLSETS)):
+        samples = [run(prompt, pick(toolsets)) for prompt, toolsets in turns]
+        ttfts = sorted(ms for ms, _ in samples)
+        print(f"  {label:14} p50 {statistics.median(ttfts):6.0f} ms  p95 {ttfts[int(len(ttfts) * .95)]:6.0f} ms  "
+              f"request {statistics.mean(b for _, b in samples) / 1e3:5.1f} kB")
+
+
+def main():
+    measure = "--no-ttft" not in sys.argv[1:]
+    server = None
+    if measure:
+        server = FakeOpenRouter().start()
+        server.reset(Script(ttft=BASE_TTFT, prefill_tokens_per_s=PREFILL_TOKENS_PER_S, steps=[{"text": 5}]))
+        # Must be set before pages.agent reads its config
+        os.environ["OPENROUTER_BASE_URL"] = server.base_url
+        os.environ["RATES_URL"] = server.rates_url
+        os.environ.setdefault("OPENROUTER_API_KEY", "sk-fake")
+
+    from eccb.router import ALL_TOOLSETS, intent_model, route_prompt
+
+    start = time.perf_counter()
+    intent_model()
+    print(f"train: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    correct, local, timings = 0, Counter(), []
+    sent, everything = 0, schema_tokens(ALL_TOOLSETS)
+    mistakes, turns = [], []
+    for label, prompt in LABELLED:
+        start = time.perf_counter()
+        route = route_prompt(prompt, session_id=None)
+        timings.append(time.perf_counter() - start)
+        correct += route.intent == label
+        if route.intent != label:
+            mistakes.append(f"{label} -> {route.intent} ({route.confidence:.2f}): {prompt}")
+        if route.reply:
+            local[route.intent] += 1
+        else:
+            sent += schema_tokens(route.toolsets)
+            turns.append((prompt, route.toolsets))
+
+    n = len(LABELLED)
+    timings.sort()
+    to_model = n - sum(local.values())
+    print(f"accuracy: {correct}/{n} ({correct / n:.0%})")
+    print(f"route latency: p50 {timings[n // 2] * 1e6:.0f} us, max {timings[-1] * 1e6:.0f} us")
+    print(f"answered locally: {sum(local.values())}/{n} {dict(local)}")
+    print(f"tool schema tokens per model call: {sent / max(to_model, 1):.0f} routed vs {everything} with every toolkit")
+    for line in mistakes:
+        print("  miss:", line)
+
+    if measure:
+        measure_ttft(server, turns)
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
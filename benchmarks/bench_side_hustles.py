@@ -0,0 +1,42 @@
+"""Side-hustle recommendation latency from the in-memory catalog.
+
+Times catalog load (once per process) and a ranked top-5 for a mix of
+countries, skills, budgets and months, i.e. what one tool call costs.
+"""
+import random
+import time
+
+from eccb.side_hustles import FESTIVALS, SKILL_ALIASES, hustle_catalog
+
+SKILLS = sorted(set(SKILL_ALIASES) | set(SKILL_ALIASES.values()))
+COUNTRIES = list(FESTIVALS) + ["United States", ""]
+
+
+def main():
+    start = time.perf_counter()
+    catalog = hustle_catalog()
+    print(f"catalog load: {(time.perf_counter() - start) * 1000:.2f} ms for {len(catalog.hustles)} ideas")
+
+    rng = random.Random(0)
+    queries = [
+        (rng.sample(SKILLS, rng.randint(0, 3)), rng.choice([None, 0, 200, 500, 1500]), rng.choice(COUNTRIES), rng.randint(1, 12))
+        for _ in range(20_000)
+    ]
+    timings = []
+    for skills, budget, country, month in queries:
+        start = time.perf_counter()
+        catalog.recommend(skills, budget, country, month, k=5)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    print(f"recommend top-5 over {len(queries):,} queries:")
+    for label, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+        print(f"  {label} {timings[int(q * (len(timings) - 1))] * 1e6:8.1f} us")
+
+    for skills, budget, country, month in ((["cooking"], 500, "Grenada", 7), (["photography", "social media"], None, "Saint Lucia", 6)):
+        print(f"\n{skills} budget={budget} {country} month={month}:")
+        for hustle, reasons in catalog.recommend(skills, budget, country, month, k=5):
+            print(f"  {hustle['name']}: {'; '.join(reasons)}")
+
+
+if __name__ == "__main__":
+    main()
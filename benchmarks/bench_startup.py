@@ -0,0 +1,102 @@
+"""Cold-start cost of the Streamlit pages: import time and time to first paint.
+
+Every measurement runs in a fresh interpreter, like a new container would.
+
+- imports: ``python -X importtime -c "import <module>"`` for each page and
+  the modules it pulls in. It reports the cumulative time and the slowest
+  top-level packages.
+- first paint: each page runs once through streamlit's AppTest. It reports
+  the time from interpreter start to the first element the page sends, and
+  to the end of the script run. The location is pre-seeded in session state,
+  so no geolocation request goes out.
+
+Pass --runs N to take the median of N cold runs (default 3).
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["streamlit", "pages.agent", "eccb.uploads", "eccb.quotes", "pages.eccb_map", "eccb.router"]
+PAGES = ["streamlit_app.py", "pages/app.py"]
+TOP = 5
+
+# Runs a page in AppTest and prints when the first element left the script
+_PAINT = """
+import json, sys, time
+started = float(sys.argv[1])
+from streamlit.delta_generator import DeltaGenerator
+first = []
+enqueue = DeltaGenerator._enqueue
+def _record(self, *args, **kwargs):
+    if not first:
+        first.append(time.time())
+    return enqueue(self, *args, **kwargs)
+DeltaGenerator._enqueue = _record
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[2], default_timeout=120)
+at.session_state["user_location"] = {"country": "Saint Lucia", "region": None, "city": "Castries",
+                                     "latitude": 14.01, "longitude": -60.99, "is_eccu": True, "ip": "198.51.100.7"}
+at.run()
+done = time.time()
+print(json.dumps({"first_paint": (first[0] if first else done) - started, "run": done - started,
+                  "errors": [e.value for e in at.exception]}))
+"""
+
+
+def import_profile(module: str) -> tuple[float, list[tuple[str, float]]]:
+    """Cumulative import time of ``module`` (seconds) and its slowest top-level packages."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    total, packages = 0.0, {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        indent, name = len(name) - len(name.lstrip()), name.strip()
+        if indent == 1 and name == module:
+            total = int(cumulative) / 1e6
+            break
+        if indent == 1:  # something the interpreter imported at startup, not our module
+            packages = {}
+        elif indent == 3:  # imported directly by the module
+            # group third-party packages, keep our own modules apart
+            key = name if name.startswith(("pages.", "eccb.")) else name.split(".")[0]
+            packages[key] = packages.get(key, 0.0) + int(cumulative) / 1e6
+    return total, sorted(packages.items(), key=lambda item: item[1], reverse=True)[:TOP]
+
+
+def first_paint(page: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", _PAINT, repr(time.time()), page],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    runs = int(sys.argv[sys.argv.index("--runs") + 1]) if "--runs" in sys.argv else 3
+    print(f"import time (cumulative, median of {runs} cold interpreters):")
+    for module in MODULES:
+        profiles = [import_profile(module) for _ in range(runs)]
+        total = statistics.median(p[0] for p in profiles)
+        slowest = ", ".join(f"{name} {seconds * 1000:.0f}" for name, seconds in profiles[-1][1])
+        print(f"  {module:16} {total * 1000:7.0f} ms   ({slowest})")
+
+    print("\ncold first paint (median, from interpreter start):")
+    for page in PAGES:
+        samples = [first_paint(page) for _ in range(runs)]
+        paint = statistics.median(s["first_paint"] for s in samples)
+        run = statistics.median(s["run"] for s in samples)
+        errors = samples[-1]["errors"]
+        print(f"  {page:18} first element {paint * 1000:6.0f} ms   full run {run * 1000:6.0f} ms"
+              + (f"   errors: {errors}" if errors else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""A local stand-in for OpenRouter's streaming chat completions API.
+
+It speaks enough of the OpenAI-compatible protocol for agno's OpenRouter
+model: it answers POST /api/v1/chat/completions with server-sent events, and
+GET /rates returns exchange rates for eccb/currency.py. A Script controls
+the time to first token (optionally growing with the prompt size), the
+tokens per second and which tool calls are made before the final answer.
+Every request is recorded, so a benchmark can report model calls and prompt
+sizes without spending tokens.
+
+Run it on its own to point the app at it:
+
+$ python -m benchmarks.fake_openrouter 8765
+$ OPENROUTER_BASE_URL=http://127.0.0.1:8765/api/v1 streamlit run streamlit_app.py
+"""
+import json
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = ("Saving a little each payday adds up faster than you think, so start with a small "
+         "automatic transfer and grow it as your income grows.").split()
+RATES = {"USD": 1.0, "XCD": 2.7, "EUR": 0.92, "GBP": 0.79, "CAD": 1.36, "TTD": 6.78, "BBD": 2.0, "JMD": 156.0}
+
+
+@dataclass
+class Script:
+    """What the fake model does for one conversation turn.
+
+    ``steps`` are played one per model call: ``{"tool_calls": [(name, args), ...]}``
+    asks agno to run tools; ``{"text": n}`` streams an n-token answer and ends the turn.
+    """
+    ttft: float = 0.3  # seconds before the first chunk of every call
+    prefill_tokens_per_s: float = 0.0  # if set, the first chunk also waits for the prompt (~4 bytes a token) to be read
+    tokens_per_s: float = 80.0
+    steps: list = field(default_factory=lambda: [{"text": 60}])
+
+
+@dataclass
+class Call:
+    started: float
+    prompt_bytes: int
+    tools: list[str]
+    step: dict
+
+
+class FakeOpenRouter:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.script = Script()
+        self.calls: list[Call] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+    @property
+    def rates_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/rates"
+
+    def start(self) -> "FakeOpenRouter":
+        threading.Thread(target=self._server.serve_forever, name="fake-openrouter", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset(self, script: Script) -> None:
+        with self._lock:
+            self.script = script
+            self.calls = []
+
+    def _step_for(self, messages: list) -> dict:
+        # One step per model call in this turn: count tool-call rounds since the last user message
+        rounds = 0
+        for message in reversed(messages):
+            if message.get("role") == "user":
+                break
+            if message.get("role") == "assistant" and message.get("tool_calls"):
+                rounds += 1
+        steps = self.script.steps
+        return steps[min(rounds, len(steps) - 1)]
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.startswith("/rates"):
+                    self._send_json({"result": "success", "rates": RATES})
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                if not self.path.endswith("/chat/completions"):
+                    self.send_error(404)
+                    return
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                request = json.loads(body)
+                step = fake._step_for(request.get("messages", []))
+                tools = [t["function"]["name"] for t in request.get("tools") or []]
+                with fake._lock:
+                    fake.calls.append(Call(time.perf_counter(), len(body), tools, step))
+                    script = fake.script
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                prefill = len(body) / 4 / script.prefill_tokens_per_s if script.prefill_tokens_per_s else 0.0
+                time.sleep(script.ttft + prefill)
+                try:
+                    if "tool_calls" in step:
+                        self._stream_tool_calls(request, step["tool_calls"])
+                    else:
+                        self._stream_text(request, step.get("text", 60), script.tokens_per_s)
+                    self._event("[DONE]")
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # the client cancelled the run
+                self.close_connection = True
+
+            def _send_json(self, payload: dict) -> None:
+                data = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _event(self, data) -> None:
+                payload = data if isinstance(data, str) else json.dumps(data)
+                self.wfile.write(f"data: {payload}\n\n".encode())
+                self.wfile.flush()
+
+            def _chunk(self, request: dict, delta: dict, finish: str | None = None, usage: dict | None = None) -> dict:
+                chunk = {
+                    "id": "gen-fake", "object": "chat.completion.chunk", "created": int(time.time()),
+                    "model": request.get("model", "fake"),
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+                }
+                if usage:
+                    chunk["usage"] = usage
+                return chunk
+
+            def _usage(self, request: dict, completion_tokens: int) -> dict:
+                prompt_tokens = len(json.dumps(request.get("messages", []))) // 4
+                return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                        "total_tokens": prompt_tokens + completion_tokens}
+
+            def _stream_text(self, request: dict, tokens: int, tokens_per_s: float) -> None:
+                self._event(self._chunk(request, {"role": "assistant", "content": ""}))
+                interval = 1.0 / tokens_per_s if tokens_per_s > 0 else 0.0
+                for i in range(tokens):
+                    self._event(self._chunk(request, {"content": WORDS[i % len(WORDS)] + " "}))
+                    time.sleep(interval)
+                self._event(self._chunk(request, {}, "stop", self._usage(request, tokens)))
+
+            def _stream_tool_calls(self, request: dict, calls: list) -> None:
+                self._event(self._chunk(request, {"role": "assistant", "content": None}))
+                for index, (name, args) in enumerate(calls):
+                    self._event(self._chunk(request, {"tool_calls": [{
+                        "index": index, "id": f"call_{len(fake.calls)}_{index}", "type": "function",
+                        "function": {"name": name, "arguments": json.dumps(args)},
+                    }]}))
+                self._event(self._chunk(request, {}, "tool_calls", self._usage(request, 20 * len(calls))))
+
+        return Handler
+
+
+if __name__ == "__main__":
+    server = FakeOpenRouter(port=int(sys.argv[1]) if len(sys.argv) > 1 else 8765).start()
+    print(f"fake OpenRouter at {server.base_url} (rates at {server.rates_url}), Ctrl+C to stop")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
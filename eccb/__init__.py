@@ -0,0 +1,2 @@
+# 🧰 Helpers shared by the app pages. They live outside pages/, where Streamlit
+# would list every module as a page of its own.
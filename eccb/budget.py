@@ -0,0 +1,278 @@
+# 📊 Budget plans and savings projections
+#
+# A budget is a vector of monthly category amounts (income positive, expenses
+# negative). Every scenario, base plan included, becomes one row of a
+# (scenarios, categories, months) array, so projecting 1000 what-ifs over five
+# years is a handful of NumPy operations rather than a Python loop per month.
+import calendar
+from dataclasses import dataclass, field
+from datetime import date
+
+import numpy as np
+from agno.tools import Toolkit
+
+MAX_MONTHS = 120
+TABLE_MAX_ROWS = 12  # longer projections are summarised per year
+
+# Month the main carnival/festival spend lands in, per ECCU country
+CARNIVAL_MONTHS = {
+    "Antigua and Barbuda": 8,
+    "Dominica": 2,
+    "Grenada": 8,
+    "Saint Kitts and Nevis": 12,
+    "Saint Lucia": 7,
+    "Saint Vincent and the Grenadines": 7,
+    "Anguilla": 8,
+    "Montserrat": 12,
+}
+DEFAULT_CARNIVAL_MONTH = 2
+
+
+@dataclass
+class Adjustment:
+    """Change to a category (or "income"/"expenses" for all of them) in some calendar months."""
+    category: str
+    percent: float = 0.0  # +30 means 30% more
+    amount: float = 0.0  # added per month on top of the percentage
+    months: list[int] | None = None  # calendar months 1-12, None for every month
+
+
+@dataclass
+class Scenario:
+    name: str
+    adjustments: list[Adjustment] = field(default_factory=list)
+
+
+def preset_scenarios(country: str | None = None) -> dict[str, Scenario]:
+    carnival = CARNIVAL_MONTHS.get(country, DEFAULT_CARNIVAL_MONTH)
+    return {
+        "carnival": Scenario(
+            f"Carnival spike ({calendar.month_abbr[carnival]} spending +30%)",
+            [Adjustment("expenses", percent=30, months=[carnival])],
+        ),
+        "tourism_season": Scenario(
+            "Tourism season (income +25% Dec-Apr, -25% Jun-Oct)",
+            [Adjustment("income", percent=25, months=[12, 1, 2, 3, 4]),
+             Adjustment("income", percent=-25, months=[6, 7, 8, 9, 10])],
+        ),
+        "hurricane_season": Scenario(
+            "Hurricane season (expenses +15% Aug-Oct)",
+            [Adjustment("expenses", percent=15, months=[8, 9, 10])],
+        ),
+        "price_rise": Scenario("Prices up 8%", [Adjustment("expenses", percent=8)]),
+    }
+
+
+def project(income: dict, expenses: dict, scenarios: list[Scenario], months: int = 12,
+            start_month: int = 1, starting_balance: float = 0.0) -> dict:
+    """Month-by-month cash flow for the base plan plus every scenario.
+
+    Returns arrays shaped (1 + len(scenarios), months): "income", "expenses",
+    "net" and the running "balance". Row 0 is the base plan.
+    """
+    names = list(income) + list(expenses)
+    base = np.array([float(v) for v in income.values()] + [-float(v) for v in expenses.values()])
+    is_income = np.arange(len(names)) < len(income)
+    index = {name.lower(): i for i, name in enumerate(names)}
+    calendar_month = (start_month - 1 + np.arange(months)) % 12 + 1
+
+    # Flatten every adjustment into parallel arrays, then apply them all at once.
+    # The calendar months an adjustment covers are packed into a bit mask.
+    groups = {"income": [i for i in range(len(names)) if is_income[i]],
+              "expenses": [i for i in range(len(names)) if not is_income[i]]}
+    every_month = sum(1 << m for m in range(1, 13))
+    rows, cols, bits, pcts, amts = [], [], [], [], []
+    for s, scenario in enumerate(scenarios, start=1):
+        for adj in scenario.adjustments:
+            key = adj.category.lower()
+            targets = [index[key]] if key in index else groups.get(key)
+            if not targets:
+                raise ValueError(f"Unknown budget category '{adj.category}' in scenario '{scenario.name}'")
+            month_bits = every_month if adj.months is None else sum(1 << int(m) for m in set(adj.months))
+            for c in targets:
+                rows.append(s)
+                cols.append(c)
+                bits.append(month_bits)
+                pcts.append(adj.percent / 100.0)
+                # amounts are given as positive money; expenses are stored negative
+                amts.append(adj.amount if is_income[c] else -adj.amount)
+
+    shape = (1 + len(scenarios), len(names), months)
+    size = shape[0] * shape[1] * shape[2]
+    scale = np.ones(shape)
+    extra = np.zeros(shape)
+    if rows:
+        masks = (np.array(bits, np.int64)[:, None] >> calendar_month[None, :]) & 1
+        # bincount sums adjustments hitting the same cell, much faster than np.add.at
+        cells = ((np.array(rows) * shape[1] + np.array(cols))[:, None] * months + np.arange(months)).ravel()
+        scale += np.bincount(cells, (masks * np.array(pcts)[:, None]).ravel(), size).reshape(shape)
+        extra += np.bincount(cells, (masks * np.array(amts)[:, None]).ravel(), size).reshape(shape)
+    flows = base[None, :, None] * scale + extra  # (scenario, category, month)
+
+    income_total = flows[:, :len(income)].sum(axis=1)  # income categories come first
+    expense_total = -flows[:, len(income):].sum(axis=1)
+    net = income_total - expense_total
+    return {
+        "income": income_total,
+        "expenses": expense_total,
+        "net": net,
+        "balance": starting_balance + np.cumsum(net, axis=1),
+        "calendar_month": calendar_month,
+    }
+
+
+def summarize(result: dict, savings_goal: float = 0.0) -> dict:
+    """Per-scenario totals, lowest point and the first month the goal is met (1-based, 0 if never)."""
+    balance = result["balance"]
+    reached = balance >= savings_goal
+    return {
+        "average_net": result["net"].mean(axis=1),
+        "lowest_balance": balance.min(axis=1),
+        "lowest_month": balance.argmin(axis=1) + 1,
+        "end_balance": balance[:, -1],
+        "goal_month": np.where(reached.any(axis=1), reached.argmax(axis=1) + 1, 0) if savings_goal > 0 else None,
+    }
+
+
+def _money(value: float) -> str:
+    return f"{value:,.0f}" if abs(value) >= 100 else f"{value:,.2f}"
+
+
+def _table(header: list[str], rows: list[list[str]]) -> str:
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    lines += ["| " + " | ".join(row) + " |" for row in rows]
+    return "\n".join(lines)
+
+
+def cash_flow_table(result: dict, row: int = 0) -> str:
+    """Month-by-month table for one scenario, or per year when it runs past TABLE_MAX_ROWS months."""
+    months = result["net"].shape[1]
+    income, expenses, net = result["income"][row], result["expenses"][row], result["net"][row]
+    balance = result["balance"][row]
+    if months <= TABLE_MAX_ROWS:
+        labels = [calendar.month_abbr[m] for m in result["calendar_month"]]
+        spans = [(i, i + 1) for i in range(months)]
+    else:
+        spans = [(i, min(i + 12, months)) for i in range(0, months, 12)]
+        labels = [f"Year {i // 12 + 1}" for i, _ in spans]
+    rows = [
+        [label, _money(income[a:b].sum()), _money(expenses[a:b].sum()), _money(net[a:b].sum()), _money(balance[b - 1])]
+        for label, (a, b) in zip(labels, spans)
+    ]
+    return _table(["Month" if months <= TABLE_MAX_ROWS else "Period", "Income", "Expenses", "Net", "Balance"], rows)
+
+
+def scenario_table(names: list[str], summary: dict) -> str:
+    goal = summary["goal_month"]
+    header = ["Scenario", "Avg net / month", "Lowest balance (month)", "End balance"]
+    if goal is not None:
+        header.append("Goal reached")
+    rows = []
+    for i, name in enumerate(names):
+        row = [
+            name,
+            _money(summary["average_net"][i]),
+            f"{_money(summary['lowest_balance'][i])} (m{summary['lowest_month'][i]})",
+            _money(summary["end_balance"][i]),
+        ]
+        if goal is not None:
+            row.append(f"month {goal[i]}" if goal[i] else "not within plan")
+        rows.append(row)
+    return _table(header, rows)
+
+
+def budget_report(income: dict, expenses: dict, months: int = 12, starting_balance: float = 0.0,
+                  savings_goal: float = 0.0, scenarios: list[Scenario] | None = None,
+                  start_month: int | None = None, currency: str = "XCD") -> str:
+    """Markdown budget summary, base cash flow and a what-if comparison."""
+    months = max(1, min(int(months), MAX_MONTHS))
+    scenarios = scenarios or []
+    result = project(income, expenses, scenarios, months, start_month or date.today().month, starting_balance)
+    summary = summarize(result, savings_goal)
+
+    total_income = sum(income.values())
+    lines = [f"**Monthly budget ({currency})**", ""]
+    lines.append(_table(
+        ["Category", "Amount", "% of income"],
+        [[f"{name} (income)", _money(v), ""] for name, v in income.items()]
+        + [[name, _money(v), f"{v / total_income:.0%}" if total_income else "-"] for name, v in expenses.items()],
+    ))
+    net = total_income - sum(expenses.values())
+    rate = f" ({net / total_income:.0%} saved)" if total_income and net > 0 else ""
+    lines += ["", f"Net per month: **{_money(net)}**{rate}", "", f"**Cash flow over {months} months**", ""]
+    lines.append(cash_flow_table(result))
+    if scenarios or savings_goal > 0:
+        lines += ["", "**What-if scenarios**" if scenarios else "**Savings goal**", ""]
+        lines.append(scenario_table(["Base plan"] + [s.name for s in scenarios], summary))
+    return "\n".join(lines)
+
+
+def _scenario_from_dict(spec: dict) -> Scenario:
+    adjustments = spec.get("adjustments") or [spec]
+    return Scenario(
+        str(spec.get("name") or "Custom"),
+        [Adjustment(str(a["category"]), float(a.get("percent", 0)), float(a.get("amount", 0)), a.get("months"))
+         for a in adjustments],
+    )
+
+
+class BudgetTools(Toolkit):
+    """Budget plans, cash-flow projections and what-if scenarios computed locally."""
+
+    def __init__(self, country: str | None = None, **kwargs):
+        super().__init__(name="budget_tools", **kwargs)
+        self.country = country
+        self.register(self.create_budget_plan)
+
+    def create_budget_plan(
+        self,
+        income: dict[str, float],
+        expenses: dict[str, float],
+        months: int = 12,
+        starting_balance: float = 0.0,
+        savings_goal: float = 0.0,
+        what_if: list[str] | None = None,
+        custom_scenarios: list[dict] | None = None,
+        country: str | None = None,
+        currency: str = "XCD",
+    ) -> str:
+        """Use this function to build a budget plan and project monthly cash flow and savings.
+        Always use it for budgets instead of doing the arithmetic yourself; show its tables as they are.
+
+        Args:
+            income (dict[str, float]): Monthly income by source, e.g. {"job": 2400, "market sales": 300}.
+            expenses (dict[str, float]): Monthly expenses by category, e.g. {"rent": 900, "food": 600}.
+            months (int): How many months to project (1-120). Defaults to 12.
+            starting_balance (float): Savings the user has today.
+            savings_goal (float): Target savings balance; the tables show when it is reached.
+            what_if (list[str]): Preset scenarios to compare: "carnival", "tourism_season",
+                "hurricane_season", "price_rise".
+            custom_scenarios (list[dict]): Extra scenarios, each like {"name": "Rent up",
+                "category": "rent", "percent": 10, "amount": 0, "months": [1, 2]}. "category" may
+                also be "income" or "expenses" for all of them; omit "months" for every month.
+            country (str): The user's country, used for the carnival month.
+            currency (str): Currency code for the table headings. Defaults to "XCD".
+
+        Returns:
+            str: Markdown tables with the budget, month-by-month cash flow and scenario comparison.
+        """
+        try:
+            presets = preset_scenarios(country or self.country)
+            scenarios = []
+            for name in what_if or []:
+                key = str(name).strip().lower().replace(" ", "_")
+                if key not in presets:
+                    return f"Error creating budget plan: unknown scenario '{name}'. Choose from {', '.join(presets)}."
+                scenarios.append(presets[key])
+            scenarios += [_scenario_from_dict(spec) for spec in custom_scenarios or []]
+            return budget_report(
+                {str(k): float(v) for k, v in income.items()},
+                {str(k): float(v) for k, v in expenses.items()},
+                months=months,
+                starting_balance=float(starting_balance),
+                savings_goal=float(savings_goal),
+                scenarios=scenarios,
+                currency=currency,
+            )
+        except (ValueError, TypeError, KeyError) as e:
+            return f"Error creating budget plan: {e}"
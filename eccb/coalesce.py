@@ -0,0 +1,180 @@
+# 🤝 Single-flight for identical opening questions across sessions
+#
+# In workshops dozens of students send the same first prompt within seconds.
+# When a question has the same coalescing key as a run already in flight, the
+# new session subscribes to that run and replays its events from the start
+# instead of starting another model run.
+#
+# A question is only eligible when the answer can't depend on anything but
+# the prompt and persona:
+#   - it is the first message of the conversation (no history),
+#   - it has no uploaded files, excerpts or images,
+#   - the prompt is at most COALESCE_MAX_PROMPT_CHARS characters.
+#   - every toolset it is routed to is stateless (SHAREABLE_TOOLSETS in
+#     agent.py; checked there, since the key doesn't know about tools).
+# The key is (normalized prompt, hash of the full agent instructions), where
+# normalizing = NFKC, case-fold, collapse whitespace, drop trailing ?!. .
+# Sharing ends when the run finishes; after that a new run starts as usual.
+import contextvars
+import hashlib
+import os
+import threading
+import unicodedata
+
+from eccb.runner import acquire_run_slot, release_run_slot
+
+COALESCE_MAX_PROMPT_CHARS = int(os.getenv("COALESCE_MAX_PROMPT_CHARS", "280"))
+COALESCE_MAX_SUBSCRIBERS = int(os.getenv("COALESCE_MAX_SUBSCRIBERS", "200"))
+
+_lock = threading.Lock()
+_runs: dict[tuple, "_SharedRun"] = {}
+_stats = {"leaders": 0, "followers": 0}
+
+
+def normalize_prompt(prompt: str) -> str:
+    text = unicodedata.normalize("NFKC", prompt).casefold()
+    return " ".join(text.split()).rstrip("?!. ")
+
+
+def coalesce_key(message, instructions: str, has_media: bool = False) -> tuple | None:
+    """Coalescing key for an agent call, or None if it must run on its own."""
+    if has_media:
+        return None
+    if isinstance(message, list):
+        if len(message) != 1 or message[0].get("role") != "user":
+            return None
+        message = message[0].get("content")
+    if not isinstance(message, str):
+        return None
+    prompt = normalize_prompt(message)
+    if not prompt or len(prompt) > COALESCE_MAX_PROMPT_CHARS:
+        return None
+    return prompt, hashlib.sha1(instructions.encode()).hexdigest()
+
+
+class _SharedRun:
+    """One producer thread feeding an append-only event log to many subscribers."""
+
+    def __init__(self, key: tuple, start_stream, on_complete=None):
+        self.key = key
+        self._start_stream = start_stream
+        self._on_complete = on_complete
+        self.events: list = []
+        self.error: BaseException | None = None
+        self.done = False
+        self.subscribers = 0
+        self.stopped = threading.Event()  # set when every subscriber has left
+        self._cond = threading.Condition()
+
+    def start(self) -> None:
+        context = contextvars.copy_context()
+        threading.Thread(target=context.run, args=(self._produce,), name="shared-run", daemon=True).start()
+
+    def _produce(self) -> None:
+        acquired = False
+        try:
+            acquired = acquire_run_slot(self.stopped)
+            if acquired:
+                stream = self._start_stream()
+                try:
+                    for event in stream:
+                        if self.stopped.is_set():
+                            break
+                        with self._cond:
+                            self.events.append(event)
+                            self._cond.notify_all()
+                    else:
+                        if self._on_complete:
+                            self._on_complete(self.events)
+                finally:
+                    close = getattr(stream, "close", None)
+                    if close:
+                        close()
+        except Exception as e:
+            self.error = e
+        finally:
+            if acquired:
+                release_run_slot()
+            with _lock:
+                if _runs.get(self.key) is self:
+                    del _runs[self.key]
+            with self._cond:
+                self.done = True
+                self._cond.notify_all()
+
+    def leave(self) -> None:
+        with _lock:
+            self.subscribers -= 1
+            if self.subscribers == 0:
+                self.stopped.set()
+                if _runs.get(self.key) is self:
+                    del _runs[self.key]
+
+    def replay(self):
+        position = 0
+        while True:
+            with self._cond:
+                while position >= len(self.events) and not self.done:
+                    self._cond.wait()
+                batch = self.events[position:]
+                position = len(self.events)
+                finished = self.done
+            yield from batch
+            if finished and position >= len(self.events):
+                if self.error is not None:
+                    raise self.error
+                return
+
+
+class _Subscription:
+    """Iterator over a shared run; closing it unsubscribes."""
+
+    needs_run_slot = False  # the shared producer holds the slot
+
+    def __init__(self, shared: _SharedRun):
+        self._shared = shared
+        self._events = shared.replay()
+        self._closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._events)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._events.close()
+            self._shared.leave()
+
+
+def coalesced(key: tuple, start_stream, on_complete=None) -> _Subscription:
+    """Join the in-flight run for ``key``, or start one with ``start_stream``.
+
+    ``on_complete(events)`` runs once if the run streams to the end.
+    """
+    with _lock:
+        shared = _runs.get(key)
+        if shared is None or shared.subscribers >= COALESCE_MAX_SUBSCRIBERS:
+            shared = _SharedRun(key, start_stream, on_complete)
+            _runs[key] = shared
+            _stats["leaders"] += 1
+            leader = True
+        else:
+            _stats["followers"] += 1
+            leader = False
+        shared.subscribers += 1
+    if leader:
+        shared.start()
+    return _Subscription(shared)
+
+
+def coalesce_stats() -> dict:
+    """Runs started vs. sessions that piggybacked on one."""
+    with _lock:
+        return {**_stats, "in_flight": len(_runs)}
@@ -0,0 +1,172 @@
+# 💱 In-process currency conversion for the agent
+#
+# Rates are units per 1 USD. Pegged currencies are fixed and never refreshed,
+# so EC$ conversions are exact and instant. Floating currencies come from a
+# rate table refreshed in the background every RATE_REFRESH_SECONDS; until the
+# first refresh succeeds (or when offline) a bundled fallback table is used.
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import requests
+from agno.tools import Toolkit
+
+RATES_URL = os.getenv("RATES_URL", "https://open.er-api.com/v6/latest/USD")
+RATE_REFRESH_SECONDS = float(os.getenv("RATE_REFRESH_SECONDS", str(6 * 60 * 60)))
+
+# Fixed pegs to the US dollar
+PEGGED_RATES = {
+    "USD": 1.0,
+    "XCD": 2.70,  # Eastern Caribbean dollar (ECCB peg)
+    "BBD": 2.00,
+    "BSD": 1.00,
+    "BZD": 2.00,
+    "BMD": 1.00,
+    "KYD": 0.833,
+    "AWG": 1.79,
+    "ANG": 1.79,
+    "PAB": 1.00,
+}
+
+# Approximate floating rates used only until a live table has been fetched
+FALLBACK_RATES = {
+    "EUR": 0.92,
+    "GBP": 0.79,
+    "CAD": 1.36,
+    "TTD": 6.78,
+    "JMD": 156.0,
+    "GYD": 209.0,
+    "DOP": 59.0,
+    "HTG": 132.0,
+    "SRD": 36.0,
+    "AUD": 1.52,
+    "CHF": 0.88,
+    "JPY": 150.0,
+    "CNY": 7.20,
+    "INR": 83.0,
+    "MXN": 17.0,
+}
+
+CURRENCY_ALIASES = {
+    "EC$": "XCD", "EC": "XCD", "ECD": "XCD", "EASTERN CARIBBEAN DOLLAR": "XCD",
+    "US$": "USD", "$": "USD", "US DOLLAR": "USD", "DOLLAR": "USD",
+    "€": "EUR", "EURO": "EUR", "£": "GBP", "POUND": "GBP",
+    "TT$": "TTD", "BDS$": "BBD", "J$": "JMD", "CA$": "CAD",
+}
+
+
+class RateTable:
+    def __init__(self, url: str = RATES_URL, refresh_seconds: float = RATE_REFRESH_SECONDS):
+        self.url = url
+        self.refresh_seconds = refresh_seconds
+        self._rates = {**FALLBACK_RATES, **PEGGED_RATES}
+        self.source = "offline fallback"
+        self.as_of = None
+        self._fetched_at = float("-inf")
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def refresh(self) -> bool:
+        """Fetch live rates now; keeps the current table if that fails."""
+        try:
+            resp = requests.get(self.url, timeout=5)
+            data = resp.json()
+            live = {k.upper(): float(v) for k, v in data["rates"].items() if float(v) > 0}
+        except Exception as e:
+            print(f"Currency rate refresh failed: {e}")
+            with self._lock:
+                self._fetched_at = time.monotonic()  # back off until the next interval
+            return False
+        with self._lock:
+            self._rates = {**self._rates, **live, **PEGGED_RATES}
+            self._fetched_at = time.monotonic()
+            self.source = "live"
+            self.as_of = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+        return True
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.refresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def rates(self) -> dict:
+        """Current table; kicks off a background refresh when it's stale, never blocks."""
+        with self._lock:
+            stale = time.monotonic() - self._fetched_at >= self.refresh_seconds
+            if stale and not self._refreshing and self.url:
+                self._refreshing = True
+                threading.Thread(target=self._refresh_in_background, name="fx-refresh", daemon=True).start()
+            return self._rates
+
+    def rate(self, from_currency: str, to_currency: str) -> tuple[float, str]:
+        rates = self.rates()
+        source = from_currency in PEGGED_RATES and to_currency in PEGGED_RATES and "fixed peg"
+        return rates[to_currency] / rates[from_currency], source or self.source
+
+
+def currency_code(value: str) -> str:
+    code = " ".join(str(value).split()).upper()
+    return CURRENCY_ALIASES.get(code, code)
+
+
+_RATES = RateTable()
+
+
+def convert_many(amounts, from_currency: str, to_currency: str, table: RateTable = _RATES) -> dict:
+    """Convert every amount in ``amounts`` with one rate lookup."""
+    source_code, target_code = currency_code(from_currency), currency_code(to_currency)
+    rates = table.rates()
+    for code in (source_code, target_code):
+        if code not in rates:
+            raise ValueError(f"Unknown currency '{code}'")
+    rate, source = table.rate(source_code, target_code)
+    return {
+        "from": source_code,
+        "to": target_code,
+        "rate": round(rate, 6),
+        "source": source if source != "live" else f"live rates as of {table.as_of}",
+        "conversions": [{"amount": a, "converted": round(a * rate, 2)} for a in amounts],
+    }
+
+
+class CurrencyTools(Toolkit):
+    """Deterministic currency conversion with the EC$ peg built in; no web search needed."""
+
+    def __init__(self, **kwargs):
+        super().__init__(name="currency_tools", **kwargs)
+        self.register(self.convert_currency)
+        self.register(self.convert_amounts)
+
+    def convert_currency(self, amount: float, from_currency: str, to_currency: str) -> str:
+        """Use this function to convert an amount of money between currencies.
+        EC$ (XCD) is pegged at 2.70 per US dollar.
+
+        Args:
+            amount (float): The amount to convert, e.g. 100.
+            from_currency (str): ISO code of the source currency, e.g. "USD".
+            to_currency (str): ISO code of the target currency, e.g. "XCD".
+
+        Returns:
+            str: JSON with the converted amount, the rate used and where the rate came from.
+        """
+        return self.convert_amounts([amount], from_currency, to_currency)
+
+    def convert_amounts(self, amounts: list[float], from_currency: str, to_currency: str) -> str:
+        """Use this function to convert several amounts between the same two currencies in one call.
+
+        Args:
+            amounts (list[float]): The amounts to convert, e.g. [5, 20, 150].
+            from_currency (str): ISO code of the source currency, e.g. "XCD".
+            to_currency (str): ISO code of the target currency, e.g. "USD".
+
+        Returns:
+            str: JSON with each converted amount, the rate used and where the rate came from.
+        """
+        try:
+            return json.dumps(convert_many([float(a) for a in amounts], from_currency, to_currency))
+        except (ValueError, TypeError) as e:
+            return f"Error converting currency: {e}"
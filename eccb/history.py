@@ -0,0 +1,88 @@
+# 🧾 Token-budgeted chat history for the model
+#
+# st.session_state.messages keeps everything the user saw. What we send to the
+# model is a compacted view: the latest turns verbatim, older turns shrunk to
+# their prompt plus short stubs for attachments, oldest turns dropped once the
+# budget is spent. Token counts are memoized on each message, so a turn only
+# counts the messages it hasn't seen before.
+import os
+
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "12000"))
+HISTORY_KEEP_RECENT = int(os.getenv("HISTORY_KEEP_RECENT", "4"))
+
+# Rough chars-per-token for English/Creole chat text; good enough for budgeting
+CHARS_PER_TOKEN = 4
+PREVIEW_CHARS = 160
+OLD_TURN_CHARS = 600
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1 if text else 0
+
+
+def attachment_stub(attachment: dict) -> str:
+    """One-line stand-in for an attachment in an older turn."""
+    text = attachment.get("text") or ""
+    chars = attachment.get("chars", len(text))
+    preview = " ".join(text[:PREVIEW_CHARS].split())
+    more = "…" if chars > PREVIEW_CHARS else ""
+    return f"[{attachment['label']} ({attachment['name']}), {chars:,} chars, omitted: \"{preview}{more}\"]"
+
+
+def _full_text(message: dict) -> str:
+    return message.get("content") or ""
+
+
+def _compact_text(message: dict) -> str:
+    if "attachments" in message:
+        parts = [message.get("prompt") or ""]
+        parts += [attachment_stub(a) for a in message["attachments"]]
+        text = "\n".join(p for p in parts if p)
+    else:
+        text = _full_text(message)
+    if len(text) > OLD_TURN_CHARS:
+        text = text[:OLD_TURN_CHARS].rstrip() + " …[truncated]"
+    return text
+
+
+def _memo(message: dict) -> dict:
+    """Per-message cache of both renderings and their token counts."""
+    memo = message.get("_budget")
+    if memo is None or memo["source_len"] != len(_full_text(message)):
+        full, compact = _full_text(message), _compact_text(message)
+        memo = {
+            "source_len": len(full),
+            "full_tokens": estimate_tokens(full),
+            "compact": compact,
+            "compact_tokens": estimate_tokens(compact),
+        }
+        message["_budget"] = memo
+    return memo
+
+
+def budget_history(messages: list[dict], budget: int | None = None, keep_recent: int | None = None) -> list[dict]:
+    """Return ``{"role", "content"}`` messages that fit in ``budget`` tokens.
+
+    The newest ``keep_recent`` messages are sent verbatim when they fit; the
+    newest one is always sent, cut down to the budget if it has to be.
+    """
+    budget = HISTORY_TOKEN_BUDGET if budget is None else budget
+    keep_recent = HISTORY_KEEP_RECENT if keep_recent is None else keep_recent
+
+    selected = []
+    remaining = budget
+    for age, message in enumerate(reversed(messages)):
+        memo = _memo(message)
+        if age < keep_recent and memo["full_tokens"] <= remaining:
+            content, cost = _full_text(message), memo["full_tokens"]
+        elif memo["compact_tokens"] <= remaining:
+            content, cost = memo["compact"], memo["compact_tokens"]
+        elif age == 0:
+            content = _full_text(message)[: max(remaining, 1) * CHARS_PER_TOKEN]
+            cost = remaining
+        else:
+            break
+        selected.append({"role": message["role"], "content": content})
+        remaining -= cost
+    selected.reverse()
+    return selected
@@ -0,0 +1,139 @@
+# 🗺️ Offline IP -> country lookup backed by a local range file
+#
+# Accepts either an RIR "delegated" export (e.g. delegated-lacnic-extended-latest,
+# delegated-arin-extended-latest) or a CSV with "cidr,cc" or "start,end,cc" rows.
+# Overlapping ranges are split at their boundaries, with the most specific
+# (narrowest) range winning each piece, and the result is kept in sorted
+# arrays, so a lookup is one bisect.
+import csv
+import heapq
+import ipaddress
+import socket
+from array import array
+from bisect import bisect_right
+
+# Unsigned 32-bit typecode for IPv4 boundaries ("I" is 4 bytes on all our targets)
+_V4_TYPECODE = "I" if array("I").itemsize >= 4 else "L"
+
+
+def _v4_to_int(addr: str) -> int:
+    return int.from_bytes(socket.inet_pton(socket.AF_INET, addr), "big")
+
+
+def parse_delegated(lines, countries=None):
+    """Yield (version, start, end, cc) from RIR delegated-format lines."""
+    for line in lines:
+        if not line or line[0] == "#":
+            continue
+        fields = line.rstrip("\n").split("|")
+        if len(fields) < 7 or fields[1] in ("", "*"):
+            continue
+        cc, kind, start, value = fields[1].upper(), fields[2], fields[3], fields[4]
+        if countries is not None and cc not in countries:
+            continue
+        if kind == "ipv4":
+            first = _v4_to_int(start)
+            yield 4, first, first + int(value) - 1, cc
+        elif kind == "ipv6":
+            net = ipaddress.IPv6Network(f"{start}/{value}", strict=False)
+            yield 6, int(net.network_address), int(net.broadcast_address), cc
+
+
+def parse_csv(lines):
+    """Yield (version, start, end, cc) from "cidr,cc" or "start,end,cc" CSV rows."""
+    for row in csv.reader(lines):
+        if not row or row[0].startswith("#"):
+            continue
+        try:
+            if len(row) == 2:
+                net = ipaddress.ip_network(row[0].strip(), strict=False)
+                first, last = net.network_address, net.broadcast_address
+            else:
+                first, last = ipaddress.ip_address(row[0].strip()), ipaddress.ip_address(row[1].strip())
+        except ValueError:
+            continue  # header or junk row
+        yield first.version, int(first), int(last), row[-1].strip().upper()
+
+
+def _flatten(rows):
+    """Disjoint (start, end, code) pieces from possibly overlapping (first, last, code) rows.
+
+    Each piece takes the code of the narrowest range covering it (the earliest
+    row on a tie), so a /24 assigned elsewhere inside a country's /16 keeps its
+    own country. Adjacent pieces with the same code are merged.
+    """
+    rows = sorted(rows)
+    points = sorted({first for first, _, _ in rows} | {last + 1 for _, last, _ in rows})
+    active = []  # heap of (size, order, last, code)
+    starts, ends, codes = [], [], []
+    i = 0
+    for point, next_point in zip(points, points[1:]):
+        while i < len(rows) and rows[i][0] == point:
+            first, last, code = rows[i]
+            heapq.heappush(active, (last - first, i, last, code))
+            i += 1
+        while active and active[0][2] < point:
+            heapq.heappop(active)
+        if not active:
+            continue
+        code = active[0][3]
+        if ends and codes[-1] == code and ends[-1] + 1 == point:
+            ends[-1] = next_point - 1
+        else:
+            starts.append(point)
+            ends.append(next_point - 1)
+            codes.append(code)
+    return starts, ends, codes
+
+
+class IPRangeIndex:
+    """Sorted, disjoint IP ranges with a country code per range."""
+
+    def __init__(self, ranges=(), countries=None):
+        wanted = {c.upper() for c in countries} if countries is not None else None
+        by_version = {4: [], 6: []}
+        for version, first, last, cc in ranges:
+            if wanted is None or cc in wanted:
+                by_version[version].append((first, last, cc))
+
+        self.countries: list[str] = sorted({cc for rows in by_version.values() for _, _, cc in rows})
+        code_of = {cc: i for i, cc in enumerate(self.countries)}
+        self._tables = {}
+        for version, rows in by_version.items():
+            starts, ends, codes = _flatten((first, last, code_of[cc]) for first, last, cc in rows)
+            if version == 4:
+                starts, ends = array(_V4_TYPECODE, starts), array(_V4_TYPECODE, ends)
+            self._tables[version] = (starts, ends, array("H", codes))
+
+    def __len__(self) -> int:
+        return sum(len(starts) for starts, _, _ in self._tables.values())
+
+    def lookup(self, ip: str) -> str | None:
+        """Country code for ``ip``, or None if it isn't covered."""
+        try:
+            version, value = 4, _v4_to_int(ip)
+        except OSError:
+            try:
+                version, value = 6, int(ipaddress.IPv6Address(ip))
+            except ValueError:
+                return None
+        starts, ends, codes = self._tables[version]
+        i = bisect_right(starts, value) - 1
+        if i >= 0 and value <= ends[i]:
+            return self.countries[codes[i]]
+        return None
+
+
+def load_ip_ranges(path: str, countries=None) -> IPRangeIndex:
+    """Build an index from a delegated export or CSV file at ``path``.
+
+    ``countries`` optionally restricts the index to those country codes,
+    which keeps it small when we only care about a handful of territories.
+    """
+    wanted = {c.upper() for c in countries} if countries is not None else None
+    with open(path, encoding="utf-8", errors="replace", newline="") as f:
+        if path.lower().endswith(".csv"):
+            ranges = parse_csv(f)
+        else:
+            ranges = parse_delegated(f, countries=wanted)
+        return IPRangeIndex(ranges, countries=wanted)
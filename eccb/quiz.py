@@ -0,0 +1,195 @@
+# 🎯 Financial-literacy quiz engine
+#
+# Questions come from data/quiz_questions.json, loaded once per process and
+# indexed by topic, difficulty and country. Quiz progress lives in a shared
+# per-session store, so grading an A/B/C/D answer is a dictionary lookup
+# rather than a model call.
+import functools
+import json
+import os
+import random
+import re
+from collections import defaultdict
+
+from agno.tools import Toolkit
+
+from eccb.cache import TTLCache
+from eccb.runner import current_session_id
+
+QUIZ_BANK_FILE = os.getenv(
+    "QUIZ_BANK_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "quiz_questions.json"),
+)
+QUIZ_LENGTH = 3
+DIFFICULTIES = ("easy", "medium", "hard")
+
+_ANSWER_RE = re.compile(r"^\s*(?:my answer is\s+|answer\s*:?\s*)?\(?([a-d])\)?[\s.!)]*$", re.IGNORECASE)
+# Only imperative requests at the start of the prompt; "how do I study for my quiz?" is a question
+_START_RE = re.compile(
+    r"^\s*(?:please\s+|ok(?:ay)?,?\s+|yes,?\s+)?(?:(?:can|could|will)\s+you\s+)?(?:i\s+(?:want|would\s+like)\s+to\s+)?"
+    r"(?:(?:start|take|begin|play|give\s+me|try|let'?s\s+(?:do|play|take|try|start|have))\b[^?.]*?\bquiz\b"
+    r"|quiz\s+me\b|(?:another|one\s+more|(?:a\s+)?new|next)\s+quiz\b)"
+    r"|^\s*quiz\s*(?:me)?\W*$",
+    re.IGNORECASE,
+)
+
+# session id -> quiz state; idle quizzes are forgotten after two hours
+_QUIZZES = TTLCache(maxsize=10000, ttl=2 * 60 * 60)
+
+
+class QuestionBank:
+    def __init__(self, questions: list[dict]):
+        self.questions = {q["id"]: q for q in questions}
+        self.by_topic = defaultdict(set)
+        self.by_difficulty = defaultdict(set)
+        self.by_country = defaultdict(set)  # "" = suitable for everyone
+        for q in questions:
+            self.by_topic[q["topic"]].add(q["id"])
+            self.by_difficulty[q["difficulty"]].add(q["id"])
+            for country in q.get("countries") or [""]:
+                self.by_country[country].add(q["id"])
+
+    @property
+    def topics(self) -> list[str]:
+        return sorted(self.by_topic)
+
+    def pick(self, topic: str = "", difficulty: str = "", country: str = "", count: int = QUIZ_LENGTH,
+             rng: random.Random | None = None) -> list[str]:
+        """Question ids for a quiz, preferring the requested topic/difficulty and
+        questions tagged for ``country``, topping up from the general pool."""
+        rng = rng or random
+        pool = self.by_country[""] | self.by_country.get(country, set())
+        preferred = pool
+        if topic in self.by_topic:
+            preferred = preferred & self.by_topic[topic]
+        if difficulty in self.by_difficulty:
+            preferred = preferred & self.by_difficulty[difficulty]
+        local = sorted(preferred & self.by_country.get(country, set()))
+        rest = sorted(preferred - set(local))
+        rng.shuffle(local)
+        rng.shuffle(rest)
+        chosen = (local[:1] + rest + local[1:])[:count]
+        if len(chosen) < count:
+            extra = sorted(pool - set(chosen))
+            rng.shuffle(extra)
+            chosen += extra[: count - len(chosen)]
+        return chosen
+
+
+@functools.lru_cache(maxsize=1)
+def question_bank() -> QuestionBank:
+    with open(QUIZ_BANK_FILE, encoding="utf-8") as f:
+        return QuestionBank(json.load(f))
+
+
+def _format_question(quiz: dict) -> str:
+    q = question_bank().questions[quiz["questions"][quiz["position"]]]
+    choices = "\n".join(f"{letter}) {text}" for letter, text in sorted(q["choices"].items()))
+    return (
+        f"**Q{quiz['position'] + 1} of {len(quiz['questions'])}:** {q['question']}\n\n"
+        f"{choices}\n\nReply with A, B, C, or D."
+    )
+
+
+def start_quiz(session_id: str, topic: str = "", difficulty: str = "", country: str = "",
+               count: int = QUIZ_LENGTH) -> str:
+    bank = question_bank()
+    topic = topic.strip().lower()
+    quiz = {
+        "questions": bank.pick(topic, difficulty.strip().lower(), country, count),
+        "position": 0,
+        "score": 0,
+        "topic": topic if topic in bank.by_topic else "",
+    }
+    _QUIZZES.set(session_id, quiz)
+    kind = f"{quiz['topic']} quiz" if quiz["topic"] else "quiz"
+    intro = f"Let's test your money smarts with a quick {len(quiz['questions'])}-question {kind}! 🎯"
+    return f"{intro}\n\n{_format_question(quiz)}"
+
+
+def grade_answer(session_id: str, answer: str) -> str | None:
+    """Grade ``answer`` for the session's current question; None if no quiz is running."""
+    quiz = _QUIZZES.get(session_id)
+    if quiz is None:
+        return None
+    letter = answer.strip().upper()[:1]
+    q = question_bank().questions[quiz["questions"][quiz["position"]]]
+    if letter == q["answer"]:
+        quiz["score"] += 1
+        feedback = f"✅ Correct! {q['explanation']}"
+    else:
+        feedback = f"❌ Not quite: the answer is **{q['answer']}) {q['choices'][q['answer']]}**. {q['explanation']}"
+
+    quiz["position"] += 1
+    total = len(quiz["questions"])
+    if quiz["position"] < total:
+        _QUIZZES.set(session_id, quiz)
+        return f"{feedback}\n\nScore so far: {quiz['score']}/{quiz['position']}.\n\n{_format_question(quiz)}"
+
+    _QUIZZES.pop(session_id)
+    cheer = "🎉 Perfect score!" if quiz["score"] == total else "🎉 Quiz done!"
+    return (
+        f"{feedback}\n\n{cheer} You scored **{quiz['score']} out of {total}**.\n\n"
+        "Want to try a harder quiz, build a simple budget plan, or get some scam-safety tips next?"
+    )
+
+
+def quiz_reply(session_id: str | None, prompt: str, country: str = "") -> str | None:
+    """Answer quiz turns locally: a bare A-D answer to a running quiz, or a request
+    to start one. Anything else (e.g. "why?") returns None and goes to the model."""
+    if not session_id or not prompt:
+        return None
+    match = _ANSWER_RE.match(prompt)
+    if match:
+        return grade_answer(session_id, match.group(1))
+    if _START_RE.search(prompt):
+        lowered = prompt.lower()
+        topic = next((t for t in question_bank().topics if t in lowered or t.rstrip("s") in lowered), "")
+        difficulty = next((d for d in DIFFICULTIES if d in lowered), "")
+        return start_quiz(session_id, topic, difficulty, country)
+    return None
+
+
+# Quiz state is per session; without an id every visitor would share one quiz
+_NO_SESSION = "Quizzes aren't available here: there is no chat session to keep score in."
+
+
+class QuizTools(Toolkit):
+    """Quiz questions and grading from the local question bank."""
+
+    def __init__(self, **kwargs):
+        super().__init__(name="quiz_tools", **kwargs)
+        self.register(self.start_financial_quiz)
+        self.register(self.grade_quiz_answer)
+
+    def start_financial_quiz(self, topic: str = "", difficulty: str = "easy", country: str = "") -> str:
+        """Use this function to start a financial literacy quiz for the user. It returns the
+        first question exactly as it should be shown. Never write quiz questions yourself.
+
+        Args:
+            topic (str): One of budgeting, saving, scams, banking, credit, investing, side hustles, eccu. Empty for a mix.
+            difficulty (str): easy, medium or hard.
+            country (str): The user's country from the location context, for local questions.
+
+        Returns:
+            str: The quiz intro and first question.
+        """
+        session_id = current_session_id.get()
+        if not session_id:
+            return _NO_SESSION
+        return start_quiz(session_id, topic, difficulty, country)
+
+    def grade_quiz_answer(self, answer: str) -> str:
+        """Use this function to grade the user's A/B/C/D answer to the current quiz question.
+        Never grade quiz answers yourself.
+
+        Args:
+            answer (str): The letter the user chose: A, B, C or D.
+
+        Returns:
+            str: Feedback with the explanation, the score, and the next question or final result.
+        """
+        session_id = current_session_id.get()
+        if not session_id:
+            return _NO_SESSION
+        return grade_answer(session_id, answer) or "No quiz is running. Start one first."
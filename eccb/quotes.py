@@ -0,0 +1,185 @@
+# 📈 Batched stock quotes for the agent
+#
+# Ticker requests that arrive close together (several symbols in one tool
+# call, or parallel calls from other sessions) are merged into a single bulk
+# yfinance download and the results split back out per caller.
+import json
+import threading
+import time
+from concurrent.futures import Future
+
+from agno.tools import Toolkit
+
+QUOTE_BATCH_WINDOW = 0.05  # seconds to wait for more tickers before downloading
+QUOTE_MAX_BATCH = 50
+
+
+class QuoteBatcher:
+    """Coalesce per-ticker requests into bulk ``fetch_many(symbols, *params)`` calls.
+
+    The first caller of a batch waits ``window`` seconds for others to join,
+    then fetches every symbol requested so far in one round trip. Requests
+    with different ``params`` (e.g. period/interval) go in separate batches.
+    """
+
+    def __init__(self, fetch_many, window: float = QUOTE_BATCH_WINDOW, max_batch: int = QUOTE_MAX_BATCH):
+        self._fetch_many = fetch_many
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: dict[tuple, dict[str, Future]] = {}
+        self._lock = threading.Lock()
+        self.round_trips = 0
+        self.symbols_requested = 0
+
+    def get_many(self, symbols, params: tuple = ()) -> dict:
+        futures = {}
+        with self._lock:
+            batch = self._pending.get(params)
+            leader = batch is None
+            if leader:
+                batch = self._pending[params] = {}
+            for symbol in symbols:
+                futures[symbol] = batch.setdefault(symbol, Future())
+            self.symbols_requested += len(symbols)
+            full = len(batch) >= self.max_batch
+        if full:
+            self._flush(params)
+        elif leader:
+            time.sleep(self.window)
+            self._flush(params)
+        return {symbol: future.result() for symbol, future in futures.items()}
+
+    def _flush(self, params: tuple) -> None:
+        with self._lock:
+            batch = self._pending.pop(params, None)
+            if batch:
+                self.round_trips += 1
+        if not batch:
+            return  # someone else already sent it
+        try:
+            results = self._fetch_many(list(batch), *params)
+        except Exception as e:
+            for future in batch.values():
+                future.set_exception(e)
+            return
+        for symbol, future in batch.items():
+            future.set_result(results.get(symbol))
+
+
+def _split_symbols(symbols: str) -> list[str]:
+    seen = []
+    for symbol in symbols.replace(" ", ",").split(","):
+        symbol = symbol.strip().upper()
+        if symbol and symbol not in seen:
+            seen.append(symbol)
+    return seen
+
+
+def _frame_for(data, symbol: str):
+    """Per-ticker slice of a yf.download result (columns are (ticker, field) when grouped)."""
+    if getattr(data.columns, "nlevels", 1) > 1:
+        if symbol not in data.columns.get_level_values(0):
+            return None
+        return data[symbol]
+    return data
+
+
+def download_history(symbols: list[str], period: str = "1mo", interval: str = "1d") -> dict:
+    """One bulk yfinance download for all ``symbols``; {symbol: [{date, open, ...}]}."""
+    import yfinance as yf  # pulls in pandas; loaded on the first quote, not at startup
+
+    data = yf.download(
+        symbols, period=period, interval=interval, group_by="ticker",
+        auto_adjust=False, progress=False, threads=True,
+    )
+    results = {}
+    for symbol in symbols:
+        frame = _frame_for(data, symbol)
+        if frame is None:
+            continue
+        frame = frame.dropna(how="all")
+        if frame.empty:
+            continue
+        results[symbol] = [
+            {"date": str(index), **{str(k).lower(): (None if v != v else round(float(v), 4)) for k, v in row.items()}}
+            for index, row in frame.iterrows()
+        ]
+    return results
+
+
+def download_quotes(symbols: list[str]) -> dict:
+    """Latest close (and previous close) per symbol from a single 5-day bulk download."""
+    quotes = {}
+    for symbol, rows in download_history(symbols, period="5d", interval="1d").items():
+        closes = [row["close"] for row in rows if row.get("close") is not None]
+        if closes:
+            quotes[symbol] = {
+                "price": closes[-1],
+                "previous_close": closes[-2] if len(closes) > 1 else None,
+                "as_of": rows[-1]["date"],
+            }
+    return quotes
+
+
+_QUOTE_BATCHER = QuoteBatcher(download_quotes)
+_HISTORY_BATCHER = QuoteBatcher(download_history)
+
+
+class BulkQuoteTools(Toolkit):
+    """Stock quotes and price history for one or many tickers per call."""
+
+    def __init__(self, historical_prices: bool = True, **kwargs):
+        super().__init__(name="bulk_quote_tools", **kwargs)
+        self.register(self.get_current_stock_prices)
+        if historical_prices:
+            self.register(self.get_historical_stock_prices)
+
+    def get_current_stock_prices(self, symbols: str) -> str:
+        """Use this function to get the latest price of one or more stocks.
+        Pass every ticker you need in one call rather than calling once per ticker.
+
+        Args:
+            symbols (str): Comma-separated stock tickers, e.g. "AAPL,MSFT,GOOG".
+
+        Returns:
+            str: JSON mapping each ticker to its latest price, previous close and date.
+        """
+        tickers = _split_symbols(symbols)
+        if not tickers:
+            return "Error: no ticker symbols given"
+        try:
+            results = _QUOTE_BATCHER.get_many(tickers)
+        except Exception as e:
+            return f"Error fetching prices for {', '.join(tickers)}: {e}"
+        return json.dumps({t: results.get(t) or "no data" for t in tickers})
+
+    def get_historical_stock_prices(self, symbols: str, period: str = "1mo", interval: str = "1d") -> str:
+        """Use this function to get historical prices for one or more stocks.
+        Pass every ticker you need in one call rather than calling once per ticker.
+
+        Args:
+            symbols (str): Comma-separated stock tickers, e.g. "AAPL,MSFT".
+            period (str): 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd or max. Defaults to "1mo".
+            interval (str): 1d, 5d, 1wk, 1mo or 3mo. Defaults to "1d".
+
+        Returns:
+            str: JSON mapping each ticker to a list of OHLCV rows.
+        """
+        tickers = _split_symbols(symbols)
+        if not tickers:
+            return "Error: no ticker symbols given"
+        try:
+            results = _HISTORY_BATCHER.get_many(tickers, (period, interval))
+        except Exception as e:
+            return f"Error fetching historical prices for {', '.join(tickers)}: {e}"
+        return json.dumps({t: results.get(t) or "no data" for t in tickers})
+
+
+def quote_batch_stats() -> dict:
+    """Symbols requested vs. bulk downloads actually made."""
+    return {
+        "quote_symbols": _QUOTE_BATCHER.symbols_requested,
+        "quote_round_trips": _QUOTE_BATCHER.round_trips,
+        "history_symbols": _HISTORY_BATCHER.symbols_requested,
+        "history_round_trips": _HISTORY_BATCHER.round_trips,
+    }
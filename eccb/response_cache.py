@@ -0,0 +1,196 @@
+# 🧠 Near-duplicate answer cache for common opening questions
+#
+# "what is a budget", "What's a budget?" and "whats a budget exactly" should
+# not each pay for a model run. Questions are reduced to word and character
+# shingles, sketched with MinHash and bucketed with LSH (per persona), so a
+# lookup only compares against a handful of candidates. A candidate is served
+# when its Jaccard similarity clears the threshold and it hasn't expired.
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from eccb.coalesce import normalize_prompt
+
+RESPONSE_CACHE_THRESHOLD = float(os.getenv("RESPONSE_CACHE_THRESHOLD", "0.6"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", str(24 * 60 * 60)))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "2000"))
+
+_BANDS, _ROWS = 16, 4  # 64 hash functions; ~50% candidate rate at Jaccard 0.5, ~99% at 0.8
+_PRIME = (1 << 61) - 1
+_SEEDS = [
+    (int.from_bytes(hashlib.blake2b(b"a%d" % i, digest_size=8).digest(), "big") % _PRIME | 1,
+     int.from_bytes(hashlib.blake2b(b"b%d" % i, digest_size=8).digest(), "big") % _PRIME)
+    for i in range(_BANDS * _ROWS)
+]
+_WORD_RE = re.compile(r"[a-z0-9$%]+")
+_FILLER = frozenset(
+    "a an the is are am do does did i me my you your please can could would should tell exactly "
+    "really what whats how to about some explain mean means".split()
+)
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)*")
+# Character shingles barely notice a flipped meaning ("safe" vs "unsafe", "USD
+# to XCD" vs "XCD to USD"), so these words must match exactly for a hit
+_NEGATIONS = frozenset("not no never without nor dont doesnt didnt isnt arent wasnt cant cannot shouldnt wont".split())
+_POLAR = frozenset(
+    "safe unsafe risky dangerous good bad better worse best worst buy sell more less increase decrease "
+    "rise fall up down legit legal illegal".split()
+)
+_CURRENCIES = {
+    "usd": "USD", "us$": "USD", "xcd": "XCD", "ecd": "XCD", "ec": "XCD", "ec$": "XCD",
+    "eur": "EUR", "euro": "EUR", "euros": "EUR", "gbp": "GBP", "pound": "GBP", "pounds": "GBP",
+    "cad": "CAD", "ca$": "CAD", "ttd": "TTD", "tt$": "TTD", "bbd": "BBD", "bds$": "BBD",
+    "jmd": "JMD", "j$": "JMD", "jpy": "JPY", "yen": "JPY",
+}
+
+
+def shingles(question: str) -> frozenset:
+    """Content words, word bigrams and character 3-grams of the normalized question."""
+    words = [w for w in _WORD_RE.findall(normalize_prompt(question).replace("'", "")) if w not in _FILLER]
+    joined = " ".join(words)
+    grams = {joined[i:i + 3] for i in range(max(len(joined) - 2, 1))}
+    return frozenset(words) | {f"{a} {b}" for a, b in zip(words, words[1:])} | grams
+
+
+def guard(question: str) -> tuple:
+    """What must be identical for a hit: numbers, negation/polarity words and the ordered currency pair."""
+    words = _WORD_RE.findall(normalize_prompt(question).replace("'", ""))
+    polarity = frozenset(
+        w for w in words
+        if w in _NEGATIONS or w in _POLAR or (w.startswith(("un", "non")) and len(w) > 4 and not w.startswith(("under", "uni")))
+    )
+    currencies = tuple(_CURRENCIES[w] for w in words if w in _CURRENCIES)
+    return tuple(_NUMBER_RE.findall(question)), polarity, currencies
+
+
+def minhash(features: frozenset) -> tuple:
+    hashes = [int.from_bytes(hashlib.blake2b(f.encode(), digest_size=8).digest(), "big") for f in features]
+    if not hashes:
+        return ()
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _SEEDS)
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+class ResponseCache:
+    def __init__(self, threshold: float = RESPONSE_CACHE_THRESHOLD, ttl: float = RESPONSE_CACHE_TTL,
+                 maxsize: int = RESPONSE_CACHE_SIZE, clock=time.monotonic):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        # id -> (features, guard, bands, answer, expires)
+        self._entries: OrderedDict[int, tuple] = OrderedDict()
+        self._buckets: dict[tuple, set[int]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _bands(persona: str, signature: tuple) -> list[tuple]:
+        return [(persona, i, signature[i * _ROWS:(i + 1) * _ROWS]) for i in range(_BANDS)]
+
+    def _drop(self, entry_id: int) -> None:
+        _, _, bands, _, _ = self._entries.pop(entry_id)
+        for band in bands:
+            bucket = self._buckets.get(band)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[band]
+
+    def lookup(self, question: str, persona: str) -> str | None:
+        features = shingles(question)
+        signature = minhash(features)
+        if not signature:
+            return None
+        # "convert 100 USD" must never be answered with the reply for "convert 200 USD",
+        # nor "is it safe to..." with the one for "is it unsafe to..."
+        question_guard = guard(question)
+        now = self._clock()
+        with self._lock:
+            candidates = set()
+            for band in self._bands(persona, signature):
+                candidates |= self._buckets.get(band, set())
+            best, best_score = None, self.threshold
+            for entry_id in candidates:
+                cached_features, cached_guard, _, _, expires = self._entries[entry_id]
+                if expires <= now:
+                    self._drop(entry_id)
+                    continue
+                if cached_guard != question_guard:
+                    continue
+                score = jaccard(features, cached_features)
+                if score >= best_score:
+                    best, best_score = entry_id, score
+            if best is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best)
+            self.hits += 1
+            return self._entries[best][3]
+
+    def store(self, question: str, persona: str, answer: str) -> None:
+        features = shingles(question)
+        signature = minhash(features)
+        if not signature or not answer.strip():
+            return
+        bands = self._bands(persona, signature)
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (features, guard(question), bands, answer, self._clock() + self.ttl)
+            for band in bands:
+                self._buckets.setdefault(band, set()).add(entry_id)
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class ReplyStream:
+    """Streams a ready-made reply (cached or produced locally) as RunResponseContent-style events."""
+
+    needs_run_slot = False  # no model call involved
+
+    def __init__(self, answer: str, chunk_words: int = 8):
+        words = answer.split(" ")
+        self._chunks = iter(
+            " ".join(words[i:i + chunk_words]) + (" " if i + chunk_words < len(words) else "")
+            for i in range(0, len(words), chunk_words)
+        )
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return SimpleNamespace(event="RunResponseContent", content=next(self._chunks))
+
+    def close(self) -> None:
+        pass
+
+
+def answer_from_events(events) -> str | None:
+    """Full reply text of a finished run, or None if it used tools (live data, not cacheable)."""
+    parts = []
+    for event in events:
+        kind = getattr(event, "event", None)
+        if kind == "ToolCallStarted":
+            return None
+        if kind == "RunResponseContent" and getattr(event, "content", None):
+            parts.append(event.content)
+    return "".join(parts) or None
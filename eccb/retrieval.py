@@ -0,0 +1,110 @@
+# 🔎 Per-session lexical index over uploaded documents
+#
+# Uploaded PDFs/text files are split into overlapping chunks and added to a
+# BM25 inverted index as they arrive. Each question then sends only the top-k
+# matching chunks to the model instead of the whole document.
+import math
+import os
+import re
+from collections import Counter
+
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "4"))
+CHUNK_CHARS = 1200
+CHUNK_OVERLAP = 200
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.,][0-9]+)*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how i in is it its me my of on or "
+    "so that the this to was what when where which who why will with you your".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def chunk_text(text: str, size: int = CHUNK_CHARS, overlap: int = CHUNK_OVERLAP) -> list[str]:
+    """Split ``text`` into ~``size``-char chunks, preferring paragraph/line breaks."""
+    text = text.strip()
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            cut = max(text.rfind("\n\n", start + size // 2, end), text.rfind("\n", start + size // 2, end))
+            if cut == -1:
+                cut = text.rfind(" ", start + size // 2, end)
+            if cut != -1:
+                end = cut
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return chunks
+
+
+class DocumentIndex:
+    """BM25 over document chunks, built incrementally with ``add_document``."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.chunks: list[tuple[str, str]] = []  # (document name, chunk text)
+        self._lengths: list[int] = []
+        self._postings: dict[str, list[tuple[int, int]]] = {}  # term -> [(chunk id, tf)]
+        self._total_length = 0
+        self.documents: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def add_document(self, name: str, text: str) -> int:
+        """Index ``text`` under ``name``; returns the number of chunks added."""
+        pieces = chunk_text(text)
+        for piece in pieces:
+            chunk_id = len(self.chunks)
+            terms = tokenize(piece)
+            self.chunks.append((name, piece))
+            self._lengths.append(len(terms))
+            self._total_length += len(terms)
+            for term, tf in Counter(terms).items():
+                self._postings.setdefault(term, []).append((chunk_id, tf))
+        if pieces:
+            self.documents.append(name)
+        return len(pieces)
+
+    def search(self, query: str, k: int = RETRIEVAL_TOP_K) -> list[tuple[float, str, str]]:
+        """Top-``k`` (score, document name, chunk) for ``query``."""
+        n = len(self.chunks)
+        if not n:
+            return []
+        avg_len = self._total_length / n or 1.0
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for chunk_id, tf in postings:
+                norm = tf + self.k1 * (1 - self.b + self.b * self._lengths[chunk_id] / avg_len)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(score, *self.chunks[chunk_id]) for chunk_id, score in best]
+
+    def context_for(self, query: str, k: int = RETRIEVAL_TOP_K, fallback: bool = False) -> str:
+        """Prompt block with the chunks most relevant to ``query``.
+
+        With ``fallback`` (the turn that carries the upload) and no matching
+        terms, the opening chunks of the latest document are used instead;
+        otherwise an unrelated question gets no excerpts.
+        """
+        hits = [(name, chunk) for _, name, chunk in self.search(query, k)]
+        if not hits and fallback and self.documents:
+            latest = self.documents[-1]
+            hits = [c for c in self.chunks if c[0] == latest][:k]
+        if not hits:
+            return ""
+        blocks = [f"[{name}, excerpt {i}]\n{chunk}" for i, (name, chunk) in enumerate(hits, 1)]
+        return "\n\n**Relevant excerpts from your uploaded files:**\n" + "\n\n".join(blocks)
@@ -0,0 +1,210 @@
+# 🧭 Local intent router
+#
+# Every prompt is classified before it reaches the model. Word, bigram and
+# keyword features feed a small softmax classifier (multinomial logistic
+# regression) trained once per process on data/intent_examples.json. The
+# likely intents decide which toolkits the agent gets, so the model only sees
+# the tool schemas it may need. Quiz turns and bare "<amount> <CUR> to <CUR>"
+# conversions are answered by the local tools outright; scam signs found
+# locally are passed to the model as context, never instead of it.
+import functools
+import json
+import os
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+from pages.agent import ALL_TOOLSETS
+from eccb.currency import CURRENCY_ALIASES, FALLBACK_RATES, PEGGED_RATES, convert_many
+from eccb.quiz import _ANSWER_RE, quiz_reply
+from eccb.scams import scam_context, scan_text
+
+INTENT_EXAMPLES_FILE = os.getenv(
+    "INTENT_EXAMPLES_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "intent_examples.json"),
+)
+ROUTER_MIN_CONFIDENCE = float(os.getenv("ROUTER_MIN_CONFIDENCE", "0.4"))  # below this every toolkit is attached
+ROUTER_ALSO_LIKELY = 0.2  # other intents at least this likely get their toolkits too
+# "what are dividends" can look like small talk; unless the router is sure it
+# is, a chat turn keeps the general lookup tools
+ROUTER_CHAT_MIN_CONFIDENCE = float(os.getenv("ROUTER_CHAT_MIN_CONFIDENCE", "0.9"))
+
+# Toolkits each intent may need, by name (see TOOLKIT_SPECS in agent.py)
+TOOLSETS = {
+    "quiz": ("quiz",),
+    "budget": ("budget", "currency"),
+    "side_hustle": ("side_hustles",),
+    "currency": ("currency",),
+    "scam": ("scams", "web"),
+    "markets": ("quotes", "web"),
+    "news": ("news", "web"),
+    "knowledge": ("wikipedia", "web"),
+    "chat": (),
+}
+GENERAL_TOOLSETS = ("wikipedia", "web")  # for chat turns below ROUTER_CHAT_MIN_CONFIDENCE
+
+_WORD_RE = re.compile(r"[a-z0-9$€£%]+")
+_NUMBER_RE = re.compile(r"\d[\d,]*(?:\.\d+)?")
+_LINK_RE = re.compile(r"https?://|www\.|\b[a-z0-9-]+\.(?:com|ly|net|org|xyz|co)\b")
+_TICKER_RE = re.compile(r"\b[A-Z]{2,5}\b")
+
+# Currency mentions in a lowercased prompt, most specific first
+_CURRENCY_MENTIONS = [
+    (r"e\.?c\.?\s*\$|\bec\s*dollars?|eastern\s+caribbean\s+dollars?|\bxcd\b|\becd\b", "XCD"),
+    (r"\bus\s*\$|\bu\.?s\.?\s+dollars?|\bamerican\s+dollars?|\busd\b", "USD"),
+    (r"\bca\$|\bcanadian(?:\s+dollars?)?|\bcad\b", "CAD"),
+    (r"\btt\$|\btrini(?:dad)?\s+dollars?|\bttd\b", "TTD"),
+    (r"\bbds\$|\b(?:barbados|bajan)\s+dollars?|\bbbd\b", "BBD"),
+    (r"\bj\$|\bjamaican\s+dollars?|\bjmd\b", "JMD"),
+    (r"€|\beuros?\b|\beur\b", "EUR"),
+    (r"£|\bpounds?(?:\s+sterling)?\b|\bgbp\b", "GBP"),
+    (r"\byen\b|\bjpy\b", "JPY"),
+    (r"\b(?:" + "|".join(sorted({c.lower() for c in {**FALLBACK_RATES, **PEGGED_RATES}})) + r")\b", None),
+]
+_CURRENCY_RE = re.compile("|".join(f"(?P<c{i}>{p})" for i, (p, _) in enumerate(_CURRENCY_MENTIONS)))
+# Bare "ec"/"us" are ordinary words elsewhere; they only count as currencies inside _CONVERSION_RE
+_BARE_CURRENCIES = {"ec": "XCD", "us": "USD"}
+_CUR = "(?:" + "|".join(p for p, _ in _CURRENCY_MENTIONS) + r"|\bec\b|\bus\b)"
+_AMOUNT = r"\d[\d,]*(?:\.\d+)?"
+# The whole prompt must be a conversion request: "[convert] [EC$]100 [usd] to|in|into <CUR>"
+_CONVERSION_RE = re.compile(
+    r"\s*(?:please\s+)?(?:convert|change|exchange|how\s+much\s+is|what(?:'s|\s+is))?\s*"
+    rf"(?P<pre>{_CUR})?\s*(?P<amount>{_AMOUNT})\s*(?P<post>{_CUR})?"
+    rf"\s+(?:to|in|into)\s+(?P<target>{_CUR})\s*[?.!]*\s*"
+)
+_CURRENCY_WORDS = frozenset(
+    [c.lower() for c in {**FALLBACK_RATES, **PEGGED_RATES}]
+    + [a.lower() for a in CURRENCY_ALIASES if a.isalpha()]
+    + "ec dollar dollars euro euros pound pounds yen exchange convert".split()
+)
+
+
+def _currency_code(mention: str) -> str:
+    """ISO code for one currency mention matched by _CUR."""
+    match = _CURRENCY_RE.search(mention)
+    if match is None:
+        return _BARE_CURRENCIES[mention.strip()]
+    return _CURRENCY_MENTIONS[int(match.lastgroup[1:])][1] or match.group().upper()
+
+
+def features(text: str) -> list[str]:
+    """Words, word bigrams and a few keyword signals that generalise past the training phrases."""
+    lowered = text.lower()
+    # crude plural folding so "hustles" and "hustle" share a feature
+    words = [w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w for w in _WORD_RE.findall(lowered)]
+    found = ["bias"] + [f"w:{w}" for w in words] + [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+    if _NUMBER_RE.search(text):
+        found.append("kw:number")
+    if _CURRENCY_WORDS.intersection(words) or "$" in text or "€" in text or "£" in text:
+        found.append("kw:currency")
+    if _LINK_RE.search(lowered):
+        found.append("kw:link")
+    if _TICKER_RE.search(text):
+        found.append("kw:ticker")
+    if scan_text(text):
+        found.append("kw:scam_signal")
+    if _ANSWER_RE.match(text):
+        found.append("kw:quiz_answer")
+    if len(words) <= 3:
+        found.append("kw:short")
+    return found
+
+
+class IntentModel:
+    """Softmax regression over binary sparse features, trained with full-batch gradient descent."""
+
+    def __init__(self, examples: dict[str, list[str]], epochs: int = 300, learning_rate: float = 1.0,
+                 l2: float = 1e-4):
+        self.intents = list(examples)
+        rows = [(features(text), label) for label, texts in enumerate(examples.values()) for text in texts]
+        self.index = {}
+        for feats, _ in rows:
+            for f in feats:
+                self.index.setdefault(f, len(self.index))
+        x = np.zeros((len(rows), len(self.index)), np.float32)
+        for i, (feats, _) in enumerate(rows):
+            x[i, [self.index[f] for f in feats]] = 1.0
+        y = np.zeros((len(rows), len(self.intents)), np.float32)
+        y[np.arange(len(rows)), [label for _, label in rows]] = 1.0
+
+        weights = np.zeros((len(self.index), len(self.intents)), np.float32)
+        for _ in range(epochs):
+            probs = _softmax(x @ weights)
+            weights -= learning_rate * (x.T @ (probs - y) / len(rows) + l2 * weights)
+        self.weights = weights
+
+    def predict(self, text: str) -> dict[str, float]:
+        ids = [self.index[f] for f in features(text) if f in self.index]
+        probs = _softmax(self.weights[ids].sum(axis=0))
+        return dict(zip(self.intents, probs.tolist()))
+
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    scores = scores - scores.max(axis=-1, keepdims=True)
+    exp = np.exp(scores)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+@functools.lru_cache(maxsize=1)
+def intent_model() -> IntentModel:
+    with open(INTENT_EXAMPLES_FILE, encoding="utf-8") as f:
+        return IntentModel(json.load(f))
+
+
+@dataclass
+class Route:
+    intent: str
+    confidence: float
+    toolsets: tuple[str, ...]
+    reply: str | None = None  # answered locally; no model call needed
+    context: str | None = None  # local findings to append to the prompt for the model
+
+
+def conversion_reply(prompt: str) -> str | None:
+    """Answer prompts that are only a conversion, like "100 USD to XCD"; None for anything else."""
+    match = _CONVERSION_RE.fullmatch(prompt.lower())
+    if match is None or bool(match["pre"]) == bool(match["post"]):
+        return None
+    source, target = _currency_code(match["pre"] or match["post"]), _currency_code(match["target"])
+    if source == target:
+        return None
+    try:
+        result = convert_many([float(match["amount"].replace(",", ""))], source, target)
+    except ValueError:
+        return None
+    c = result["conversions"][0]
+    return (
+        f"💱 **{c['amount']:,.2f} {result['from']} = {c['converted']:,.2f} {result['to']}**\n"
+        f"\nRate: 1 {result['from']} = {result['rate']} {result['to']} ({result['source']})."
+    )
+
+
+def route_prompt(prompt: str, session_id: str | None = None, country: str = "", local: bool = True,
+                 scam_checked: bool = False) -> Route:
+    """Pick the toolkits for this turn, or answer it locally when ``local`` allows it.
+
+    ``prompt`` is the user's own text. Pass ``scam_checked`` when the caller
+    already scanned it and told the model, so the findings aren't added twice.
+    """
+    if local:
+        reply = quiz_reply(session_id, prompt, country)
+        if reply:
+            return Route("quiz", 1.0, (), reply)
+
+    probs = intent_model().predict(prompt)
+    ranked = sorted(probs.items(), key=lambda item: item[1], reverse=True)
+    intent, confidence = ranked[0]
+    context = None if scam_checked else scam_context(scan_text(prompt))
+    if confidence < ROUTER_MIN_CONFIDENCE:
+        return Route(intent, confidence, ALL_TOOLSETS, context=context)
+
+    if local and intent == "currency":
+        reply = conversion_reply(prompt)
+        if reply:
+            return Route(intent, confidence, (), reply)
+
+    wanted = {name for i, p in ranked if p >= ROUTER_ALSO_LIKELY for name in TOOLSETS[i]}
+    if intent == "chat" and confidence < ROUTER_CHAT_MIN_CONFIDENCE:
+        wanted.update(GENERAL_TOOLSETS)
+    return Route(intent, confidence, tuple(name for name in ALL_TOOLSETS if name in wanted), context=context)
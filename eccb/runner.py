@@ -0,0 +1,130 @@
+# 🧵 Agent runs on a background thread
+#
+# The Streamlit script thread only drains a bounded queue of stream events.
+# The run itself lives on a worker thread, so a newer prompt in the same
+# session can cancel it: the worker stops pulling from the model stream and
+# closes it, which ends the HTTP request instead of letting it burn tokens.
+import contextvars
+import os
+import queue
+import threading
+import time
+
+MAX_CONCURRENT_RUNS = int(os.getenv("MAX_CONCURRENT_RUNS", "8"))
+RUN_QUEUE_SIZE = int(os.getenv("RUN_QUEUE_SIZE", "256"))
+# A full queue nobody drains for this long means the page went away: give up the run
+RUN_STALL_TIMEOUT = float(os.getenv("RUN_STALL_TIMEOUT", "30"))
+
+# Which browser session the current run belongs to; tools read it to keep
+# per-session state (e.g. quiz scores) without touching st.session_state
+current_session_id: contextvars.ContextVar[str | None] = contextvars.ContextVar("current_session_id", default=None)
+
+# Process-wide cap on agent runs actually talking to the model
+_run_slots = threading.BoundedSemaphore(MAX_CONCURRENT_RUNS)
+_POLL = 0.25
+_DONE = object()
+
+
+def acquire_run_slot(cancelled: threading.Event) -> bool:
+    """Wait for a free model-run slot; False if ``cancelled`` is set first."""
+    while not cancelled.is_set():
+        if _run_slots.acquire(timeout=_POLL):
+            return True
+    return False
+
+
+def release_run_slot() -> None:
+    _run_slots.release()
+
+
+class _RunFailed:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class AgentRun:
+    """One agent stream, produced on a worker thread and consumed by iterating.
+
+    ``start_stream`` is called on the worker (inside a copy of the caller's
+    context variables) and must return the event iterator, e.g.
+    ``lambda: run_agent(messages, location=location)``. Iteration waits for a
+    run slot unless the stream sets ``needs_run_slot = False`` (streams that
+    replay another run's events don't talk to the model themselves).
+    """
+
+    def __init__(self, start_stream, queue_size: int = RUN_QUEUE_SIZE, stall_timeout: float = RUN_STALL_TIMEOUT):
+        self._start_stream = start_stream
+        self.stall_timeout = stall_timeout
+        self.events: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.cancelled = threading.Event()
+        self.finished = threading.Event()
+        context = contextvars.copy_context()
+        self._thread = threading.Thread(target=context.run, args=(self._work,), name="agent-run", daemon=True)
+
+    def start(self) -> "AgentRun":
+        self._thread.start()
+        return self
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+
+    def _put(self, item) -> bool:
+        # Bounded queue: block while the UI catches up, but never past a cancel
+        # or RUN_STALL_TIMEOUT without the consumer taking anything
+        deadline = time.monotonic() + self.stall_timeout
+        while not self.cancelled.is_set():
+            try:
+                self.events.put(item, timeout=_POLL)
+                return True
+            except queue.Full:
+                if time.monotonic() >= deadline:
+                    self.cancel()
+        return False
+
+    def _work(self) -> None:
+        acquired = False
+        try:
+            stream = self._start_stream()
+            try:
+                if getattr(stream, "needs_run_slot", True):
+                    acquired = acquire_run_slot(self.cancelled)
+                    if not acquired:
+                        return
+                for event in stream:
+                    if not self._put(event):
+                        break
+            finally:
+                close = getattr(stream, "close", None)
+                if close:
+                    close()
+        except Exception as e:
+            self._put(_RunFailed(e))
+        finally:
+            if acquired:
+                release_run_slot()
+            self.finished.set()
+            self._put(_DONE)
+
+    def __iter__(self):
+        while True:
+            try:
+                item = self.events.get(timeout=_POLL)
+            except queue.Empty:
+                if self.cancelled.is_set() or (self.finished.is_set() and self.events.empty()):
+                    return
+                continue
+            if item is _DONE:
+                return
+            if isinstance(item, _RunFailed):
+                raise item.error
+            yield item
+
+
+def start_session_run(session_state, start_stream) -> AgentRun:
+    """Start a run for this session, cancelling any run it still has going."""
+    previous = session_state.get("active_run")
+    if previous is not None:
+        previous.cancel()
+    run = AgentRun(start_stream).start()
+    session_state["active_run"] = run
+    return run
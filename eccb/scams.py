@@ -0,0 +1,212 @@
+# 🚨 Scam detector
+#
+# Every known scam phrase, suspicious-link pattern and ECCU-specific scheme is
+# one alternative of a single compiled regex with a named group per pattern,
+# so a scan is one left-to-right pass over the text however many patterns we
+# add. Runs on user messages and uploaded text before the model sees them.
+import re
+import string
+from dataclasses import dataclass
+
+from agno.tools import Toolkit
+
+# (category, what to tell the user, regex)
+SCAM_PATTERNS = [
+    # Advance-fee / prize
+    # A fee on its own is ordinary banking ("wire transfer fee 15.00"); it's a
+    # scam sign when it stands between the user and a payout.
+    ("advance fee", "Real prizes and payouts never ask you to pay a fee first.",
+     r"\b(?:processing|clearance|release|transfer|delivery|customs|handling|activation)\s+fees?\b[^.\n]{0,60}"
+     r"\b(?:to\s+(?:release|claim|unlock|collect)|(?:to\s+)?receive\s+your\s+(?:prize|winnings|reward|funds|inheritance)"
+     r"|prize|winnings|lottery|jackpot|inheritance|unclaimed)\b"
+     r"|\b(?:prize|winnings|lottery|jackpot|inheritance|unclaimed\s+funds)\b[^.\n]{0,60}"
+     r"\b(?:processing|clearance|release|transfer|delivery|customs|handling|activation)\s+fees?\b"),
+    ("prize", "You can't win a lottery or prize you never entered.",
+     r"\b(?:you(?:'ve| have)?\s+(?:won|been\s+selected)|claim\s+your\s+(?:prize|reward|winnings)|lucky\s+winner)\b"),
+    ("advance fee", "Inheritance and 'unclaimed funds' messages from strangers are a classic scam.",
+     r"\b(?:unclaimed\s+(?:funds|inheritance)|next\s+of\s+kin|beneficiary\s+of\s+(?:the\s+)?(?:sum|fund)|diplomatic\s+(?:courier|package))\b"),
+    # Credential phishing
+    ("phishing", "Your bank will never ask for your PIN, password or one-time code.",
+     r"\b(?:(?:send|share|give|confirm|verify|provide)\s+(?:me\s+|us\s+)?(?:your\s+)?(?:pin|password|otp|one[-\s]?time\s+(?:code|password)|verification\s+code|cvv|card\s+number))\b"),
+    ("phishing", "'Verify your account or it will be closed' is a pressure tactic.",
+     r"\b(?:your\s+(?:\w+\s+){0,2}account\s+(?:has\s+been\s+|will\s+be\s+|is\s+)?(?:suspended|locked|closed|deactivated)"
+     r"|account\s+will\s+be\s+(?:suspended|locked|closed|deactivated)\s+(?:unless|if|within|in\s+\d)"
+     r"|verify\s+your\s+(?:account|identity)\s+(?:now|immediately|within))\b"),
+    # Urgency and payment method are everyday words on their own ("pay my bill
+    # within 24 hours", "should I pay with crypto?"), so scan_text only reports
+    # them alongside a signal from another category (see _SUPPORTING).
+    ("urgency", "Scammers rush you so you don't stop to check.",
+     r"\b(?:act\s+now|urgent(?:ly)?\s+(?:action|response|payment)|within\s+24\s+hours|final\s+(?:notice|warning)|immediate(?:ly)?\s+(?:payment|action))\b"),
+    ("payment method", "Gift cards, wire transfers and crypto can't be reversed; scammers love them.",
+     r"\b(?:pay|payment|send)\b[^.\n]{0,40}\b(?:gift\s*cards?|itunes\s+cards?|google\s+play\s+cards?|western\s+union|moneygram|bitcoin|usdt|crypto)\b"),
+    # Investment / pyramid
+    ("investment", "Guaranteed high returns don't exist; that's how Ponzi schemes lure people in.",
+     r"\b(?:guaranteed\s+(?:returns?|profits?|income)\s+of\s+\d+|guaranteed\s+\d{1,3}\s*%"
+     r"|(?:double|triple)\s+your\s+money\s+in\s+(?:\d+|a|one|two|three)\s+(?:days?|weeks?|months?)\b"
+     r"|\d{2,3}\s*%\s+(?:returns?|profit|interest)\s+(?:a|per|every)\s+(?:day|week|month)\b)"),
+    ("pyramid", "Earning mainly by recruiting others is a pyramid scheme.",
+     r"\b(?:recruit\s+(?:\w+\s+){0,2}(?:people|friends|members)|blessing\s+loom|gifting\s+circle|pay\s+it\s+forward\s+(?:circle|loom)|cash\s+flow\s+(?:circle|loom)|join\s+(?:our|the)\s+(?:investment|trading)\s+(?:club|group))\b"),
+    ("crypto", "Crypto 'account managers' and trading bots promising profits are common scams.",
+     r"\b(?:crypto\s+(?:account\s+)?manager|trading\s+bot|mining\s+(?:investment|pool)\s+(?:returns?|profits?)|forex\s+(?:signals?|mentor)\s+(?:guaranteed|profits?))\b"),
+    # Jobs / romance / charity
+    ("job", "Legit employers don't charge you to get hired.",
+     r"\b(?:registration|training|uniform|visa|work\s+permit)\s+fee\b[^.\n]{0,40}\b(?:job|position|employment|hire)\b|\bwork\s+from\s+home\b[^.\n]{0,40}\bearn\s+\$?\d"),
+    ("romance", "Never send money to someone you've only met online.",
+     r"\b(?:stuck\s+(?:at|in)\s+(?:the\s+)?(?:airport|customs)|need\s+money\s+for\s+(?:a\s+)?(?:ticket|flight|hospital)|my\s+love[^.\n]{0,40}\bsend\b)"),
+    ("charity", "After storms, fake relief funds appear; give through known organisations only.",
+     r"\b(?:hurricane|disaster|volcano|flood)\s+relief\s+(?:fund|donation)\b[^.\n]{0,60}\b(?:send|donate|transfer)\b"),
+    # ECCU-specific
+    # Naming the ECCB is fine ("explain the ECCB grant program"); offering
+    # the user money in its name is not.
+    ("impersonation", "The ECCB doesn't run lotteries, grants or give-aways to individuals.",
+     r"\b(?:eccb|eastern\s+caribbean\s+central\s+bank)\b[^.\n]{0,60}"
+     r"\b(?:you(?:'ve|\s+have)?\s+(?:won|been\s+(?:selected|awarded|approved|chosen))|claim\s+your|congratulations|lucky\s+winner)\b"
+     r"|\b(?:you(?:'ve|\s+have)?\s+(?:won|been\s+(?:selected|awarded|approved|chosen))|claim\s+your|congratulations)\b[^.\n]{0,60}"
+     r"\b(?:eccb|eastern\s+caribbean\s+central\s+bank)\b"),
+    ("impersonation", "DCash/wallet 'verification' requests asking for your PIN are fake.",
+     r"\b(?:dcash|d-cash|digital\s+ec)\b[^.\n]{0,60}\b(?:verify|verification|pin|upgrade|reactivate)\b"),
+    ("citizenship", "Use only government-licensed CBI agents; 'fast-track passports' sold online are scams.",
+     r"\b(?:fast[-\s]?track|guaranteed|cheap|discount(?:ed)?)\s+(?:citizenship|passport|cbi)\b|\bcitizenship\s+by\s+investment\b[^.\n]{0,60}\b(?:discount|guaranteed|no\s+due\s+diligence)\b"),
+    ("property", "Overseas land deals: verify the title at the land registry before paying anything.",
+     r"\b(?:land|lot|property)\b[^.\n]{0,40}\b(?:deposit|pay)\b[^.\n]{0,40}\b(?:before\s+(?:viewing|you\s+see)|wire|western\s+union|no\s+lawyer)\b"),
+    ("remittance", "Nobody legit charges a fee to release a remittance or barrel.",
+     r"\b(?:remittance|barrel|package|parcel)\b[^.\n]{0,40}\b(?:held|on\s+hold|release|clearance)\b[^.\n]{0,40}\bfee\b"),
+    # Suspicious links
+    ("link", "Links to bare IP addresses are almost never legitimate.",
+     r"\bhttps?://\d{1,3}(?:\.\d{1,3}){3}\b"),
+    ("link", "Shortened links hide where they really go.",
+     r"\b(?:bit\.ly|tinyurl\.com|t\.co|is\.gd|cutt\.ly|rb\.gy|shorturl\.at|tiny\.cc)/\S+"),
+    ("link", "Internationalised (xn--) domains can imitate real bank names.",
+     r"\bxn--[a-z0-9-]+\.[a-z]{2,}"),
+    ("link", "Banks don't send you to cheap throwaway domains.",
+     r"\bhttps?://[^\s/]+\.(?:xyz|top|click|zip|mov|buzz|rest|cam|quest|icu|sbs|cfd)\b"),
+    ("link", "The real site is the part right before the first '/', not the brand name at the front.",
+     r"\bhttps?://(?:[a-z0-9-]+\.)*(?:paypal|bank|eccb|dcash|western-?union|amazon|apple|microsoft|netflix)[a-z0-9-]*\.(?:com|org|net)\.[a-z0-9-]+\.[a-z]{2,}"),
+    ("link", "Look-alike spellings (paypa1, amaz0n) are used in phishing links.",
+     r"\b(?:paypa1|payp4l|amaz0n|app1e|micr0soft|netfl1x|g00gle|faceb00k)\b"),
+]
+
+# Wrapped in a lookahead so the scan advances one position at a time: a signal
+# starting inside another one ("processing fee" inside "pay the processing fee
+# via Western Union") is still reported. Every pattern starts on a word
+# boundary, so checking that first skips most positions cheaply.
+_SCAM_RE = re.compile(
+    r"\b(?=" + "|".join(f"(?P<p{i}>{pattern})" for i, (_, _, pattern) in enumerate(SCAM_PATTERNS)) + ")",
+    re.IGNORECASE,
+)
+
+
+# Python's re tries every alternative at every position, so scanning long
+# clean text is dominated by that cost. Words at least one pattern needs act as
+# a prefilter: text is scanned in overlapping blocks and the regex only runs on
+# blocks containing one of these words (a set lookup per word, at C speed).
+_TRIGGER_WORDS = frozenset("""
+    fee fees won winner selected claim prize reward unclaimed kin beneficiary diplomatic
+    winnings lottery jackpot inheritance congratulations awarded approved chosen
+    pin password otp one-time code verification cvv card suspended locked closed deactivated verify
+    act urgent urgently 24 final immediate immediately
+    gift giftcard giftcards itunes play western moneygram bitcoin usdt crypto
+    guaranteed double triple risk risk-free
+    recruit loom circle club group bot mining forex home stuck need love relief
+    eccb eastern dcash d-cash digital citizenship passport cbi land lot property
+    remittance barrel package parcel http https ly tinyurl co gd cutt gy shorturl cc
+    paypa1 payp4l amaz0n app1e micr0soft netfl1x g00gle faceb00k
+""".split())
+_TRIGGER_SUBSTRINGS = ("xn--", "%")
+_WORD_SPLIT = str.maketrans({c: " " for c in string.punctuation if c not in "-%"})
+_BLOCK = 1024
+_OVERLAP = 256  # longer than any single match we care about
+
+
+def _has_trigger(block: str) -> bool:
+    if not _TRIGGER_WORDS.isdisjoint(block.translate(_WORD_SPLIT).split()):
+        return True
+    return any(sub in block for sub in _TRIGGER_SUBSTRINGS)
+
+
+# Only reported when a signal from another category is also present
+_SUPPORTING = {"urgency", "payment method"}
+
+
+@dataclass
+class ScamHit:
+    category: str
+    advice: str
+    match: str
+    count: int = 1
+
+
+def scan_text(text: str) -> list[ScamHit]:
+    """All scam signals in ``text``, one entry per pattern with its first match."""
+    hits: dict[int, ScamHit] = {}
+    lowered = text.lower()
+    for start in range(0, len(text), _BLOCK):
+        stop = start + _BLOCK
+        # The trigger window runs past the block so a signal starting near its
+        # end still has its keyword in view; matches are only taken from
+        # starts inside the block, so blocks never double count.
+        if not _has_trigger(lowered[start:stop + _OVERLAP]):
+            continue
+        for found in _SCAM_RE.finditer(text, start, stop + _OVERLAP):
+            if found.start() >= stop:
+                break
+            index = int(found.lastgroup[1:])
+            if index in hits:
+                hits[index].count += 1
+            else:
+                category, advice, _ = SCAM_PATTERNS[index]
+                hits[index] = ScamHit(category, advice, found.group(found.lastgroup)[:120])
+    if all(hit.category in _SUPPORTING for hit in hits.values()):
+        return []
+    return list(hits.values())
+
+
+def merge_hits(*groups: list[ScamHit]) -> list[ScamHit]:
+    """Combine hits from several scans, one entry per pattern with the counts added."""
+    merged: dict[tuple[str, str], ScamHit] = {}
+    for hits in groups:
+        for hit in hits:
+            key = (hit.category, hit.advice)
+            if key in merged:
+                merged[key].count += hit.count
+            else:
+                merged[key] = ScamHit(hit.category, hit.advice, hit.match, hit.count)
+    return list(merged.values())
+
+
+def scam_warning(hits: list[ScamHit]) -> str:
+    """Markdown warning listing each signal once."""
+    lines = [f"- **{hit.category.title()}** (\"{hit.match}\"): {hit.advice}" for hit in hits]
+    return "🚨 **Possible scam signs found:**\n" + "\n".join(lines)
+
+
+def scam_context(hits: list[ScamHit], warned: bool = False) -> str | None:
+    """Note appended to the user's message so the model builds on the local findings."""
+    if not hits:
+        return None
+    found = ", ".join(f"{hit.category} (\"{hit.match}\")" for hit in hits)
+    follow_up = "The user has already been warned." if warned else "Point these out to the user."
+    return f"\n\n[Scam check found: {found}. {follow_up}]"
+
+
+class ScamCheckTools(Toolkit):
+    """Local scam-signal scanner for messages, links and documents."""
+
+    def __init__(self, **kwargs):
+        super().__init__(name="scam_check_tools", **kwargs)
+        self.register(self.check_for_scams)
+
+    def check_for_scams(self, text: str) -> str:
+        """Use this function to check a message, link or offer for common scam signs,
+        including ECCU-specific schemes. Use it whenever the user asks if something is a scam.
+
+        Args:
+            text (str): The message, link or offer text to check.
+
+        Returns:
+            str: The scam signals found with advice for each, or a note that none were found.
+        """
+        hits = scan_text(text)
+        if not hits:
+            return "No known scam patterns found. That doesn't prove it's safe; verify the sender through an official channel."
+        return scam_warning(hits)
@@ -0,0 +1,195 @@
+# 💼 Side-hustle recommender
+#
+# Ideas come from data/side_hustles.json, loaded once per process into
+# inverted indexes on country, skill, season and startup cost. A
+# recommendation is a few set intersections plus a score over the handful of
+# candidates left, so the model only has to add the persona's wording.
+import bisect
+import calendar
+import functools
+import heapq
+import json
+import os
+from collections import defaultdict
+from datetime import date
+
+from agno.tools import Toolkit
+
+SIDE_HUSTLES_FILE = os.getenv(
+    "SIDE_HUSTLES_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "side_hustles.json"),
+)
+TOP_K = 5
+UPCOMING_MONTHS = 2  # a season starting this soon is worth preparing for now
+
+# Festivals from the country tone guide and the months the spending happens
+FESTIVALS = {
+    "Antigua and Barbuda": [("Antigua Carnival / Wadadli Day", [7, 8]), ("Sailing Week", [4, 5])],
+    "Dominica": [("Mas Domnik carnival", [2]), ("World Creole Music Festival", [10])],
+    "Grenada": [("Spicemas", [8]), ("Sailing Festival", [1])],
+    "Saint Kitts and Nevis": [("Sugar Mas", [12, 1]), ("Culturama", [7, 8])],
+    "Saint Lucia": [("Saint Lucia Carnival", [7]), ("Jounen Kwéyòl", [10])],
+    "Saint Vincent and the Grenadines": [("Vincymas", [6, 7]), ("Nine Mornings", [12])],
+    "Anguilla": [("Summer Festival", [8]), ("Moonsplash", [3])],
+    "Montserrat": [("St. Patrick's Festival", [3]), ("Festival", [12, 1])],
+}
+DEFAULT_FESTIVAL_MONTHS = [2, 8]
+
+# Seasons that don't depend on the country
+SEASON_MONTHS = {
+    "tourism": [12, 1, 2, 3, 4],
+    "christmas": [11, 12],
+    "back_to_school": [8, 9],
+    "hurricane": [6, 7, 8, 9, 10, 11],
+}
+SEASON_LABELS = {
+    "tourism": "tourist season",
+    "christmas": "Christmas",
+    "back_to_school": "back-to-school",
+    "hurricane": "hurricane season",
+}
+
+SKILL_ALIASES = {
+    "cook": "cooking", "chef": "cooking", "food": "cooking", "bake": "baking", "baker": "baking",
+    "sew": "sewing", "seamstress": "sewing", "tailor": "sewing", "hairdressing": "hair", "braiding": "hair",
+    "photo": "photography", "photographer": "photography", "camera": "photography", "videography": "video",
+    "editing": "video", "instagram": "social media", "tiktok": "social media", "marketing": "social media",
+    "programming": "coding", "web design": "coding", "it": "computers", "tech": "computers",
+    "teaching": "tutoring", "teacher": "tutoring", "maths": "math", "singing": "music", "guitar": "music",
+    "steelpan": "music", "drive": "driving", "driver": "driving", "car": "driving", "sailing": "boating",
+    "boat": "boating", "fish": "fishing", "farm": "farming", "agriculture": "farming", "garden": "gardening",
+    "craft": "crafts", "jewellery": "crafts", "jewelry": "crafts", "drawing": "art", "painting": "art",
+    "graphic design": "design", "selling": "sales", "sell": "sales", "woodwork": "carpentry",
+    "mechanic": "mechanics", "electrician": "electrical", "babysitting": "childcare", "kids": "childcare",
+    "dogs": "pet care", "pets": "pet care", "gym": "fitness", "sports": "fitness", "guide": "tour guiding",
+    "tourism": "tour guiding", "french": "languages", "spanish": "languages", "kweyol": "languages",
+    "bartender": "bartending", "mixology": "bartending", "events": "event planning", "party planning": "event planning",
+    "cleaner": "cleaning", "housekeeping": "cleaning",
+}
+
+
+def normalize_skill(skill: str) -> str:
+    skill = " ".join(str(skill).lower().split())
+    return SKILL_ALIASES.get(skill, SKILL_ALIASES.get(skill.rstrip("s"), skill))
+
+
+@functools.lru_cache(maxsize=256)
+def active_seasons(country: str, month: int) -> dict[str, tuple[int, str]]:
+    """Season -> (months until it starts, reason text) for seasons on now or
+    within UPCOMING_MONTHS. Only 12 months x a few countries, so it's cached.
+    Treat the result as read-only: it is shared between callers."""
+    active = {"all_year": (0, "steady all year")}
+    festivals = FESTIVALS.get(country) or [("carnival season", DEFAULT_FESTIVAL_MONTHS)]
+    windows = [("festival", name, months) for name, months in festivals]
+    windows += [(season, SEASON_LABELS[season], months) for season, months in SEASON_MONTHS.items()]
+    for season, label, months in windows:
+        ahead = min((m - month) % 12 for m in months)
+        if ahead <= UPCOMING_MONTHS and (season not in active or ahead < active[season][0]):
+            when = "is on now" if ahead == 0 else f"starts in {ahead} month{'s' if ahead > 1 else ''}"
+            active[season] = (ahead, f"{label} {when}")
+    return active
+
+
+class HustleCatalog:
+    def __init__(self, hustles: list[dict]):
+        self.hustles = {h["id"]: h for h in hustles}
+        self.by_country = defaultdict(set)  # "" = works anywhere
+        self.by_skill = defaultdict(set)
+        self.by_season = defaultdict(set)
+        for h in hustles:
+            for country in h.get("countries") or [""]:
+                self.by_country[country].add(h["id"])
+            for skill in h["skills"]:
+                self.by_skill[skill].add(h["id"])
+            for season in h["seasons"]:
+                self.by_season[season].add(h["id"])
+        # Startup cost index: ids sorted by cost, so "affordable" is a bisect
+        by_cost = sorted(hustles, key=lambda h: h["cost_xcd"])
+        self._costs = [h["cost_xcd"] for h in by_cost]
+        self._ids_by_cost = [h["id"] for h in by_cost]
+
+    def affordable(self, budget: float) -> set[str]:
+        return set(self._ids_by_cost[: bisect.bisect_right(self._costs, budget)])
+
+    def recommend(self, skills: list[str] | None = None, budget: float | None = None, country: str = "",
+                  month: int | None = None, k: int = TOP_K) -> list[tuple[dict, list[str]]]:
+        """Top ``k`` hustles with the reasons each one fits, best first."""
+        wanted = {normalize_skill(s) for s in skills or [] if str(s).strip()}
+        candidates = self.by_country[""] | self.by_country.get(country, set())
+        if budget is not None:
+            candidates &= self.affordable(budget)
+        seasons = active_seasons(country, month or date.today().month)
+        skill_hits = defaultdict(list)
+        for skill in sorted(wanted):
+            for hustle_id in self.by_skill.get(skill, ()):
+                skill_hits[hustle_id].append(skill)
+
+        scored = []
+        for hustle_id in candidates:
+            h = self.hustles[hustle_id]
+            reasons = []
+            score = 0.0
+            matched = skill_hits.get(hustle_id)
+            if matched:
+                score += 3 * len(matched)
+                reasons.append("uses your " + ", ".join(matched) + " skills")
+            elif wanted:
+                score -= 2
+            if country and country in (h.get("countries") or []):
+                score += 2
+                reasons.append(f"popular in {country}")
+            timing = min((seasons[s] for s in h["seasons"] if s in seasons and s != "all_year"), default=None)
+            if timing is not None:
+                score += 2 if timing[0] == 0 else 1
+                reasons.append(timing[1])
+            elif "all_year" in h["seasons"]:
+                reasons.append(seasons["all_year"][1])
+            score -= h["cost_xcd"] / 2000  # cheaper to start breaks ties
+            scored.append((score, hustle_id, reasons))
+        return [(self.hustles[i], reasons) for _, i, reasons in heapq.nlargest(k, scored)]
+
+
+@functools.lru_cache(maxsize=1)
+def hustle_catalog() -> HustleCatalog:
+    with open(SIDE_HUSTLES_FILE, encoding="utf-8") as f:
+        return HustleCatalog(json.load(f))
+
+
+def recommendation_table(recommendations: list[tuple[dict, list[str]]]) -> str:
+    lines = ["| Side hustle | Startup cost | Typical earnings | Why it fits | First step |", "|---|---|---|---|---|"]
+    for h, reasons in recommendations:
+        cost = f"EC${h['cost_xcd']:,}" if h["cost_xcd"] else "free"
+        lines.append(f"| {h['name']} | {cost} | {h['earning']} | {'; '.join(reasons) or 'low-risk start'} | {h['first_step']} |")
+    return "\n".join(lines)
+
+
+class SideHustleTools(Toolkit):
+    """Side-hustle ideas ranked from the local catalog by skills, budget, country and season."""
+
+    def __init__(self, **kwargs):
+        super().__init__(name="side_hustle_tools", **kwargs)
+        self.register(self.recommend_side_hustles)
+
+    def recommend_side_hustles(self, skills: list[str] | None = None, budget_xcd: float | None = None,
+                               country: str = "", top_k: int = TOP_K) -> str:
+        """Use this function to recommend side hustles. Always use it instead of inventing ideas;
+        present its table in the user's tone without changing the costs or earnings.
+
+        Args:
+            skills (list[str]): What the user is good at or enjoys, e.g. ["cooking", "social media"].
+            budget_xcd (float): The most the user can spend to start, in EC$. Omit if unknown.
+            country (str): The user's country from the location context.
+            top_k (int): How many ideas to return. Defaults to 5.
+
+        Returns:
+            str: A markdown table of ranked ideas with cost, earnings, why each fits and a first step.
+        """
+        try:
+            budget = float(budget_xcd) if budget_xcd is not None else None
+            recommendations = hustle_catalog().recommend(skills, budget, country or "", k=max(1, min(int(top_k), 10)))
+        except (ValueError, TypeError) as e:
+            return f"Error recommending side hustles: {e}"
+        if not recommendations:
+            return "No side hustles in the catalog fit that budget. Suggest starting with a free skill-based service."
+        month = calendar.month_name[date.today().month]
+        return f"Side hustles ranked for {country or 'the user'} in {month}:\n\n" + recommendation_table(recommendations)
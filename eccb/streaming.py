@@ -0,0 +1,53 @@
+# 🎞️ Frame-rate limited rendering of streamed replies
+#
+# Every placeholder.markdown() call re-sends and re-renders the whole reply,
+# so redrawing on every chunk is quadratic in reply length. ReplyRenderer
+# merges chunks and redraws at most ``fps`` times a second, or sooner once
+# ``flush_chars`` new characters have piled up.
+import os
+import time
+
+RENDER_FPS = float(os.getenv("RENDER_FPS", "10"))
+RENDER_FLUSH_CHARS = int(os.getenv("RENDER_FLUSH_CHARS", "2000"))
+
+
+class ReplyRenderer:
+    def __init__(self, placeholder, cursor: str = "● ", fps: float = RENDER_FPS,
+                 flush_chars: int = RENDER_FLUSH_CHARS, clock=time.monotonic):
+        self.placeholder = placeholder
+        self.cursor = cursor
+        self.interval = 1.0 / fps if fps > 0 else 0.0
+        self.flush_chars = flush_chars
+        self._clock = clock
+        self._text = ""
+        self._rendered_len = 0
+        self._last_flush = float("-inf")
+        self.renders = 0
+        self.rendered_chars = 0
+
+    def update(self, text: str) -> None:
+        """Record the reply so far; redraw only if a frame is due."""
+        self._text = text
+        if (
+            self._clock() - self._last_flush >= self.interval
+            or len(text) - self._rendered_len >= self.flush_chars
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Draw pending text now, e.g. before showing a tool-call indicator."""
+        if self._text and len(self._text) != self._rendered_len:
+            self._draw(self._text + self.cursor)
+            self._rendered_len = len(self._text)
+        self._last_flush = self._clock()
+
+    def finish(self, text: str) -> None:
+        """Final draw without the cursor; always happens."""
+        self._text = text
+        self._draw(text)
+        self._rendered_len = len(text)
+
+    def _draw(self, markdown: str) -> None:
+        self.placeholder.markdown(markdown)
+        self.renders += 1
+        self.rendered_chars += len(markdown)
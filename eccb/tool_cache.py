@@ -0,0 +1,127 @@
+# ⏱️ Cross-session cache for agent tool results
+#
+# Wraps each toolkit function's entrypoint in place, keeping its name,
+# signature and docstring, so the tool schemas the model sees don't change.
+# Identical calls within a tool's TTL are served from memory, and identical
+# calls already in flight wait for the first one instead of going out again.
+import functools
+import os
+import threading
+from concurrent.futures import Future
+
+from eccb.cache import TTLCache
+
+# Seconds to keep each tool's results. Quotes go stale fast; reference data doesn't.
+TOOL_TTLS = {
+    # YFinanceTools / BulkQuoteTools
+    "get_current_stock_price": 30,
+    "get_current_stock_prices": 30,
+    "get_historical_stock_prices": 15 * 60,
+    "get_technical_indicators": 15 * 60,
+    "get_company_news": 10 * 60,
+    "get_analyst_recommendations": 60 * 60,
+    "get_stock_fundamentals": 60 * 60,
+    "get_key_financial_ratios": 6 * 60 * 60,
+    "get_income_statements": 6 * 60 * 60,
+    "get_company_info": 6 * 60 * 60,
+    # Search
+    "duckduckgo_search": 10 * 60,
+    "duckduckgo_news": 5 * 60,
+    "google_search": 10 * 60,
+    # HackerNewsTools
+    "get_top_hackernews_stories": 5 * 60,
+    "get_user_details": 60 * 60,
+    # WikipediaTools
+    "search_wikipedia": 6 * 60 * 60,
+}
+DEFAULT_TOOL_TTL = 5 * 60
+# Search-style tools, where "Caribbean News" and "caribbean news" are the same
+# query. Everything else keeps its case: usernames, tickers and ids can differ by it.
+CASE_FOLDED_TOOLS = frozenset({"duckduckgo_search", "duckduckgo_news", "google_search", "search_wikipedia"})
+
+_RESULTS = TTLCache(maxsize=int(os.getenv("TOOL_CACHE_SIZE", "2048")), ttl=DEFAULT_TOOL_TTL)
+_inflight: dict[tuple, Future] = {}
+_inflight_lock = threading.Lock()
+_coalesced = 0
+
+
+def _normalize(value, fold_case: bool = False):
+    if isinstance(value, str):
+        value = " ".join(value.split())
+        return value.casefold() if fold_case else value
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v, fold_case) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _normalize(v, fold_case)) for k, v in value.items()))
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value if isinstance(value, (int, bool, type(None))) else repr(value)
+
+
+def _is_cacheable(result) -> bool:
+    return not (isinstance(result, str) and result.lstrip().lower().startswith("error"))
+
+
+def call_cached(tool_name: str, fn, args: tuple, kwargs: dict, ttl: float, fold_case: bool = False):
+    """Run ``fn`` at most once per normalized (tool, args) within ``ttl``.
+
+    Arguments are compared with whitespace collapsed, and case-insensitively
+    only with ``fold_case``.
+    """
+    global _coalesced
+    key = (tool_name, _normalize(args, fold_case), _normalize(kwargs, fold_case))
+    cached = _RESULTS.get(key)
+    if cached is not None:
+        return cached
+
+    with _inflight_lock:
+        pending = _inflight.get(key)
+        if pending is None:
+            pending = _inflight[key] = Future()
+            leader = True
+        else:
+            _coalesced += 1
+            leader = False
+    if not leader:
+        return pending.result()
+
+    try:
+        result = fn(*args, **kwargs)
+    except BaseException as e:
+        pending.set_exception(e)
+        raise
+    else:
+        if _is_cacheable(result):
+            _RESULTS.set(key, result, ttl=ttl)
+        pending.set_result(result)
+        return result
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def cached_tool(tool_name: str, fn, ttl: float | None = None):
+    """``fn`` wrapped with the shared result cache; looks like ``fn`` to agno."""
+    ttl = TOOL_TTLS.get(tool_name, DEFAULT_TOOL_TTL) if ttl is None else ttl
+    fold_case = tool_name in CASE_FOLDED_TOOLS
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return call_cached(tool_name, fn, args, kwargs, ttl, fold_case)
+
+    wrapper.tool_cached = True
+    return wrapper
+
+
+def cache_toolkit(toolkit, ttls: dict | None = None):
+    """Route every function of an agno ``toolkit`` through the cache, in place."""
+    ttls = ttls or {}
+    for name, function in toolkit.functions.items():
+        if function.entrypoint is not None and not getattr(function.entrypoint, "tool_cached", False):
+            function.entrypoint = cached_tool(name, function.entrypoint, ttls.get(name))
+    return toolkit
+
+
+def tool_cache_stats() -> dict:
+    """Result-cache counters plus calls that piggybacked on an in-flight call."""
+    return {**_RESULTS.stats(), "coalesced": _coalesced}
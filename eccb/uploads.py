@@ -0,0 +1,281 @@
+# 📄 Text extraction for uploaded files
+#
+# Kept free of Streamlit imports: large PDFs are split into page ranges and
+# extracted in worker processes that import this module.
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "0")) or None
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "0")) or None
+# Below this many pages a process pool costs more than it saves
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "48"))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+
+UPLOAD_CACHE_DIR = os.getenv("UPLOAD_CACHE_DIR", os.path.join(tempfile.gettempdir(), "eccb-upload-cache"))
+UPLOAD_CACHE_DISK_BYTES = int(os.getenv("UPLOAD_CACHE_DISK_BYTES", str(256 * 1024 * 1024)))
+UPLOAD_CACHE_MEMORY_BYTES = int(os.getenv("UPLOAD_CACHE_MEMORY_BYTES", str(32 * 1024 * 1024)))
+
+
+class ExtractionCache:
+    """Extracted upload text keyed by a hash of the upload bytes.
+
+    Two tiers: an in-process LRU bounded by text size, and a directory of
+    ``<digest>.txt`` files bounded by total size, evicting the least recently
+    used file (mtime is bumped on every hit). The directory is private to
+    this user (0700) and each file is written 0600, since uploads can hold
+    bank statements and the default directory is under the shared /tmp.
+    """
+
+    def __init__(self, directory: str, disk_bytes: int, memory_bytes: int):
+        self.directory = directory
+        self.disk_bytes = disk_bytes
+        self.memory_bytes = memory_bytes
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._memory_size = 0
+        self._disk_size = None  # scanned lazily on first write
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bytes_saved = 0  # upload bytes we did not have to parse again
+
+    @staticmethod
+    def key(data: bytes, kind: str, options=()) -> str:
+        digest = hashlib.sha256(data)
+        digest.update(repr((kind, options)).encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.txt")
+
+    def _remember(self, key: str, text: str) -> None:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return
+        self._memory[key] = text
+        self._memory_size += len(text)
+        while self._memory_size > self.memory_bytes and len(self._memory) > 1:
+            _, dropped = self._memory.popitem(last=False)
+            self._memory_size -= len(dropped)
+
+    def get(self, key: str, source_bytes: int = 0) -> str | None:
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                self.bytes_saved += source_bytes
+                return text
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                text = f.read()
+            os.utime(self._path(key))
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self._remember(key, text)
+            self.disk_hits += 1
+            self.bytes_saved += source_bytes
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        with self._lock:
+            self._remember(key, text)
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            # makedirs leaves an existing directory alone; fails if someone else owns it
+            os.chmod(self.directory, 0o700)
+            tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with open(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            try:  # a concurrent extraction of the same upload may have written it already
+                replaced = os.path.getsize(self._path(key))
+            except OSError:
+                replaced = 0
+            os.replace(tmp_path, self._path(key))
+            self._evict_disk(os.path.getsize(self._path(key)) - replaced)
+        except OSError as e:
+            print(f"Upload cache write failed: {e}")
+
+    def _evict_disk(self, added: int) -> None:
+        with self._lock:
+            if self._disk_size is None:
+                self._disk_size = sum(e.stat().st_size for e in os.scandir(self.directory) if e.name.endswith(".txt"))
+            else:
+                self._disk_size += added
+            if self._disk_size <= self.disk_bytes:
+                return
+            entries = sorted(
+                (e for e in os.scandir(self.directory) if e.name.endswith(".txt")),
+                key=lambda e: e.stat().st_mtime,
+            )
+            for entry in entries:
+                if self._disk_size <= self.disk_bytes:
+                    break
+                size = entry.stat().st_size
+                try:
+                    os.remove(entry.path)
+                    self._disk_size -= size
+                except OSError:
+                    pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "bytes_saved": self.bytes_saved,
+                "memory_bytes": self._memory_size,
+                "disk_bytes": self._disk_size,
+            }
+
+
+_EXTRACTION_CACHE = ExtractionCache(UPLOAD_CACHE_DIR, UPLOAD_CACHE_DISK_BYTES, UPLOAD_CACHE_MEMORY_BYTES)
+
+
+def upload_cache_stats() -> dict:
+    """Hit-rate and bytes-saved counters of the extracted-text cache."""
+    return _EXTRACTION_CACHE.stats()
+
+_worker_reader = None
+
+
+def _init_worker(data: bytes) -> None:
+    import PyPDF2
+
+    global _worker_reader
+    _worker_reader = PyPDF2.PdfReader(io.BytesIO(data))
+
+
+def _extract_range(page_range: tuple[int, int]) -> list[str]:
+    start, stop = page_range
+    return [(_worker_reader.pages[i].extract_text() or "") for i in range(start, stop)]
+
+
+def _read_bytes(file) -> bytes:
+    return file.getvalue() if hasattr(file, "getvalue") else file.read()
+
+
+def _iter_pages(reader, data: bytes, total: int, workers: int):
+    if workers < 2 or total < PDF_PARALLEL_MIN_PAGES:
+        for i in range(total):
+            yield reader.pages[i].extract_text() or ""
+        return
+
+    # Small ranges so the first pages come back quickly for progress updates
+    step = max(4, min(32, total // (workers * 4)))
+    ranges = [(start, min(start + step, total)) for start in range(0, total, step)]
+    pool = ProcessPoolExecutor(workers, mp_context=get_context("spawn"), initializer=_init_worker, initargs=(data,))
+    try:
+        for texts in pool.map(_extract_range, ranges):
+            yield from texts
+    finally:
+        # Hitting a page/char cap shouldn't wait for ranges nobody will read
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_pdf_pages(pdf_file, max_pages: int | None = None, max_chars: int | None = None,
+                   workers: int | None = None, progress=None):
+    """Yield the text of each page in order, one page at a time.
+
+    Stops after ``max_pages`` pages, or after the page that brings the total
+    past ``max_chars`` characters. PDFs with at least ``PDF_PARALLEL_MIN_PAGES``
+    pages are extracted in a process pool, page ranges in parallel, still
+    yielded in page order. ``progress(pages_done, total_pages)`` is called
+    after each page.
+    """
+    import PyPDF2  # deferred: only PDF uploads pay for the parser
+
+    data = pdf_file if isinstance(pdf_file, bytes) else _read_bytes(pdf_file)
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    total = min(len(reader.pages), max_pages) if max_pages else len(reader.pages)
+    pages = _iter_pages(reader, data, total, PDF_WORKERS if workers is None else workers)
+    size = 0
+    try:
+        for done, page_text in enumerate(pages, 1):
+            yield page_text
+            size += len(page_text) + 1
+            if progress:
+                progress(done, total)
+            if max_chars and size >= max_chars:
+                return
+    finally:
+        pages.close()  # shuts the pool down when the caller stops early
+
+
+# Function to extract text from PDF files
+def extract_pdf_text(pdf_file, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS, progress=None, workers=None,
+                     use_cache=True):
+    """
+    Extract text content from a PDF file using PyPDF2
+
+    Args:
+        pdf_file: Uploaded file object from Streamlit (or raw bytes in a BytesIO)
+        max_pages: Stop after this many pages (None for all)
+        max_chars: Stop once this many characters are extracted (None for no cap)
+        progress: Optional callback(pages_done, total_pages) for UI updates
+        workers: Worker processes for large PDFs (default PDF_WORKERS, 1 = serial)
+        use_cache: Look up and store the result in the extracted-text cache
+
+    Returns:
+        str: Extracted text content from the PDF
+    """
+    try:
+        # Same bytes, same caps -> same text; skip parsing entirely on a repeat upload
+        data = _read_bytes(pdf_file)
+        cache_key = _EXTRACTION_CACHE.key(data, "pdf", (max_pages, max_chars))
+        cached = _EXTRACTION_CACHE.get(cache_key, len(data)) if use_cache else None
+        if cached is not None:
+            return cached
+
+        pages = iter_pdf_pages(data, max_pages, max_chars, workers, progress)
+        text_content = "\n".join(pages).strip()
+        if max_chars:
+            text_content = text_content[:max_chars]
+        if use_cache:
+            _EXTRACTION_CACHE.put(cache_key, text_content)
+        return text_content
+    except Exception as e:
+        return f"Error reading PDF: {str(e)}"
+
+
+# Function to read text from other file types
+def read_text_file(file):
+    """
+    Read text content from various file types
+
+    Args:
+        file: Uploaded file object from Streamlit
+
+    Returns:
+        str: File content as text
+    """
+    data = file.read()
+    cache_key = _EXTRACTION_CACHE.key(data, "text")
+    cached = _EXTRACTION_CACHE.get(cache_key, len(data))
+    if cached is not None:
+        return cached
+
+    try:
+        # Try to decode as UTF-8 first
+        content = data.decode('utf-8')
+    except UnicodeDecodeError:
+        try:
+            # Try with different encoding if UTF-8 fails
+            content = data.decode('latin-1')
+        except Exception as e:
+            return f"Error reading file: {str(e)}"
+    _EXTRACTION_CACHE.put(cache_key, content)
+    return content
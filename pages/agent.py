@@ -1,15 +1,26 @@
+import functools
+import importlib
+import ipaddress
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeout, as_completed
+from typing import TYPE_CHECKING
+
 import requests
 import streamlit as st
 
-from agno.agent import Agent
-from agno.models.openrouter import OpenRouter
-from agno.media import Image
-from agno.tools.duckduckgo import DuckDuckGoTools
-from agno.tools.yfinance import YFinanceTools
-from agno.tools.googlesearch import GoogleSearchTools
-from agno.tools.hackernews import HackerNewsTools
-from agno.tools.wikipedia import WikipediaTools
+from eccb.cache import TTLCache
+from eccb.coalesce import coalesce_key, coalesced
+from eccb.ip_ranges import IPRangeIndex, load_ip_ranges
+from eccb.response_cache import ReplyStream, ResponseCache, answer_from_events
+from eccb.runner import current_session_id
+from eccb.tool_cache import cache_toolkit
+
+# agno, the toolkits and the router (numpy, yfinance, ...) take seconds to
+# import, so they load on first use or in warm_up(), never on the first paint.
+if TYPE_CHECKING:
+    from agno.agent import Agent
 
 
 # 🛡️ Setup API key (either from environment or hardcoded here)
@@ -82,49 +93,73 @@ COUNTRY_TONE = {
     },
 }
 
-INSTRUCTION_TEMPLATE = """
+# 🧱 The system prompt is laid out for provider-side prompt-prefix caching:
+# a static prefix that is byte-identical for every user, then one of a few
+# persona blocks (all built at import), and the per-user location last.
+INSTRUCTION_PREFIX = """
 You are a helpful, youth-friendly Financial AI Agent focused on the Eastern Caribbean Currency Union (ECCU) but able to serve anyone globally.
 
 Core capabilities (MUST use tools when applicable):
-- Detect and warn about common scams
+- Detect and warn about common scams (check suspicious messages, links and offers with the scam check tool)
 - Host interactive financial literacy quizzes (one question at a time)
-- Recommend personalized side hustles
+- Recommend personalized side hustles (rank them with the side hustle tool, then add your own wording)
 - Perform currency conversion using tools
-- Create custom budget plans using tool-based inputs
+- Create custom budget plans using tool-based inputs (the budget tool does all the arithmetic)
 
 Important rules:
 - Always use available tools for the above tasks; do not fabricate financial facts.
 - Be concise, positive, and practical. Show small, actionable steps.
-- If the user is in an ECCU country, adapt tone, slang, and examples accordingly.
+- If the user is in an ECCU country (see the location context), adapt tone, slang, and examples accordingly.
 - If the user is not in an ECCU country, respond with a friendly, generic global tone.
 
-Location context (from app):
+Examples to mirror when applicable:
+- Dominica: "What would you do with $50 from selling dasheen?"
+- Antigua and Barbuda: "Let’s budget your Wadadli Day income."
+
+Quiz style:
+- Use the quiz tools to start quizzes and grade answers; never write or grade quiz questions yourself.
+- Keep it fun; give feedback after each answer; track score playfully.
+- Offer next-step actions after the quiz (budgeting, side hustles, scam tips).
+"""
+
+PERSONA_TEMPLATE = """
+Persona guidelines:
+{persona_guidelines}
+"""
+
+LOCATION_TEMPLATE = """Location context (from app):
 - country: {country}
 - region: {region}
 - city: {city}
 - latitude: {latitude}
 - longitude: {longitude}
 - is_eccu: {is_eccu}
+"""
 
-Persona guidelines:
-{persona_guidelines}
 
-Examples to mirror when applicable:
-- Dominica: "What would you do with $50 from selling dasheen?"
-- Antigua and Barbuda: "Let’s budget your Wadadli Day income."
+GEO_HEADERS = {"User-Agent": "Mozilla/5.0 (Streamlit App)"}
+# Total time budget for all providers together, not per provider
+GEO_DEADLINE = float(os.getenv("GEO_DEADLINE", "4"))
 
-Quiz style:
-- Keep it fun; give feedback after each answer; track score playfully.
-- Offer next-step actions after the quiz (budgeting, side hustles, scam tips).
-"""
+# 🗃️ Process-wide location cache keyed by client IP, shared by all sessions.
+# Failed lookups are cached too, but only briefly, so a provider outage
+# doesn't turn every page load into a full round of timeouts.
+_LOCATION_CACHE = TTLCache(
+    maxsize=int(os.getenv("GEO_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("GEO_CACHE_TTL", "21600")),
+)
+GEO_NEGATIVE_TTL = float(os.getenv("GEO_NEGATIVE_TTL", "60"))
 
+# 📦 Optional local IP-range file (RIR delegated export or CSV), checked before
+# any remote provider. Only ECCU ranges are kept in memory.
+GEO_IP_RANGES_FILE = os.getenv(
+    "GEO_IP_RANGES_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "ip_ranges.txt"),
+)
 
-def detect_user_location() -> dict:
-    """Detect user location robustly via multiple providers and cache it."""
-    if "user_location" in st.session_state:
-        return st.session_state.user_location
 
-    location = {
+def _empty_location() -> dict:
+    return {
         "country": None,
         "region": None,
         "city": None,
@@ -133,111 +168,270 @@ def detect_user_location() -> dict:
         "is_eccu": False,
     }
 
-    def _normalize_country(country_name: str | None, country_code: str | None) -> str | None:
-        if country_name:
-            return country_name
-        if country_code and country_code in ECCU_COUNTRY_CODES:
-            return ECCU_COUNTRY_CODES[country_code]
-        return country_name or country_code
-
-    def _finalize(loc: dict) -> dict:
-        country_name = loc.get("country")
-        if isinstance(country_name, str) and len(country_name) == 2 and country_name.isalpha():
-            mapped = ECCU_COUNTRY_CODES.get(country_name.upper())
-            if mapped:
-                loc["country"] = mapped
-        if loc.get("country") in ECCU_COUNTRIES:
-            loc["is_eccu"] = True
-        st.session_state.user_location = loc
-        if os.getenv("DEBUG_LOCATION"):
-            print(loc)
-        return loc
-
-    headers = {"User-Agent": "Mozilla/5.0 (Streamlit App)"}
-    providers = ["ipapi", "ipwhois", "ipapi_alt", "ipinfo"]
-
-    for provider in providers:
+
+def _normalize_country(country_name: str | None, country_code: str | None) -> str | None:
+    if country_name:
+        return country_name
+    if country_code and country_code in ECCU_COUNTRY_CODES:
+        return ECCU_COUNTRY_CODES[country_code]
+    return country_name or country_code
+
+
+def _finalize(loc: dict) -> dict:
+    """Map 2-letter ECCU codes to country names and set the is_eccu flag."""
+    country_name = loc.get("country")
+    if isinstance(country_name, str) and len(country_name) == 2 and country_name.isalpha():
+        mapped = ECCU_COUNTRY_CODES.get(country_name.upper())
+        if mapped:
+            loc["country"] = mapped
+    if loc.get("country") in ECCU_COUNTRIES:
+        loc["is_eccu"] = True
+    if os.getenv("DEBUG_LOCATION"):
+        print(loc)
+    return loc
+
+
+# 🛰️ Provider parsers: raw JSON -> location dict, or None if the answer is unusable
+def _parse_ipapi(data: dict) -> dict | None:
+    country_name = _normalize_country(data.get("country_name"), data.get("country"))
+    if not (country_name or data.get("city")):
+        return None
+    location = _empty_location()
+    location["country"] = country_name
+    location["region"] = data.get("region")
+    location["city"] = data.get("city")
+    location["latitude"] = data.get("latitude")
+    location["longitude"] = data.get("longitude")
+    return location
+
+
+def _parse_ipwhois(data: dict) -> dict | None:
+    if not data.get("success"):
+        return None
+    location = _empty_location()
+    location["country"] = _normalize_country(data.get("country"), data.get("country_code"))
+    location["region"] = data.get("region")
+    location["city"] = data.get("city")
+    location["latitude"] = data.get("latitude")
+    location["longitude"] = data.get("longitude")
+    if any([location["country"], location["city"], location["region"]]):
+        return location
+    return None
+
+
+def _parse_ipapi_alt(data: dict) -> dict | None:
+    if data.get("status") != "success":
+        return None
+    location = _empty_location()
+    location["country"] = _normalize_country(data.get("country"), data.get("countryCode"))
+    location["region"] = data.get("regionName")
+    location["city"] = data.get("city")
+    location["latitude"] = data.get("lat")
+    location["longitude"] = data.get("lon")
+    return location
+
+
+def _parse_ipinfo(data: dict) -> dict | None:
+    location = _empty_location()
+    loc_str = data.get("loc")
+    if isinstance(loc_str, str) and "," in loc_str:
+        lat_str, lon_str = loc_str.split(",", 1)
         try:
-            if provider == "ipapi":
-                resp = requests.get("https://ipapi.co/json/", timeout=8, headers=headers)
-                if resp.ok:
-                    data = resp.json()
-                    country_name = _normalize_country(data.get("country_name"), data.get("country"))
-                    if country_name or data.get("city"):
-                        location["country"] = country_name
-                        location["region"] = data.get("region")
-                        location["city"] = data.get("city")
-                        location["latitude"] = data.get("latitude")
-                        location["longitude"] = data.get("longitude")
-                        return _finalize(location)
-
-            if provider == "ipwhois":
-                resp = requests.get("https://ipwho.is/", timeout=8, headers=headers)
-                if resp.ok:
-                    data = resp.json()
-                    if data.get("success"):
-                        location["country"] = _normalize_country(data.get("country"), data.get("country_code"))
-                        location["region"] = data.get("region")
-                        location["city"] = data.get("city")
-                        location["latitude"] = data.get("latitude")
-                        location["longitude"] = data.get("longitude")
-                        if any([location["country"], location["city"], location["region"]]):
-                            return _finalize(location)
-
-            if provider == "ipapi_alt":
-                resp = requests.get("https://ip-api.com/json/", timeout=8, headers=headers)
-                if resp.ok:
-                    data = resp.json()
-                    if data.get("status") == "success":
-                        location["country"] = _normalize_country(data.get("country"), data.get("countryCode"))
-                        location["region"] = data.get("regionName")
-                        location["city"] = data.get("city")
-                        location["latitude"] = data.get("lat")
-                        location["longitude"] = data.get("lon")
-                        return _finalize(location)
-
-            if provider == "ipinfo":
-                resp = requests.get("https://ipinfo.io/json", timeout=8, headers=headers)
-                if resp.ok:
-                    data = resp.json()
-                    loc_str = data.get("loc")
-                    if isinstance(loc_str, str) and "," in loc_str:
-                        lat_str, lon_str = loc_str.split(",", 1)
-                        try:
-                            location["latitude"] = float(lat_str)
-                            location["longitude"] = float(lon_str)
-                        except Exception:
-                            pass
-                    location["country"] = _normalize_country(None, data.get("country"))
-                    location["region"] = data.get("region")
-                    location["city"] = data.get("city")
-                    if any([location["country"], location["city"], location["region"]]):
-                        return _finalize(location)
-                    
+            location["latitude"] = float(lat_str)
+            location["longitude"] = float(lon_str)
         except Exception:
-            print(f"Location provider {provider} failed or returned no data.")
-            continue
-    print(f"Location provider {provider} failed or returned no data.")
+            pass
+    location["country"] = _normalize_country(None, data.get("country"))
+    location["region"] = data.get("region")
+    location["city"] = data.get("city")
+    if any([location["country"], location["city"], location["region"]]):
+        return location
+    return None
+
+
+# (name, url, parser) — queried all at once by resolve_location_concurrently.
+# "/{ip}" is dropped when we don't know the client IP, which makes the
+# provider answer for the address the request comes from instead.
+GEO_PROVIDERS = [
+    ("ipapi", "https://ipapi.co/{ip}/json/", _parse_ipapi),
+    ("ipwhois", "https://ipwho.is/{ip}", _parse_ipwhois),
+    ("ipapi_alt", "https://ip-api.com/json/{ip}", _parse_ipapi_alt),
+    ("ipinfo", "https://ipinfo.io/{ip}/json", _parse_ipinfo),
+]
+
+
+def _provider_url(template: str, ip: str | None) -> str:
+    if ip:
+        return template.format(ip=ip)
+    return template.replace("/{ip}", "")
+
+
+def _client_ip() -> str | None:
+    """Public IP of the browser behind this session, if Streamlit exposes one."""
+    try:
+        headers = st.context.headers
+        forwarded = headers.get("X-Forwarded-For") or headers.get("X-Real-Ip")
+        candidate = forwarded.split(",")[0].strip() if forwarded else getattr(st.context, "ip_address", None)
+    except Exception:
+        return None
+    try:
+        return candidate if candidate and ipaddress.ip_address(candidate).is_global else None
+    except ValueError:
+        return None
+
+
+@functools.lru_cache(maxsize=1)
+def _offline_index() -> IPRangeIndex | None:
+    if not os.path.exists(GEO_IP_RANGES_FILE):
+        return None
+    try:
+        return load_ip_ranges(GEO_IP_RANGES_FILE, countries=ECCU_COUNTRY_CODES)
+    except Exception as e:
+        print(f"Could not load IP ranges from {GEO_IP_RANGES_FILE}: {e}")
+        return None
+
+
+def resolve_location_offline(ip: str | None) -> dict | None:
+    """Resolve ECCU client IPs from the local range file, without any network call."""
+    index = _offline_index()
+    if not ip or index is None:
+        return None
+    country_code = index.lookup(ip)
+    if not country_code:
+        return None
+    location = _empty_location()
+    location["country"] = country_code
     return _finalize(location)
 
 
-def build_persona_guidelines(location: dict) -> str:
-    country = location.get("country") or ""
-    if location.get("is_eccu"):
-        if country in COUNTRY_TONE:
-            tone = COUNTRY_TONE[country]
-            return (
-                f"- Start with a localized greeting (e.g., '{tone['greeting']}').\n"
-                f"- Use culturally relevant examples (e.g., {tone['example']}).\n"
-                f"- Light slang allowed: {', '.join(tone['slang'])}. Keep it respectful and clear.\n"
-                f"- Use EC$ (XCD) where currency appears; convert with tools if needed."
-            )
+def _query_provider(name: str, url: str, parser, timeout: float, cancelled: threading.Event) -> dict | None:
+    if cancelled.is_set():
+        return None
+    with requests.Session() as session:
+        resp = session.get(url, timeout=timeout, headers=GEO_HEADERS, stream=True)
+        try:
+            if cancelled.is_set() or not resp.ok:
+                return None
+            data = resp.json()
+        finally:
+            resp.close()
+    if not isinstance(data, dict):
+        return None
+    return parser(data)
+
+
+def resolve_location_concurrently(providers=None, deadline: float | None = None, ip: str | None = None) -> dict | None:
+    """Query all geo providers in parallel and return the first usable answer.
+
+    Gives up after ``deadline`` seconds in total. Slower providers are
+    abandoned once a winner is found: queued requests are cancelled and the
+    in-flight ones have their responses dropped without reading the body.
+    """
+    providers = GEO_PROVIDERS if providers is None else providers
+    deadline = GEO_DEADLINE if deadline is None else deadline
+    if not providers:
+        return None
+
+    cancelled = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=len(providers), thread_name_prefix="geo")
+    futures = {
+        executor.submit(_query_provider, name, _provider_url(url, ip), parser, deadline, cancelled): name
+        for name, url, parser in providers
+    }
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            try:
+                location = future.result()
+            except Exception:
+                location = None
+            if location:
+                return _finalize(location)
+            print(f"Location provider {futures[future]} failed or returned no data.")
+    except FuturesTimeout:
+        print(f"Location lookup gave up after {deadline:.1f}s.")
+    finally:
+        cancelled.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+    return None
+
+
+# Lookups in flight, by cache key: sessions from the same IP that miss the
+# cache together wait for one provider race instead of starting their own.
+_location_inflight: dict[str, Future] = {}
+_location_inflight_lock = threading.Lock()
+
+
+def _resolve_location_once(cache_key: str, ip: str | None) -> dict:
+    with _location_inflight_lock:
+        pending = _location_inflight.get(cache_key)
+        leader = pending is None
+        if leader:
+            pending = _location_inflight[cache_key] = Future()
+    if not leader:
+        return pending.result()
+
+    try:
+        location = resolve_location_offline(ip) or resolve_location_concurrently(ip=ip)
+        if location:
+            _LOCATION_CACHE.set(cache_key, location)
         else:
-            return (
-                "- Use a warm ECCU tone with light island slang where natural.\n"
-                "- Use examples around carnival gigs, market day sales, tourism tips.\n"
-                "- Prefer EC$ (XCD) and show small-step savings and investing."
-            )
+            location = _finalize(_empty_location())
+            _LOCATION_CACHE.set(cache_key, location, ttl=GEO_NEGATIVE_TTL)
+    except BaseException as e:
+        pending.set_exception(e)
+        raise
+    else:
+        pending.set_result(location)
+        return location
+    finally:
+        with _location_inflight_lock:
+            _location_inflight.pop(cache_key, None)
+
+
+def detect_user_location() -> dict:
+    """Detect user location robustly via multiple providers and cache it."""
+    if "user_location" in st.session_state:
+        return st.session_state.user_location
+
+    ip = _client_ip()
+    cache_key = ip or "self"
+    location = _LOCATION_CACHE.get(cache_key)
+    if location is None:
+        location = _resolve_location_once(cache_key, ip)
+
+    # Each session gets its own copy so per-session edits never leak into the cache
+    st.session_state.user_location = dict(location)
+    return st.session_state.user_location
+
+
+def location_cache_stats() -> dict:
+    """Hit/miss counters of the shared location cache."""
+    return _LOCATION_CACHE.stats()
+
+
+def persona_key(location: dict) -> str:
+    """Which persona block a location gets: its ECCU country, "eccu" or "global"."""
+    if location.get("is_eccu"):
+        country = location.get("country") or ""
+        return country if country in COUNTRY_TONE else "eccu"
+    return "global"
+
+
+def _persona_guidelines(key: str) -> str:
+    if key in COUNTRY_TONE:
+        tone = COUNTRY_TONE[key]
+        return (
+            f"- Start with a localized greeting (e.g., '{tone['greeting']}').\n"
+            f"- Use culturally relevant examples (e.g., {tone['example']}).\n"
+            f"- Light slang allowed: {', '.join(tone['slang'])}. Keep it respectful and clear.\n"
+            f"- Use EC$ (XCD) where currency appears; convert with tools if needed."
+        )
+    if key == "eccu":
+        return (
+            "- Use a warm ECCU tone with light island slang where natural.\n"
+            "- Use examples around carnival gigs, market day sales, tourism tips.\n"
+            "- Prefer EC$ (XCD) and show small-step savings and investing."
+        )
     return (
         "- Use a neutral global tone.\n"
         "- Avoid local slang.\n"
@@ -245,37 +439,259 @@ def build_persona_guidelines(location: dict) -> str:
     )
 
 
-def build_instructions(location: dict) -> str:
-    persona = build_persona_guidelines(location)
-    return INSTRUCTION_TEMPLATE.format(
+PERSONA_GUIDELINES = {key: _persona_guidelines(key) for key in [*COUNTRY_TONE, "eccu", "global"]}
+# Agent instructions per persona: the shared prefix plus that persona's block
+PERSONA_INSTRUCTIONS = {
+    key: INSTRUCTION_PREFIX + PERSONA_TEMPLATE.format(persona_guidelines=guidelines)
+    for key, guidelines in PERSONA_GUIDELINES.items()
+}
+
+
+def build_persona_guidelines(location: dict) -> str:
+    return PERSONA_GUIDELINES[persona_key(location)]
+
+
+def location_context(location: dict) -> str:
+    """The only per-user part of the system prompt, sent after everything cacheable."""
+    return LOCATION_TEMPLATE.format(
         country=location.get("country"),
         region=location.get("region"),
         city=location.get("city"),
         latitude=location.get("latitude"),
         longitude=location.get("longitude"),
         is_eccu=location.get("is_eccu"),
-        persona_guidelines=persona,
     )
 
 
-def agent(message, image=None, location=None):
-    instructions = build_instructions(location or {})
-    _agent = Agent(
+def build_instructions(location: dict) -> str:
+    """The full system prompt for ``location``, as the model sees it."""
+    return PERSONA_INSTRUCTIONS[persona_key(location)] + "\n" + location_context(location)
+
+
+MODEL_ID = "google/gemini-2.5-flash"
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")  # e.g. a proxy or benchmarks/fake_openrouter.py
+
+# 🔌 One keep-alive connection pool for every model client in the process,
+# so turns and sessions reuse warm TLS connections to OpenRouter.
+@functools.lru_cache(maxsize=1)
+def _http_client():
+    import httpx
+
+    return httpx.Client(
+        timeout=httpx.Timeout(120.0, connect=10.0),
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    )
+
+
+# 🧰 Toolkits by the names the intent router uses (see TOOLSETS in eccb/router.py):
+# (module, class, kwargs, cache remote results across sessions)
+TOOLKIT_SPECS = {
+    "web": [
+        ("agno.tools.duckduckgo", "DuckDuckGoTools", {}, True),
+        ("agno.tools.googlesearch", "GoogleSearchTools", {}, True),
+    ],
+    "quotes": [("eccb.quotes", "BulkQuoteTools", {"historical_prices": True}, True)],
+    "news": [("agno.tools.hackernews", "HackerNewsTools", {}, True)],
+    "wikipedia": [("agno.tools.wikipedia", "WikipediaTools", {}, True)],
+    # local and deterministic, nothing to cache
+    "budget": [("eccb.budget", "BudgetTools", {}, False)],
+    "currency": [("eccb.currency", "CurrencyTools", {}, False)],
+    "quiz": [("eccb.quiz", "QuizTools", {}, False)],
+    "scams": [("eccb.scams", "ScamCheckTools", {}, False)],
+    "side_hustles": [("eccb.side_hustles", "SideHustleTools", {}, False)],
+}
+ALL_TOOLSETS = tuple(TOOLKIT_SPECS)
+# Toolsets whose results depend only on their arguments. A turn may be shared
+# with other sessions (coalesced or served from the response cache) only if
+# every toolset it gets is listed here; quiz keeps per-session state.
+SHAREABLE_TOOLSETS = frozenset({"web", "quotes", "news", "wikipedia", "budget", "currency", "scams", "side_hustles"})
+
+
+@functools.lru_cache(maxsize=None)
+def _toolkits(name: str) -> list:
+    """The toolkits for one toolset name, imported and built the first time it is attached.
+
+    They only hold configuration, so all agents share one set; results from
+    remote services go through the cross-session tool cache.
+    """
+    toolkits = []
+    for module, cls, kwargs, remote in TOOLKIT_SPECS[name]:
+        toolkit = getattr(importlib.import_module(module), cls)(**kwargs)
+        toolkits.append(cache_toolkit(toolkit) if remote else toolkit)
+    return toolkits
+
+
+def _build_agent(key: tuple[str, tuple[str, ...]]) -> "Agent":
+    from agno.agent import Agent
+    from agno.models.openrouter import OpenRouter
+
+    persona, toolsets = key
+    return Agent(
         name="💼 Financial AI Agent",
-        model=OpenRouter(id="google/gemini-2.5-flash", api_key=api_key, max_tokens=8000),
-        tools=[
-            DuckDuckGoTools(),
-            YFinanceTools(historical_prices=True),
-            GoogleSearchTools(),
-            HackerNewsTools(),
-            WikipediaTools(),
-        ],
-        tool_choice="auto",
-        instructions=instructions,
+        model=OpenRouter(
+            id=MODEL_ID, api_key=api_key, base_url=OPENROUTER_BASE_URL, max_tokens=8000, http_client=_http_client()
+        ),
+        tools=[toolkit for name in toolsets for toolkit in _toolkits(name)],
+        tool_choice="auto" if toolsets else None,
+        instructions=PERSONA_INSTRUCTIONS[persona],
         add_history_to_messages=True,
     )
 
-    if image:
-        image = [Image(filepath=image)]
 
-    return _agent.run(message=message, images=image, stream=True)
+class AgentPool:
+    """Idle, ready-to-run agents grouped by persona and toolsets.
+
+    An agent is checked out for exactly one run at a time, so concurrent
+    sessions never share a live Agent. Only the ``max_keys`` most recently
+    used variants keep idle agents around.
+    """
+
+    def __init__(self, factory, max_idle_per_key: int = 4, max_keys: int = 64):
+        self._factory = factory
+        self._max_idle_per_key = max_idle_per_key
+        self._max_keys = max_keys
+        self._idle: OrderedDict[tuple, list["Agent"]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, key: tuple) -> "Agent":
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self._idle.move_to_end(key)
+                self.reused += 1
+                return idle.pop()
+            self.created += 1
+        return self._factory(key)
+
+    def release(self, key: tuple, pooled: "Agent") -> None:
+        # Fresh session so no history or run state leaks into the next user's turn
+        try:
+            pooled.new_session()
+        except Exception:
+            return  # don't pool an agent we couldn't reset
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            self._idle.move_to_end(key)
+            if len(idle) < self._max_idle_per_key:
+                idle.append(pooled)
+            while len(self._idle) > self._max_keys:
+                self._idle.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "created": self.created,
+                "reused": self.reused,
+                "idle": sum(len(v) for v in self._idle.values()),
+                "keys": len(self._idle),
+            }
+
+
+_AGENT_POOL = AgentPool(_build_agent, max_keys=128)  # personas x routed toolsets
+
+
+def _run_pooled(key: tuple, message, images, context: str):
+    # Check out on first iteration, so a stream that is never started holds no agent
+    pooled = _AGENT_POOL.acquire(key)
+    try:
+        # Appended after the instructions, so the cacheable prefix stays intact
+        pooled.additional_context = context
+        yield from pooled.run(message=message, images=images, stream=True)
+    finally:
+        _AGENT_POOL.release(key, pooled)
+
+
+def agent(message, images=None, location=None, toolsets=ALL_TOOLSETS):
+    """Stream one turn; ``images`` are PreparedImage objects from eccb/images.py, sent from memory."""
+    location = location or {}
+
+    if images:
+        from agno.media import Image
+
+        images = [Image(content=image.content, format=image.format) for image in images]
+
+    return _run_pooled((persona_key(location), tuple(toolsets)), message, images or None, location_context(location))
+
+
+def _warm_up() -> None:
+    from eccb.router import intent_model
+
+    intent_model()
+    importlib.import_module("agno.agent")
+    importlib.import_module("agno.models.openrouter")
+
+
+@functools.lru_cache(maxsize=1)
+def warm_up() -> threading.Thread:
+    """Train the intent router and import the agent stack in the background, once per process.
+
+    Call it after the page has painted, so the first prompt doesn't wait for either.
+    """
+    thread = threading.Thread(target=_warm_up, name="agent-warmup", daemon=True)
+    thread.start()
+    return thread
+
+# 💬 Answers to common opening questions, per persona, shared across sessions
+_RESPONSE_CACHE = ResponseCache()
+
+
+def shared_agent(message, images=None, location=None, attachments=False, prompt=None, scam_checked=False):
+    """agent(), but each turn is routed first: only the toolkits it may need are
+    attached, quiz turns and bare conversions are answered locally, and local
+    scam findings are appended for the model (see eccb/router.py). Opening
+    questions are answered from the near-duplicate cache when possible, and
+    identical ones in flight across sessions share one run, as long as every
+    routed toolset is in SHAREABLE_TOOLSETS.
+
+    ``prompt`` is the user's own text to route on; by default the latest
+    message, which may carry excerpts or notes the app appended. Pass
+    ``scam_checked`` when the caller already scanned and warned.
+
+    See eccb/coalesce.py for exactly which calls are eligible.
+    """
+    from eccb.router import route_prompt
+
+    location = location or {}
+    if prompt is None:
+        prompt = message[-1].get("content") if isinstance(message, list) and message else message
+    route = route_prompt(
+        prompt or "", current_session_id.get(), location.get("country") or "",
+        local=not (images or attachments), scam_checked=scam_checked,
+    )
+    if route.reply:
+        return ReplyStream(route.reply)
+    if route.context:
+        # Findings are specific to this message: no sharing or caching
+        if isinstance(message, list) and message:
+            message = message[:-1] + [{**message[-1], "content": (message[-1].get("content") or "") + route.context}]
+        else:
+            message = (message or "") + route.context
+        return agent(message, images, location, route.toolsets)
+
+    if not SHAREABLE_TOOLSETS.issuperset(route.toolsets):
+        # e.g. quiz: the tools would keep state for one session only
+        return agent(message, images, location, route.toolsets)
+
+    key = coalesce_key(message, build_instructions(location), has_media=bool(images or attachments))
+    if key is None:
+        return agent(message, images, location, route.toolsets)
+
+    prompt = key[0]
+    persona = build_persona_guidelines(location)
+    cached = _RESPONSE_CACHE.lookup(prompt, persona)
+    if cached is not None:
+        return ReplyStream(cached)
+
+    def remember(events):
+        answer = answer_from_events(events)
+        if answer:
+            _RESPONSE_CACHE.store(prompt, persona, answer)
+
+    return coalesced(key, lambda: agent(message, images, location, route.toolsets), on_complete=remember)
+
+
+def response_cache_stats() -> dict:
+    """Hit-rate counters of the near-duplicate answer cache."""
+    return _RESPONSE_CACHE.stats()
@@ -2,6 +2,10 @@ from dotenv import load_dotenv
 import streamlit as st
 import warnings
 import os
+import uuid
+
+from eccb.runner import current_session_id
+from eccb.streaming import ReplyRenderer
 
 
 load_dotenv()
@@ -19,16 +23,22 @@ from agno.agent import Agent
 from agno.models.openrouter import OpenRouter
 from agno.tools.duckduckgo import DuckDuckGoTools
 
+from eccb.budget import BudgetTools
+from eccb.currency import CurrencyTools
+from eccb.quiz import QuizTools
+from eccb.scams import ScamCheckTools
+from eccb.side_hustles import SideHustleTools
+
 # 🛡️ Setup API key (either from environment or hardcoded here)
 API_KEY = os.getenv("OPENROUTER_API_KEY")
 
 # 🔧 Custom tools (replace these with actual tool imports or functions)
 # You must define these tools somewhere or import them
-commonscams2 = ...
-financialliteracyquiz = ...
-sidehustlegenerator = ...
-currencyconverter = ...
-budgetingfunction = ...
+commonscams2 = ScamCheckTools()
+financialliteracyquiz = QuizTools()
+sidehustlegenerator = SideHustleTools()
+currencyconverter = CurrencyTools()
+budgetingfunction = BudgetTools()
 user_entereddata = ...
 
 # 🚀 Initialize the agent
@@ -134,6 +144,11 @@ agent = get_agent()
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
+# 🪪 Stable id for this browser session; the agent is shared, so the quiz tools keep each user's quiz under it
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+current_session_id.set(st.session_state.session_id)
+
 st.title("💼 Financial AI Agent")
 
 # 🗨️ Show chat messages
@@ -152,6 +167,7 @@ if user_input:
     # Get agent response
     with st.chat_message("assistant"):
         message_placeholder = st.empty()
+        renderer = ReplyRenderer(message_placeholder, cursor="▌") # Redraws at a capped frame rate
         action_placeholder = st.empty() # For displaying tool actions
         satellite_placeholder = st.empty() # For displaying satellite images
         full_response = ""
@@ -184,6 +200,7 @@ if user_input:
                       # Tool call started - show action
                       tool_name = chunk.tool.tool_name if hasattr(chunk.tool, 'tool_name') else "Unknown Tool"
                       current_action = f"🔧 Calling {tool_name}..."
+                      renderer.flush() # Show text streamed so far before the tool runs
                       action_placeholder.info(current_action)
 
                   elif chunk.event == 'ToolCallCompleted':
@@ -206,7 +223,7 @@ if user_input:
 
               # Update the message display with current response
               if full_response:
-                  message_placeholder.markdown(full_response + "▌")
+                  renderer.update(full_response)
 
 
         except Exception as e:
@@ -216,7 +233,7 @@ if user_input:
 
     # Final cleanup - clear action and show final message
     action_placeholder.empty()
-    message_placeholder.markdown(full_response)
+    renderer.finish(full_response)
 
     # Save assistant reply
     st.session_state.messages.append({"role": "assistant", "content": response})
@@ -1,11 +1,15 @@
 from dotenv import load_dotenv
 import streamlit as st
-import tempfile
-import PyPDF2
-import os
+import uuid
 
 # Import the modularized agent utilities
-from pages.agent import detect_user_location, agent as run_agent
+from eccb.history import PREVIEW_CHARS, budget_history
+from eccb.images import prepare_images
+from eccb.retrieval import DocumentIndex
+from eccb.runner import current_session_id, start_session_run
+from eccb.streaming import ReplyRenderer
+from eccb.uploads import extract_pdf_text, read_text_file
+from pages.agent import detect_user_location, shared_agent as run_agent, warm_up
 from pages.eccb_map import render_eccu_map
 
 # ✅✅✅ added here
@@ -15,60 +19,43 @@ load_dotenv()
 
 # All agent internals moved to agent.py
 
-# Function to extract text from PDF files
-def extract_pdf_text(pdf_file):
+# Function to add an uploaded file to the session's retrieval index
+def attach_document(label, file_name, text, attachments, scam_hits):
     """
-    Extract text content from a PDF file using PyPDF2
+    Index an uploaded file's text so later questions only send relevant excerpts,
+    and scan it for scam signs
 
     Args:
-        pdf_file: Uploaded file object from Streamlit
+        label: Display label, e.g. "PDF Content"
+        file_name: Name of the uploaded file
+        text: Extracted text content
+        attachments: The user message's attachment list to append to
+        scam_hits: List the document's scam signs are added to
 
     Returns:
-        str: Extracted text content from the PDF
+        str: Short note shown in the chat in place of the full text
     """
-    try:
-        # Create a PDF reader object
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text_content = ""
-
-        # Extract text from each page
-        for page_num in range(len(pdf_reader.pages)):
-            page = pdf_reader.pages[page_num]
-            text_content += page.extract_text() + "\n"
-
-        return text_content.strip()
-    except Exception as e:
-        return f"Error reading PDF: {str(e)}"
-
-# Function to read text from other file types
-def read_text_file(file):
-    """
-    Read text content from various file types
-
-    Args:
-        file: Uploaded file object from Streamlit
+    from eccb.scams import scan_text
 
-    Returns:
-        str: File content as text
-    """
-    try:
-        # Try to decode as UTF-8 first
-        content = file.read().decode('utf-8')
-        return content
-    except UnicodeDecodeError:
-        try:
-            # Try with different encoding if UTF-8 fails
-            file.seek(0)  # Reset file pointer
-            content = file.read().decode('latin-1')
-            return content
-        except Exception as e:
-            return f"Error reading file: {str(e)}"
+    scam_hits.extend(scan_text(text))
+    sections = st.session_state.doc_index.add_document(file_name, text)
+    attachments.append({"label": label, "name": file_name, "text": text[:PREVIEW_CHARS], "chars": len(text)})
+    return f"\n\n📎 **{label} ({file_name}):** {len(text):,} characters, {sections} sections indexed\n"
 
 
 # 🧠 Session state for chat history
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
+# 🪪 Stable id for this browser session; tools use it for per-session state like quiz scores
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+current_session_id.set(st.session_state.session_id)
+
+# 🔎 Uploaded documents are searched per question instead of pasted into the prompt
+if "doc_index" not in st.session_state:
+    st.session_state.doc_index = DocumentIndex()
+
 st.title("💼 Financial AI Agent")
 
 # 🌐 Detect user location early and show a tiny badge
@@ -78,7 +65,11 @@ loc_city = location.get("city") or ""
 loc_is_eccu = location.get("is_eccu")
 badge = f"📍 {loc_city + ', ' if loc_city else ''}{loc_country}"
 st.caption(badge + ("  ·  ECCU" if loc_is_eccu else "  ·  Global"))
-render_eccu_map()
+# Centre on the user only inside the ECCU; elsewhere the islands would be off-screen
+loc_center = None
+if loc_is_eccu and location.get("latitude") is not None and location.get("longitude") is not None:
+    loc_center = (location["latitude"], location["longitude"])
+render_eccu_map(location.get("country"), loc_center)
 
 # 🗨️ Show chat messages
 for msg in st.session_state.messages:
@@ -102,6 +93,8 @@ if data := st.chat_input("Ask me anything...", accept_file=True):
     # Process uploaded files if any
     file_content = ""
     image_files = []
+    attachments = []  # kept apart from the prompt so older turns can be compacted
+    document_hits = []  # scam signs found in uploaded documents
 
     if uploaded_files:
         for uploaded_file in uploaded_files:
@@ -110,14 +103,19 @@ if data := st.chat_input("Ask me anything...", accept_file=True):
 
             # Handle different file types
             if file_extension == "pdf":
-                # Extract text from PDF files
-                pdf_text = extract_pdf_text(uploaded_file)
-                file_content += f"\n\n**PDF Content ({file_name}):**\n{pdf_text}\n"
+                # Extract text from PDF files, with a progress bar for long documents
+                progress_bar = st.progress(0.0, text=f"Reading {file_name}...")
+                pdf_text = extract_pdf_text(
+                    uploaded_file,
+                    progress=lambda done, total: progress_bar.progress(done / max(total, 1), text=f"Reading {file_name}: page {done}/{total}"),
+                )
+                progress_bar.empty()
+                file_content += attach_document("PDF Content", file_name, pdf_text, attachments, document_hits)
 
             elif file_extension in ["txt", "md", "py", "js", "html", "css", "json", "xml", "csv"]:
                 # Read text-based files
                 text_content = read_text_file(uploaded_file)
-                file_content += f"\n\n**File Content ({file_name}):**\n{text_content}\n"
+                file_content += attach_document("File Content", file_name, text_content, attachments, document_hits)
 
             elif file_extension in ["jpg", "jpeg", "png", "gif", "bmp", "webp"]:
                 # Handle image files
@@ -128,13 +126,15 @@ if data := st.chat_input("Ask me anything...", accept_file=True):
                 # For unsupported file types, try to read as text
                 try:
                     text_content = read_text_file(uploaded_file)
-                    file_content += f"\n\n**File Content ({file_name}):**\n{text_content}\n"
+                    file_content += attach_document("File Content", file_name, text_content, attachments, document_hits)
                 except:
                     file_content += f"\n\n**Unsupported file type: {file_name}**\n"
 
     # Combine prompt with file content
     if file_content:
         user_message["content"] = (prompt or "") + file_content
+        user_message["prompt"] = prompt or ""
+        user_message["attachments"] = attachments
 
     # Add user message to chat history
     st.session_state.messages.append(user_message)
@@ -146,57 +146,77 @@ if data := st.chat_input("Ask me anything...", accept_file=True):
                 st.image(img_file, width=200)
         st.markdown(user_message["content"])
 
+    # 🚨 Scan the message and uploads for scam signs before the model sees them
+    from eccb.scams import merge_hits, scam_context, scam_warning, scan_text  # already loaded by warm_up() in most sessions
+
+    scam_hits = merge_hits(scan_text(prompt or ""), document_hits)
+    if scam_hits:
+        st.warning(scam_warning(scam_hits))
+
     # Generate assistant response
     with st.chat_message("assistant"):
         message_placeholder = st.empty()
+        renderer = ReplyRenderer(message_placeholder, cursor="● ")  # Redraws at a capped frame rate
         action_placeholder = st.empty()  # For displaying tool actions
         full_response = ""
         current_action = None
 
         try:
-            # Handle image files for the agent
-            image_path = None
-            if image_files:
-                # Create temporary file for the first image (agent can handle one image at a time)
-                with tempfile.NamedTemporaryFile(delete=False, suffix=f".{image_files[0].name.split('.')[-1]}") as tmp_file:
-                    tmp_file.write(image_files[0].getvalue())
-                    image_path = tmp_file.name
-
-            # Get streaming response from the AI agent
-            response_stream = run_agent(st.session_state.messages, image_path, location=location)
-
-            # Process and display the streaming response
-            for chunk in response_stream:
-                # Handle different types of response chunks
-                if hasattr(chunk, 'event'):
-                    if chunk.event == 'RunResponseContent':
-                        # Regular text content from the AI
-                        if hasattr(chunk, 'content') and chunk.content:
-                            full_response += chunk.content
-                            # Clear any action display when we get content
+            # Downscale and re-encode every image in memory, in parallel, before it is sent
+            images = prepare_images(image_files) if image_files else None
+
+            # History trimmed to the token budget, plus only the upload excerpts relevant to this question
+            model_messages = budget_history(st.session_state.messages)
+            excerpts = st.session_state.doc_index.context_for(prompt or "", fallback=bool(attachments))
+            if excerpts:
+                model_messages[-1] = {"role": "user", "content": model_messages[-1]["content"] + excerpts}
+            if scam_hits:
+                # Let the model build on the local findings instead of re-deriving them
+                model_messages[-1] = {"role": "user", "content": model_messages[-1]["content"] + scam_context(scam_hits, warned=True)}
+
+            # Get streaming response from the AI agent on a background worker;
+            # a newer prompt from this session cancels the run still in flight
+            response_stream = start_session_run(
+                st.session_state,
+                lambda: run_agent(
+                    model_messages, images, location=location, attachments=bool(excerpts),
+                    prompt=prompt or "", scam_checked=True,
+                ),
+            )
+
+            # Process and display the streaming response; if the page stops or reruns
+            # mid-stream, cancel the run so the worker frees its slot
+            try:
+                for chunk in response_stream:
+                    # Handle different types of response chunks
+                    if hasattr(chunk, 'event'):
+                        if chunk.event == 'RunResponseContent':
+                            # Regular text content from the AI
+                            if hasattr(chunk, 'content') and chunk.content:
+                                full_response += chunk.content
+                                # Clear any action display when we get content
+                                if current_action:
+                                    action_placeholder.empty()
+                                    current_action = None
+
+                        elif chunk.event == 'ToolCallStarted':
+                            # Tool call started - show action indicator
+                            tool_name = chunk.tool.tool_name if hasattr(chunk.tool, 'tool_name') else "Unknown Tool"
+                            current_action = f"🔧 Calling {tool_name}..."
+                            renderer.flush()  # Show text streamed so far before the tool runs
+                            action_placeholder.info(current_action)
+
+                        elif chunk.event == 'ToolCallCompleted':
+                            # Tool call completed
                             if current_action:
-                                action_placeholder.empty()
-                                current_action = None
-
-                    elif chunk.event == 'ToolCallStarted':
-                        # Tool call started - show action indicator
-                        tool_name = chunk.tool.tool_name if hasattr(chunk.tool, 'tool_name') else "Unknown Tool"
-                        current_action = f"🔧 Calling {tool_name}..."
-                        action_placeholder.info(current_action)
+                                action_placeholder.success(f"✅ Tool call completed")
+                                # Clear after a brief moment or keep until next content
 
-                    elif chunk.event == 'ToolCallCompleted':
-                        # Tool call completed
-                        if current_action:
-                            action_placeholder.success(f"✅ Tool call completed")
-                            # Clear after a brief moment or keep until next content
-
-                # Update the message display with current response
-                if full_response:
-                    message_placeholder.markdown(full_response + "● ")
-
-            # Clean up temporary image file
-            if image_path:
-                os.unlink(image_path)
+                    # Update the message display with current response
+                    if full_response:
+                        renderer.update(full_response)
+            finally:
+                response_stream.cancel()
 
         except Exception as e:
             # Handle any errors during response generation
@@ -206,8 +226,11 @@ if data := st.chat_input("Ask me anything...", accept_file=True):
 
         # Final cleanup - clear action indicator and show final message
         action_placeholder.empty()
-        message_placeholder.markdown(full_response)
+        renderer.finish(full_response)
 
     # Add assistant response to chat history
     assistant_message = {"role": "assistant", "content": full_response}
     st.session_state.messages.append(assistant_message)
+
+# 🔥 Page is painted: load the agent stack and train the router in the background (once per process)
+warm_up()
@@ -1,9 +1,14 @@
 # map code
 # call the render_eccu_map to render the map
+import functools
 import os
-import pydeck as pdk
+from typing import TYPE_CHECKING
+
 import streamlit as st
 
+if TYPE_CHECKING:
+    import pydeck as pdk
+
 ECCU_PINS = [
     {"name": "Antigua and Barbuda", "lat": 17.0608, "lon": -61.7964, "note": "Wadadli vibes. Carnival budgets, gig income."},
     {"name": "Dominica", "lat": 15.4150, "lon": -61.3710, "note": "Dasheen money, village market savings."},
@@ -15,10 +20,16 @@ ECCU_PINS = [
     {"name": "Montserrat", "lat": 16.7425, "lon": -62.1874, "note": "Small island gigs, community investing."},
 ]
 
-def render_eccu_map(user_country: str | None = None, center: tuple[float, float] | None = None):
-    mapbox_token = os.getenv("MAPBOX_API_KEY") or os.getenv("MAPBOX_TOKEN")
-    if mapbox_token:
-        pdk.settings.mapbox_api_key = mapbox_token
+MAP_CENTER_DECIMALS = 1  # ~10 km; invisible at zoom 5, lets nearby users share a cached map
+
+
+@functools.lru_cache(maxsize=256)
+def eccu_deck(user_country: str | None, center: tuple[float, float] | None, mapbox_token: str | None) -> "pdk.Deck":
+    """The map for one (country, center, token) combination, shared by every session that needs it.
+
+    Treat the result as read-only: the same Deck is handed to every rerun.
+    """
+    import pydeck as pdk  # imported here so the page title paints before pydeck loads
 
     pins = []
     for pin in ECCU_PINS:
@@ -48,14 +59,21 @@ def render_eccu_map(user_country: str | None = None, center: tuple[float, float]
         pitch=30,
     )
 
-    deck = pdk.Deck(
+    return pdk.Deck(
         layers=[layer],
         initial_view_state=view_state,
         map_style="mapbox://styles/mapbox/light-v10" if mapbox_token else None,
+        api_keys={"mapbox": mapbox_token} if mapbox_token else None,
         tooltip={
             "html": "<b>{name}</b><br/>{note}",
             "style": {"backgroundColor": "#111", "color": "#fff"},
         },
     )
 
-    st.pydeck_chart(deck)
+
+def render_eccu_map(user_country: str | None = None, center: tuple[float, float] | None = None):
+    mapbox_token = os.getenv("MAPBOX_API_KEY") or os.getenv("MAPBOX_TOKEN")
+    if center is not None:
+        center = (round(center[0], MAP_CENTER_DECIMALS), round(center[1], MAP_CENTER_DECIMALS))
+    # Keyed on the token itself (not just its presence) so a rotated key is picked up
+    st.pydeck_chart(eccu_deck(user_country or None, center, mapbox_token or None))
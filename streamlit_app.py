@@ -1,3 +1,6 @@
+import importlib
+import threading
+
 import streamlit as st
 
 st.title("RUGRATS")
@@ -16,3 +19,15 @@ st.write(
 
 if st.button("Visit our AI Agent, RUGRat! ➡️"):
     st.switch_page("pages/app.py")
+
+
+# 🔥 Load the agent page's modules while the visitor reads this page, so the switch is quick
+@st.cache_resource(show_spinner=False)
+def _prewarm_agent_page():
+    def load():
+        importlib.import_module("pages.agent").warm_up()
+
+    threading.Thread(target=load, name="agent-page-prewarm", daemon=True).start()
+
+
+_prewarm_agent_page()
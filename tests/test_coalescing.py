@@ -0,0 +1,59 @@
+"""Opening questions are shared across sessions only when their tools are stateless."""
+import contextvars
+import threading
+
+import pytest
+
+import pages.agent
+from eccb.response_cache import ResponseCache
+from eccb.runner import current_session_id
+from pages.agent import shared_agent
+
+
+@pytest.fixture
+def fake_agent(monkeypatch):
+    """Replaces the model run; records which session each run belongs to."""
+    calls = []
+    release = threading.Event()
+
+    def agent(message, images=None, location=None, toolsets=()):
+        calls.append((current_session_id.get(), tuple(toolsets)))
+
+        def events():
+            release.wait(5)
+            yield "answer"
+
+        return events()
+
+    monkeypatch.setattr(pages.agent, "agent", agent)
+    monkeypatch.setattr(pages.agent, "_RESPONSE_CACHE", ResponseCache())
+    return calls, release
+
+
+def _open(session_id: str, prompt: str):
+    def start():
+        current_session_id.set(session_id)
+        return shared_agent([{"role": "user", "content": prompt}], prompt=prompt)
+
+    return contextvars.copy_context().run(start)
+
+
+@pytest.mark.parametrize("prompt", ["can I take a quiz?", "I'd like to take a quiz", "test my money knowledge with a quiz"])
+def test_quiz_turns_run_once_per_session(fake_agent, prompt):
+    calls, release = fake_agent
+    streams = [_open("session-a", prompt), _open("session-b", prompt)]
+    release.set()
+    assert [list(stream) for stream in streams] == [["answer"], ["answer"]]
+
+    # each session ran its own turn, with its own id for the quiz tools
+    assert sorted(session for session, _ in calls) == ["session-a", "session-b"]
+    assert all("quiz" in toolsets for _, toolsets in calls)
+
+
+def test_stateless_turns_are_still_shared(fake_agent):
+    calls, release = fake_agent
+    prompt = "what is the difference between a savings account and a fixed deposit"
+    streams = [_open("session-a", prompt), _open("session-b", prompt)]
+    release.set()
+    assert [list(stream) for stream in streams] == [["answer"], ["answer"]]
+    assert len(calls) == 1
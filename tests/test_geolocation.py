@@ -0,0 +1,114 @@
+"""Concurrent geolocation against local stub providers (see benchmarks/bench_geolocation.py)."""
+import json
+import threading
+import time
+
+import pytest
+
+from benchmarks.bench_geolocation import _stub, _url
+from pages.agent import (
+    _parse_ipapi,
+    _parse_ipapi_alt,
+    _parse_ipinfo,
+    _parse_ipwhois,
+    _query_provider,
+    resolve_location_concurrently,
+)
+
+SLOW_DELAY = 3.0
+
+
+@pytest.fixture(scope="module")
+def providers():
+    servers = {
+        "slow": _stub(200, json.dumps({"country_name": "Grenada", "city": "St. George's"}), delay=SLOW_DELAY),
+        "failing": _stub(500, "{}", delay=0.1),
+        "malformed": _stub(200, "{not json", delay=0.05),
+        "fast": _stub(200, json.dumps({"status": "success", "countryCode": "LC", "city": "Castries"}), delay=0.2),
+    }
+    parsers = {"slow": _parse_ipapi, "failing": _parse_ipwhois, "malformed": _parse_ipinfo, "fast": _parse_ipapi_alt}
+    yield {name: (name, _url(server), parsers[name]) for name, server in servers.items()}
+    for server in servers.values():
+        server.shutdown()
+        server.server_close()
+
+
+def test_fastest_good_provider_wins(providers):
+    start = time.perf_counter()
+    location = resolve_location_concurrently(list(providers.values()), deadline=4)
+    elapsed = time.perf_counter() - start
+
+    assert location["country"] == "Saint Lucia"
+    assert location["city"] == "Castries"
+    assert location["is_eccu"] is True
+    assert elapsed < SLOW_DELAY / 2  # didn't wait for the slow provider
+
+
+def test_slow_provider_still_answers_when_alone(providers):
+    location = resolve_location_concurrently([providers["slow"]], deadline=SLOW_DELAY + 2)
+    assert location["country"] == "Grenada"
+    assert location["is_eccu"] is True
+
+
+def test_gives_up_at_the_deadline(providers):
+    start = time.perf_counter()
+    location = resolve_location_concurrently([providers["slow"], providers["failing"], providers["malformed"]],
+                                             deadline=0.5)
+    elapsed = time.perf_counter() - start
+
+    assert location is None
+    assert elapsed < 1.5
+
+
+def test_failing_and_malformed_providers_give_no_location(providers):
+    start = time.perf_counter()
+    location = resolve_location_concurrently([providers["failing"], providers["malformed"]], deadline=4)
+    elapsed = time.perf_counter() - start
+
+    assert location is None
+    assert elapsed < 2  # both finished; no need to wait out the deadline
+
+
+def test_query_provider_results(providers):
+    _, url, parser = providers["failing"]
+    assert _query_provider("failing", url, parser, 4, threading.Event()) is None
+
+    _, url, parser = providers["malformed"]
+    with pytest.raises(ValueError):
+        _query_provider("malformed", url, parser, 4, threading.Event())
+
+    cancelled = threading.Event()
+    cancelled.set()
+    _, url, parser = providers["fast"]
+    assert _query_provider("fast", url, parser, 4, cancelled) is None
+
+
+def test_cold_misses_for_one_ip_share_a_lookup(monkeypatch):
+    import pages.agent as agent_module
+
+    calls = []
+    release = threading.Event()
+
+    def slow_lookup(ip=None):
+        calls.append(ip)
+        release.wait(5)
+        return agent_module._finalize({"country": "Dominica", "region": None, "city": "Roseau",
+                                       "latitude": None, "longitude": None, "is_eccu": False})
+
+    monkeypatch.setattr(agent_module, "resolve_location_concurrently", slow_lookup)
+    monkeypatch.setattr(agent_module, "resolve_location_offline", lambda ip: None)
+    monkeypatch.setattr(agent_module, "_LOCATION_CACHE", agent_module.TTLCache(maxsize=16, ttl=60))
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(
+        agent_module._resolve_location_once("203.0.113.7", "203.0.113.7"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == ["203.0.113.7"]
+    assert [location["city"] for location in results] == ["Roseau"] * 8
+    assert agent_module._LOCATION_CACHE.get("203.0.113.7")["country"] == "Dominica"
@@ -0,0 +1,51 @@
+"""Offline IP-range index: overlapping and nested ranges from different countries."""
+import pytest
+
+from eccb.ip_ranges import IPRangeIndex, parse_csv
+
+
+def _index(*rows):
+    return IPRangeIndex(parse_csv(rows))
+
+
+def test_nested_range_of_another_country_wins_inside_it():
+    index = _index("10.0.0.0/16,LC", "10.0.5.0/24,GD")
+    assert index.lookup("10.0.4.255") == "LC"
+    assert index.lookup("10.0.5.0") == "GD"
+    assert index.lookup("10.0.5.255") == "GD"
+    assert index.lookup("10.0.6.0") == "LC"  # the outer range resumes after the nested one
+    assert index.lookup("10.1.0.0") is None
+    assert len(index) == 3
+
+
+def test_order_of_rows_does_not_matter():
+    index = _index("10.0.5.0/24,GD", "10.0.0.0/16,LC")
+    assert index.lookup("10.0.5.7") == "GD"
+    assert index.lookup("10.0.200.1") == "LC"
+
+
+def test_partial_overlap_goes_to_the_narrower_range():
+    index = _index("10.0.0.0,10.0.0.99,DM", "10.0.0.50,10.0.0.59,KN", "10.0.0.90,10.0.1.255,AG")
+    assert index.lookup("10.0.0.49") == "DM"
+    assert index.lookup("10.0.0.55") == "KN"
+    assert index.lookup("10.0.0.60") == "DM"
+    assert index.lookup("10.0.0.95") == "DM"  # 100 addresses vs 422
+    assert index.lookup("10.0.0.100") == "AG"
+
+
+def test_same_country_ranges_still_merge():
+    index = _index("10.0.0.0/24,VC", "10.0.1.0/24,VC", "10.0.0.128/25,VC")
+    assert len(index) == 1
+    assert index.lookup("10.0.1.200") == "VC"
+
+
+@pytest.mark.parametrize("ip, expected", [("2001:db8::1", "MS"), ("2001:db8:0:1::1", "AI"), ("2001:db9::1", None)])
+def test_nested_ipv6(ip, expected):
+    index = _index("2001:db8::/32,MS", "2001:db8:0:1::/64,AI")
+    assert index.lookup(ip) == expected
+
+
+def test_countries_filter_drops_other_ranges():
+    index = IPRangeIndex(parse_csv(["10.0.0.0/16,LC", "10.0.5.0/24,US"]), countries={"LC"})
+    assert index.lookup("10.0.5.1") == "LC"
+    assert index.countries == ["LC"]
@@ -0,0 +1,35 @@
+"""Quiz state is kept per chat session."""
+import contextvars
+
+from eccb.quiz import QuizTools, _QUIZZES
+from eccb.runner import current_session_id
+
+
+def _in_session(session_id, fn, *args):
+    context = contextvars.copy_context()
+
+    def run():
+        current_session_id.set(session_id)
+        return fn(*args)
+
+    return context.run(run)
+
+
+def test_quiz_tools_refuse_without_a_session():
+    tools = QuizTools()
+    before = len(_QUIZZES)
+    assert "no chat session" in contextvars.Context().run(tools.start_financial_quiz)
+    assert "no chat session" in contextvars.Context().run(tools.grade_quiz_answer, "A")
+    assert len(_QUIZZES) == before
+
+
+def test_each_session_has_its_own_quiz():
+    tools = QuizTools()
+    assert "Q1 of" in _in_session("quiz-a", tools.start_financial_quiz, "budgeting")
+    assert "Q1 of" in _in_session("quiz-b", tools.start_financial_quiz, "scams")
+
+    assert "Score so far: " in _in_session("quiz-a", tools.grade_quiz_answer, "A")
+    # b's quiz is untouched by a's answer and still on its first question
+    assert _QUIZZES.get("quiz-b")["position"] == 0
+    assert _QUIZZES.get("quiz-a")["position"] == 1
+    assert _in_session("quiz-c", tools.grade_quiz_answer, "A") == "No quiz is running. Start one first."
@@ -0,0 +1,182 @@
+"""QuoteBatcher round trips and the per-caller split (see benchmarks/bench_quote_batching.py),
+and parsing of bulk yfinance downloads."""
+import json
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from eccb.quotes import BulkQuoteTools, QuoteBatcher, _frame_for, download_history, download_quotes
+
+SESSIONS = [["AAPL", "MSFT", "GOOG", "AMZN", "NVDA"], ["AAPL", "TSLA"], ["MSFT", "NVDA", "META"], ["GOOG"]]
+
+
+class FakeQuotes:
+    """Bulk fetch that records every round trip."""
+
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, symbols, *params):
+        with self._lock:
+            self.calls.append((list(symbols), params))
+        time.sleep(self.latency)
+        return {s: {"price": 100 + len(s), "params": params} for s in symbols if s != "MISSING"}
+
+
+def _in_parallel(fn, args_list):
+    barrier = threading.Barrier(len(args_list))
+
+    def call(args):
+        barrier.wait()
+        return fn(*args)
+
+    with ThreadPoolExecutor(len(args_list)) as pool:
+        return list(pool.map(call, args_list))
+
+
+def test_parallel_single_ticker_calls_share_one_round_trip():
+    fetch = FakeQuotes()
+    batcher = QuoteBatcher(fetch, window=0.2)
+    tickers = SESSIONS[0]
+
+    results = _in_parallel(batcher.get_many, [([s],) for s in tickers])
+
+    assert batcher.round_trips == 1
+    assert len(fetch.calls) == 1
+    assert sorted(fetch.calls[0][0]) == sorted(tickers)
+    # each caller gets back exactly the ticker it asked for
+    for symbol, result in zip(tickers, results):
+        assert result == {symbol: {"price": 100 + len(symbol), "params": ()}}
+
+
+def test_overlapping_sessions_fetch_each_symbol_once():
+    fetch = FakeQuotes()
+    batcher = QuoteBatcher(fetch, window=0.2)
+
+    results = _in_parallel(batcher.get_many, [(session,) for session in SESSIONS])
+
+    assert batcher.round_trips == 1
+    fetched = fetch.calls[0][0]
+    assert sorted(fetched) == sorted({s for session in SESSIONS for s in session})
+    assert batcher.symbols_requested == sum(len(session) for session in SESSIONS)
+    for session, result in zip(SESSIONS, results):
+        assert list(result) == session
+
+
+def test_different_params_go_in_separate_batches():
+    fetch = FakeQuotes()
+    batcher = QuoteBatcher(fetch, window=0.2)
+
+    results = _in_parallel(batcher.get_many, [(["AAPL"], ("1mo", "1d")), (["AAPL"], ("5d", "1h")), (["MSFT"], ("1mo", "1d"))])
+
+    assert batcher.round_trips == 2
+    assert sorted((sorted(symbols), params) for symbols, params in fetch.calls) == [
+        (["AAPL"], ("5d", "1h")),
+        (["AAPL", "MSFT"], ("1mo", "1d")),
+    ]
+    assert results[1]["AAPL"]["params"] == ("5d", "1h")
+
+
+def test_full_batch_is_sent_without_waiting_for_the_window():
+    fetch = FakeQuotes(latency=0)
+    batcher = QuoteBatcher(fetch, window=5, max_batch=3)
+
+    start = time.perf_counter()
+    result = batcher.get_many(["AAPL", "MSFT", "GOOG"])
+
+    assert time.perf_counter() - start < 1
+    assert batcher.round_trips == 1
+    assert set(result) == {"AAPL", "MSFT", "GOOG"}
+
+
+def test_unknown_symbol_is_none_and_errors_reach_every_caller():
+    batcher = QuoteBatcher(FakeQuotes(latency=0), window=0)
+    assert batcher.get_many(["AAPL", "MISSING"])["MISSING"] is None
+
+    def broken(symbols, *params):
+        raise ConnectionError("quote service down")
+
+    batcher = QuoteBatcher(broken, window=0.2)
+    with ThreadPoolExecutor(3) as pool:
+        futures = [pool.submit(batcher.get_many, [s]) for s in ("AAPL", "MSFT", "GOOG")]
+        for future in futures:
+            with pytest.raises(ConnectionError):
+                future.result()
+    assert batcher.round_trips == 1
+
+
+# Shaped like yf.download(["AAPL", "MSFT", "ZZZZ"], period="5d", group_by="ticker", auto_adjust=False):
+# (ticker, field) columns, and an all-NaN block for a ticker Yahoo doesn't know
+FIELDS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+RECORDED = {
+    "AAPL": [(227.92, 229.4, 225.89, 228.02, 227.77, 41_300_000), (228.46, 230.83, 227.0, 229.98, 229.72, 37_600_000),
+             (230.1, 232.9, 229.4, 232.15, 231.89, 44_100_000)],
+    "MSFT": [(420.1, 424.2, 418.9, 423.04, 422.3, 18_700_000), (423.5, 426.0, 421.7, 425.27, 424.53, 16_900_000),
+             (math.nan,) * 6],  # a row missing for one ticker only
+    "ZZZZ": [(math.nan,) * 6] * 3,
+}
+
+
+def recorded_download(symbols, **kwargs):
+    index = pd.DatetimeIndex(["2026-01-05", "2026-01-06", "2026-01-07"], name="Date")
+    columns = pd.MultiIndex.from_product([symbols, FIELDS], names=["Ticker", "Price"])
+    rows = [[value for symbol in symbols for value in RECORDED.get(symbol, [(math.nan,) * 6] * 3)[i]] for i in range(3)]
+    return pd.DataFrame(rows, index=index, columns=columns)
+
+
+@pytest.fixture
+def yf_download(monkeypatch):
+    import yfinance
+
+    calls = []
+
+    def download(symbols, **kwargs):
+        calls.append(list(symbols))
+        return recorded_download(list(symbols), **kwargs)
+
+    monkeypatch.setattr(yfinance, "download", download)
+    return calls
+
+
+def test_frame_for_picks_one_ticker():
+    data = recorded_download(["AAPL", "MSFT"])
+    assert list(_frame_for(data, "MSFT").columns) == FIELDS
+    assert _frame_for(data, "TSLA") is None
+    flat = data["AAPL"]  # ungrouped single-ticker download
+    assert _frame_for(flat, "AAPL") is flat
+
+
+def test_download_history_splits_and_skips_missing(yf_download):
+    history = download_history(["AAPL", "MSFT", "ZZZZ"], period="5d")
+
+    assert yf_download == [["AAPL", "MSFT", "ZZZZ"]]
+    assert set(history) == {"AAPL", "MSFT"}  # no rows for the unknown ticker
+    assert len(history["AAPL"]) == 3
+    assert len(history["MSFT"]) == 2  # the all-NaN day is dropped
+    assert history["AAPL"][0] == {"date": "2026-01-05 00:00:00", "open": 227.92, "high": 229.4, "low": 225.89,
+                                  "close": 228.02, "adj close": 227.77, "volume": 41_300_000.0}
+
+
+def test_download_quotes_latest_and_previous_close(yf_download):
+    quotes = download_quotes(["AAPL", "MSFT", "ZZZZ"])
+    assert quotes == {
+        "AAPL": {"price": 232.15, "previous_close": 229.98, "as_of": "2026-01-07 00:00:00"},
+        "MSFT": {"price": 425.27, "previous_close": 423.04, "as_of": "2026-01-06 00:00:00"},
+    }
+
+
+def test_quote_tool_batches_and_reports_missing(yf_download):
+    tools = BulkQuoteTools()
+    results = _in_parallel(tools.get_current_stock_prices, [("AAPL",), ("msft, zzzz",)])
+
+    assert len(yf_download) == 1
+    assert sorted(yf_download[0]) == ["AAPL", "MSFT", "ZZZZ"]
+    assert json.loads(results[0]) == {"AAPL": {"price": 232.15, "previous_close": 229.98, "as_of": "2026-01-07 00:00:00"}}
+    assert json.loads(results[1])["ZZZZ"] == "no data"
+    assert json.loads(results[1])["MSFT"]["price"] == 425.27
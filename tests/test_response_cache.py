@@ -0,0 +1,28 @@
+"""The near-duplicate cache must not serve a question the answer to its opposite."""
+import pytest
+
+from eccb.response_cache import ResponseCache
+
+OPPOSITES = [
+    ("is it safe to invest in crypto", "is it unsafe to invest in crypto"),
+    ("is it safe to invest in crypto", "is it not safe to invest in crypto"),
+    ("should I buy gold right now", "should I sell gold right now"),
+    ("what is the exchange rate from USD to XCD", "what is the exchange rate from XCD to USD"),
+    ("how do I save 100 dollars a month", "how do I save 200 dollars a month"),
+    ("are payday loans a good idea", "are payday loans a bad idea"),
+]
+
+
+@pytest.mark.parametrize("stored, asked", OPPOSITES)
+def test_opposite_questions_miss(stored, asked):
+    cache = ResponseCache()
+    cache.store(stored, "global", "cached answer")
+    assert cache.lookup(asked, "global") is None
+    assert cache.lookup(stored, "global") == "cached answer"
+
+
+@pytest.mark.parametrize("asked", ["whats a budget", "What is a budget exactly?", "can you tell me what a budget is"])
+def test_paraphrases_hit(asked):
+    cache = ResponseCache()
+    cache.store("What is a budget?", "global", "cached answer")
+    assert cache.lookup(asked, "global") == "cached answer"
@@ -0,0 +1,21 @@
+"""Routing decides which toolkits a turn gets."""
+import eccb.router
+import pages.agent
+from eccb.router import GENERAL_TOOLSETS, route_prompt
+
+
+def test_one_definition_of_all_toolsets():
+    assert eccb.router.ALL_TOOLSETS is pages.agent.ALL_TOOLSETS
+    assert set(pages.agent.ALL_TOOLSETS) == set(pages.agent.TOOLKIT_SPECS)
+    assert {name for names in eccb.router.TOOLSETS.values() for name in names} <= set(pages.agent.ALL_TOOLSETS)
+
+
+def test_unsure_chat_turns_keep_the_general_tools():
+    route = route_prompt("what are dividends")
+    assert route.reply is None
+    assert set(GENERAL_TOOLSETS) <= set(route.toolsets)
+
+
+def test_local_replies_only_for_bare_conversions():
+    assert route_prompt("convert 100 USD to XCD").reply
+    assert route_prompt("should I convert 100 USD to XCD before my trip?").reply is None
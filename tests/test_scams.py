@@ -0,0 +1,64 @@
+"""Scam signals need a scam-shaped context; ordinary finance text stays clean."""
+import pytest
+
+from eccb.scams import merge_hits, scan_text
+
+BENIGN = [
+    "What is a typical transfer fee to receive money from abroad?",
+    "Why is there a processing fee on my loan?",
+    "I need to pay my phone bill within 24 hours",
+    "Should I pay with crypto?",
+    "explain the ECCB grant program",
+    "What does the Eastern Caribbean Central Bank award to commercial banks?",
+    "Is there a guaranteed return on fixed deposits?",
+    "How long does it take to double your money at 5% interest?",
+    "Is a risk-free investment possible?",
+    "why is my account locked?",
+    "Final notice: pay within 24 hours with a gift card",  # urgency + payment method, nothing else
+]
+
+STATEMENT = """\
+01/03  SALARY CREDIT                      3,450.00
+02/03  Wire transfer fee                     15.00
+04/03  WESTERN UNION PAYMENT                200.00
+05/03  Customs fee on parcel                 12.00
+09/03  Processing fee - personal loan        25.00
+12/03  Account closed: old savings            0.00
+"""
+
+SCAMS = [
+    ("Pay the clearance fee to release your winnings", "advance fee"),
+    ("Your inheritance is ready, just pay the transfer fee", "advance fee"),
+    ("Congratulations, you have been selected by the ECCB for a cash grant", "impersonation"),
+    ("Your online banking account will be locked, act now", "phishing"),
+    ("They said my account will be suspended unless I send my password", "phishing"),
+    ("Guaranteed returns of 30% a month", "investment"),
+    ("double your money in 2 weeks", "investment"),
+    ("Your barrel is on hold, pay the release fee via Western Union", "remittance"),
+]
+
+
+@pytest.mark.parametrize("text", BENIGN)
+def test_benign_questions_have_no_hits(text):
+    assert scan_text(text) == []
+
+
+def test_bank_statement_has_no_hits():
+    assert scan_text(STATEMENT) == []
+
+
+@pytest.mark.parametrize("text, category", SCAMS)
+def test_scam_messages_are_flagged(text, category):
+    assert category in {hit.category for hit in scan_text(text)}
+
+
+def test_urgency_and_payment_method_count_alongside_another_signal():
+    categories = {hit.category for hit in scan_text(
+        "You have won a prize! Pay the handling fee via Western Union to claim it within 24 hours.")}
+    assert {"prize", "advance fee", "urgency", "payment method"} <= categories
+
+
+def test_merge_hits_adds_counts_per_pattern():
+    first = scan_text("Pay the clearance fee to release your winnings")
+    merged = merge_hits(first, scan_text("Pay the clearance fee to release your winnings"))
+    assert [(hit.category, hit.count) for hit in merged] == [("advance fee", 2)]
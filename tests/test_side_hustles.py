@@ -0,0 +1,30 @@
+"""Side-hustle seasons: computed per (country, month), not per catalog."""
+import gc
+import weakref
+
+from eccb.side_hustles import HustleCatalog, active_seasons
+
+HUSTLES = [
+    {"id": "costumes", "name": "Carnival costumes", "skills": ["sewing"], "seasons": ["festival"], "cost_xcd": 300,
+     "countries": ["Grenada"], "earning": "", "first_step": ""},
+    {"id": "tutoring", "name": "Tutoring", "skills": ["tutoring"], "seasons": ["all_year"], "cost_xcd": 0,
+     "earning": "", "first_step": ""},
+]
+
+
+def test_festival_season_in_the_run_up():
+    seasons = active_seasons("Grenada", 7)
+    assert seasons["festival"] == (1, "Spicemas starts in 1 month")
+    assert "festival" not in active_seasons("Grenada", 3)
+
+
+def test_catalogs_are_not_kept_alive_by_the_season_cache():
+    catalog = HustleCatalog(HUSTLES)
+    top = catalog.recommend(skills=["sew"], country="Grenada", month=8)
+    assert top[0][0]["id"] == "costumes"
+    assert "Spicemas is on now" in top[0][1]
+
+    ref = weakref.ref(catalog)
+    del catalog, top
+    gc.collect()
+    assert ref() is None
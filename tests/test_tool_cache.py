@@ -0,0 +1,30 @@
+"""Cache keys for tool calls: whitespace never matters, case only for search tools."""
+from eccb.tool_cache import cached_tool
+
+
+def _counting(name):
+    calls = []
+
+    def tool(query):
+        calls.append(query)
+        return f"result for {query}"
+
+    return cached_tool(name, tool, ttl=60), calls
+
+
+def test_case_sensitive_arguments_are_kept_apart():
+    get_user, calls = _counting("test_get_user_details")
+    assert get_user("Alice") == "result for Alice"
+    assert get_user("alice") == "result for alice"
+    assert get_user("  Alice ") == "result for Alice"  # whitespace only: served from the cache
+    assert calls == ["Alice", "alice"]
+
+
+def test_search_tools_fold_case():
+    import eccb.tool_cache
+
+    assert "duckduckgo_search" in eccb.tool_cache.CASE_FOLDED_TOOLS
+    search, calls = _counting("duckduckgo_search")
+    search("Caribbean  interest rates (test)")
+    search("caribbean interest RATES (test)")
+    assert calls == ["Caribbean  interest rates (test)"]
@@ -0,0 +1,26 @@
+"""Disk tier of the upload extraction cache keeps an honest byte count."""
+import os
+
+from eccb.uploads import ExtractionCache
+
+
+def _on_disk(directory) -> int:
+    return sum(e.stat().st_size for e in os.scandir(directory) if e.name.endswith(".txt"))
+
+
+def test_rewriting_a_key_does_not_count_it_twice(tmp_path):
+    cache = ExtractionCache(str(tmp_path), disk_bytes=10_000, memory_bytes=10_000)
+    cache.put("a", "x" * 1000)
+    for _ in range(20):  # e.g. two sessions extracting the same upload
+        cache.put("b", "y" * 2000)
+    assert cache._disk_size == _on_disk(tmp_path) == 3000
+    assert sorted(os.listdir(tmp_path)) == ["a.txt", "b.txt"]  # nothing evicted for phantom bytes
+
+
+def test_disk_tier_evicts_oldest_over_budget(tmp_path):
+    cache = ExtractionCache(str(tmp_path), disk_bytes=2500, memory_bytes=10_000)
+    for key in "abc":
+        cache.put(key, key * 1000)
+        os.utime(tmp_path / f"{key}.txt", (ord(key), ord(key)))
+    assert sorted(os.listdir(tmp_path)) == ["b.txt", "c.txt"]
+    assert cache._disk_size == _on_disk(tmp_path)